@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        # Registra los handlers de la cola de trabajos, las señales de invalidación
+        # y las verificaciones de configuración
+        from api import checks, signals, trabajos  # noqa: F401
@@ -0,0 +1,132 @@
+from django.conf import settings
+from django.db import connection
+from django.db.models import F, FloatField, Q
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+from rest_framework.filters import OrderingFilter, SearchFilter
+
+from api.models import Estudiante
+
+# Campos de Estudiante que cubre el índice de búsqueda (ver migración 0004)
+CAMPOS_INDICE = ('numero_control', 'nombre', 'apellido', 'email')
+
+
+def documento_postgres(alias=None):
+    """
+    Expresión indexada en Postgres: los campos en minúsculas y sin acentos.
+    Debe coincidir con la del índice GIN para que el planner lo use.
+    """
+    prefijo = f"{alias}." if alias else ""
+    partes = " || ' ' || ".join(f"coalesce({prefijo}{campo}, '')" for campo in CAMPOS_INDICE)
+    return f"f_unaccent(lower({partes}))"
+
+
+class BusquedaPostgres:
+    """Trigramas (pg_trgm) sobre el documento sin acentos; relevancia con word_similarity."""
+
+    def coincide(self, termino):
+        patron = termino.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return RawSQL(
+            f"SELECT numero_control FROM estudiante "
+            f"WHERE {documento_postgres()} LIKE '%%' || f_unaccent(lower(%s)) || '%%'",
+            [patron],
+        )
+
+    def relevancia(self, terminos, columna):
+        return RawSQL(
+            f"(SELECT word_similarity(f_unaccent(lower(%s)), {documento_postgres('busqueda_e')}) "
+            f"FROM estudiante busqueda_e WHERE busqueda_e.numero_control = {columna})",
+            [" ".join(terminos)],
+            output_field=FloatField(),
+        )
+
+
+class BusquedaSqlite:
+    """
+    FTS5 (tabla estudiante_fts, tokenizer unicode61 sin diacríticos). Cada
+    término se busca como prefijo de palabra; en la relevancia (bm25) la
+    palabra completa cuenta además como coincidencia exacta.
+    """
+
+    @staticmethod
+    def _frase(termino):
+        return '"{}"'.format(termino.replace('"', '""'))
+
+    def coincide(self, termino):
+        return RawSQL(
+            "SELECT numero_control FROM estudiante WHERE rowid IN "
+            "(SELECT rowid FROM estudiante_fts WHERE estudiante_fts MATCH %s)",
+            [f"{self._frase(termino)}*"],
+        )
+
+    def relevancia(self, terminos, columna):
+        return RawSQL(
+            "(SELECT -bm25(estudiante_fts) FROM estudiante_fts WHERE estudiante_fts MATCH %s "
+            f"AND rowid = (SELECT rowid FROM estudiante busqueda_e WHERE busqueda_e.numero_control = {columna}))",
+            [" OR ".join(f"{self._frase(t)} OR {self._frase(t)}*" for t in terminos)],
+            output_field=FloatField(),
+        )
+
+
+# Backend por motor de base de datos; los que no aparecen usan icontains (SearchFilter)
+BACKENDS = {
+    'postgresql': BusquedaPostgres,
+    'sqlite': BusquedaSqlite,
+}
+
+
+class BusquedaFilter(SearchFilter):
+    """
+    Reemplazo de SearchFilter con los mismos `search_fields` y parámetro ?search=.
+
+    Los campos de Estudiante (directos o a través de la FK `numero_control`) se
+    resuelven con el índice de búsqueda del motor, sin distinguir acentos ni
+    mayúsculas; el resto sigue con icontains. Cada término debe coincidir en
+    algún campo, igual que en SearchFilter. Sin ?ordering= los resultados se
+    ordenan por relevancia, así que va después de OrderingFilter.
+
+    Los campos propios del modelo (p. ej. tipo_beca y estatus de Beca) no tienen
+    índice: van en OR con la subconsulta de Estudiante, que el planner evalúa
+    como filtro por fila, así que un índice sobre ellos no evitaría el recorrido.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        backend = BACKENDS.get(connection.vendor)
+        search_fields = self.get_search_fields(view, request)
+        terminos = self.get_search_terms(request)
+        if not (settings.BUSQUEDA_INDEXADA and backend and search_fields and terminos):
+            return super().filter_queryset(request, queryset, view)
+
+        backend = backend()
+        prefijo = self._prefijo_estudiante(queryset.model, search_fields)
+        otros = [self.construct_search(str(campo), queryset) for campo in search_fields
+                 if prefijo is None or campo.removeprefix(prefijo) not in CAMPOS_INDICE]
+        ruta = None if prefijo is None else f"{prefijo}numero_control"
+
+        for termino in terminos:
+            condicion = Q(**{f"{ruta}__in": backend.coincide(termino)}) if ruta else Q()
+            for campo in otros:
+                condicion |= Q(**{campo: termino})
+            queryset = queryset.filter(condicion)
+
+        if ruta is not None and not request.query_params.get(OrderingFilter.ordering_param):
+            columna = self._columna(queryset.model)
+            queryset = queryset.annotate(
+                relevancia=Coalesce(backend.relevancia(terminos, columna), 0.0)
+            ).order_by(F('relevancia').desc(), *queryset.query.order_by)
+        return queryset
+
+    @staticmethod
+    def _prefijo_estudiante(modelo, search_fields):
+        """Prefijo de los campos de Estudiante desde `modelo`, o None si no se busca en ellos."""
+        if modelo is Estudiante:
+            return ''
+        if any(campo.startswith('numero_control__') for campo in search_fields):
+            return 'numero_control__'
+        return None
+
+    @staticmethod
+    def _columna(modelo):
+        """Columna (calificada) con el número de control en la tabla de `modelo`."""
+        campo = modelo._meta.get_field('numero_control')
+        return f'"{modelo._meta.db_table}"."{campo.column}"'
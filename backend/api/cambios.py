@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from api.models import AsistenciaBeca, Beca, Cambio, Estudiante
+
+# Nombre en la bitácora (y en la respuesta de /api/changes/) por modelo
+MODELOS = {
+    'estudiantes': Estudiante,
+    'becas': Beca,
+    'asistencias': AsistenciaBeca,
+}
+NOMBRES = {modelo: nombre for nombre, modelo in MODELOS.items()}
+
+
+def registrar(modelo, llaves, operacion, using='default'):
+    """
+    Anota `operacion` (Cambio.UPSERT / DELETE) para las `llaves` de `modelo`
+    con un solo INSERT, dentro de la transacción en curso: la bitácora se
+    confirma (o se revierte) junto con el cambio que describe.
+    """
+    filas = [Cambio(modelo=NOMBRES[modelo], llave=str(llave), operacion=operacion)
+             for llave in llaves if llave is not None]
+    if filas:
+        Cambio.objects.using(using).bulk_create(filas)
+
+
+def cursor_actual():
+    return Cambio.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def _fila(modelo, valores):
+    # Columnas de la base (numero_control, beca_id), no attnames (beca_id_id)
+    return {campo.column: valores[campo.attname] for campo in modelo._meta.concrete_fields}
+
+
+def cambios_desde(cursor, limite=None):
+    """
+    Cambios posteriores a `cursor`, a lo más `limite` entradas de la bitácora,
+    colapsados por registro: `upserts` trae la fila actual (de la tabla, no de
+    la bitácora) y `deletes` las llaves. Un upsert cuya fila ya no existe se
+    reporta como delete. Devuelve también el nuevo cursor y si quedan más.
+
+    El id se asigna al insertar, no al confirmar: una transacción larga puede
+    confirmar una entrada con id menor que el cursor que ya se entregó. Por
+    eso se vuelven a leer las entradas de los últimos CAMBIOS_VENTANA_SEGUNDOS
+    por debajo del cursor; repetirlas no cambia nada en el cliente.
+    """
+    limite = limite or settings.CAMBIOS_LIMITE
+    entradas = list(Cambio.objects.filter(id__gt=cursor).order_by('id')
+                    .values_list('id', 'modelo', 'llave', 'operacion')[:limite + 1])
+    hay_mas = len(entradas) > limite
+    entradas = entradas[:limite]
+    if cursor:
+        corte = timezone.now() - timedelta(seconds=settings.CAMBIOS_VENTANA_SEGUNDOS)
+        entradas = list(Cambio.objects.filter(id__lte=cursor, fecha__gte=corte).order_by('id')
+                        .values_list('id', 'modelo', 'llave', 'operacion')) + entradas
+    nuevo_cursor = entradas[-1][0] if entradas and entradas[-1][0] > cursor else cursor
+
+    # La última operación por registro es la que cuenta
+    ultima = {}
+    for _, nombre, llave, operacion in entradas:
+        ultima.pop((nombre, llave), None)
+        ultima[(nombre, llave)] = operacion
+
+    upserts = {nombre: [] for nombre in MODELOS}
+    deletes = {nombre: [] for nombre in MODELOS}
+    for nombre, modelo in MODELOS.items():
+        llaves = [llave for (n, llave), operacion in ultima.items() if n == nombre and operacion == Cambio.UPSERT]
+        deletes[nombre] = [llave for (n, llave), operacion in ultima.items()
+                           if n == nombre and operacion == Cambio.DELETE]
+        if not llaves:
+            continue
+        attnames = [campo.attname for campo in modelo._meta.concrete_fields]
+        pk = modelo._meta.pk.attname
+        filas = {str(fila[pk]): fila for fila in modelo._default_manager.filter(pk__in=llaves).values(*attnames)}
+        for llave in llaves:
+            if llave in filas:
+                upserts[nombre].append(_fila(modelo, filas[llave]))
+            else:
+                deletes[nombre].append(llave)
+
+    return {
+        'cursor': nuevo_cursor,
+        'has_more': hay_mas,
+        'upserts': upserts,
+        'deletes': deletes,
+    }
+
+
+def compactar(dias=None):
+    """
+    Borra las entradas de más de `dias` días que ya tienen una entrada
+    posterior del mismo registro. Un cliente con cualquier cursor sigue
+    recibiendo el último estado de cada registro. Devuelve cuántas se borraron.
+    """
+    dias = settings.CAMBIOS_COMPACTAR_DIAS if dias is None else dias
+    corte = timezone.now() - timedelta(days=dias)
+    posterior = Cambio.objects.filter(modelo=OuterRef('modelo'), llave=OuterRef('llave'), id__gt=OuterRef('id'))
+    borradas, _ = Cambio.objects.filter(fecha__lt=corte).filter(Exists(posterior)).delete()
+    return borradas
@@ -0,0 +1,61 @@
+"""
+Sparse fieldsets y expansión opcional de relaciones: ?fields= y ?expand=.
+
+    /api/estudiantes/?fields=numero_control,nombre,apellido,email
+    /api/estudiantes/?expand=becas.asistencias&fields=numero_control,becas.tipo_beca
+    /api/becas/?expand=estudiante
+
+Sin ninguno de los dos parámetros la respuesta es la de siempre (todas las
+relaciones anidadas). En cuanto aparece alguno, las relaciones anidadas solo se
+incluyen si se piden en `expand` (o en `fields`), y `fields` limita las
+columnas. Los nombres con punto aplican al nivel anidado.
+
+La selección se representa con el par (campos, expandir): `campos` es None
+(todas las columnas) o un set; `expandir` es None (modo clásico) o un set.
+"""
+
+
+def parametros_campos(query_params):
+    """(campos, expandir) a partir de los query params; (None, None) si no se usan."""
+    def lista(nombre):
+        if nombre not in query_params:
+            return None
+        return {c.strip() for c in query_params.get(nombre, "").split(",") if c.strip()}
+
+    campos, expandir = lista("fields"), lista("expand")
+    if campos is not None and expandir is None:
+        expandir = set()
+    return campos, expandir
+
+
+def incluye(nombre, campos, expandir, es_relacion=False):
+    """Indica si el campo `nombre` de este nivel entra en la respuesta."""
+    if expandir is None:
+        return True
+    propios = None if campos is None else {c.split(".", 1)[0] for c in campos}
+    if es_relacion:
+        return nombre in {e.split(".", 1)[0] for e in expandir} or (propios is not None and nombre in propios)
+    return propios is None or nombre in propios
+
+
+def sub_seleccion(nombre, campos, expandir):
+    """(campos, expandir) para la relación anidada `nombre`."""
+    if expandir is None:
+        return None, None
+    prefijo = nombre + "."
+    sub_campos = None
+    if campos is not None:
+        sub_campos = {c[len(prefijo):] for c in campos if c.startswith(prefijo)} or None
+    sub_expandir = {e[len(prefijo):] for e in expandir if e.startswith(prefijo)}
+    return sub_campos, sub_expandir
+
+
+def columnas(modelo, campos, obligatorias):
+    """
+    Columnas para .only(): las de `campos` que son del modelo más las
+    `obligatorias` (pk, llaves para los prefetch). None = no diferir nada.
+    """
+    if campos is None:
+        return None
+    del_modelo = {f.name for f in modelo._meta.concrete_fields}
+    return list(dict.fromkeys([*obligatorias, *(c for c in campos if c in del_modelo)]))
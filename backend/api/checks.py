@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+
+def _es_locmem(alias):
+    return settings.CACHES.get(alias, {}).get('BACKEND', '').endswith('LocMemCache')
+
+
+@register()
+def cache_respuestas_compartido(app_configs, **kwargs):
+    """El cache de respuestas necesita un backend que vean todos los workers."""
+    if settings.API_CACHE_RESPUESTAS and _es_locmem(settings.API_CACHE_ALIAS):
+        return [Warning(
+            "API_CACHE_RESPUESTAS está activo con un cache locmem (por proceso).",
+            hint="Con varios workers solo el que atendió la escritura ve la invalidación; "
+                 "use CACHE_BACKEND=file o db, o API_CACHE_RESPUESTAS=False.",
+            id='api.W001',
+        )]
+    return []
+
+
+@register()
+def cache_conteos_compartido(app_configs, **kwargs):
+    """Los conteos de paginación se invalidan igual que las respuestas: por versión en el cache."""
+    if settings.CONTEO_CACHE and _es_locmem('default'):
+        return [Warning(
+            "CONTEO_CACHE está activo con un cache locmem (por proceso).",
+            hint="Con varios workers los demás siguen mostrando el total anterior hasta "
+                 "CONTEO_CACHE_SEGUNDOS; use CACHE_BACKEND=file o db, o CONTEO_CACHE=False.",
+            id='api.W002',
+        )]
+    return []
@@ -0,0 +1,123 @@
+from collections import Counter
+from datetime import date
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncMonth
+
+from api.intervalos import traslape
+from api.models import AsistenciaBeca, Beca, EstadisticaBeca
+from api.versiones import versiones
+
+
+def claves_beca(estatus, tipo_beca, fecha_aprobacion):
+    """Filas de EstadisticaBeca (dimensión, clave) en las que cuenta una beca."""
+    claves = [
+        (EstadisticaBeca.TOTAL, ''),
+        (EstadisticaBeca.ESTATUS, estatus or ''),
+        (EstadisticaBeca.TIPO_BECA, tipo_beca or ''),
+    ]
+    if fecha_aprobacion:
+        # str() cubre date y 'YYYY-MM-DD' asignado sin validar
+        claves.append((EstadisticaBeca.APROBACION_MES, str(fecha_aprobacion)[:7]))
+    return claves
+
+
+def estado_beca(beca):
+    return beca.estatus, beca.tipo_beca, beca.fecha_aprobacion
+
+
+def aplicar(deltas):
+    """
+    Suma `deltas` ({(dimensión, clave): n}) a los conteos con UPDATE ... SET
+    total = total + n, así dos requests simultáneos no se pisan. Si las
+    estadísticas aún no se han calculado no hace nada (ver recalcular()).
+    """
+    deltas = {clave: n for clave, n in deltas.items() if n}
+    if not deltas or not EstadisticaBeca.objects.filter(dimension=EstadisticaBeca.TOTAL).exists():
+        return
+    for (dimension, clave), n in deltas.items():
+        actualizadas = EstadisticaBeca.objects.filter(dimension=dimension, clave=clave).update(total=F('total') + n)
+        if not actualizadas:
+            EstadisticaBeca.objects.get_or_create(dimension=dimension, clave=clave)
+            EstadisticaBeca.objects.filter(dimension=dimension, clave=clave).update(total=F('total') + n)
+
+
+def cambio_beca(anterior, nuevo):
+    """Aplica el cambio de una beca: `anterior` / `nuevo` son estado_beca() o None (alta / baja)."""
+    deltas = Counter()
+    if anterior is not None:
+        deltas.subtract(claves_beca(*anterior))
+    if nuevo is not None:
+        deltas.update(claves_beca(*nuevo))
+    aplicar(deltas)
+
+
+def sumar_becas(becas):
+    """Altas masivas (bulk_create no dispara señales)."""
+    aplicar(Counter(clave for beca in becas for clave in claves_beca(*estado_beca(beca))))
+
+
+@transaction.atomic
+def recalcular():
+    """Reconstruye todos los conteos con agregaciones en la base."""
+    filas = [EstadisticaBeca(dimension=EstadisticaBeca.TOTAL, clave='', total=Beca.objects.count())]
+    for fila in Beca.objects.values('estatus').annotate(n=Count('beca_id')).order_by():
+        filas.append(EstadisticaBeca(dimension=EstadisticaBeca.ESTATUS, clave=fila['estatus'] or '', total=fila['n']))
+
+    por_tipo = Counter()
+    for fila in Beca.objects.values('tipo_beca').annotate(n=Count('beca_id')).order_by():
+        # NULL y '' cuentan juntos, como en claves_beca
+        por_tipo[fila['tipo_beca'] or ''] += fila['n']
+    filas += [EstadisticaBeca(dimension=EstadisticaBeca.TIPO_BECA, clave=k, total=n) for k, n in por_tipo.items()]
+
+    meses = (Beca.objects.filter(fecha_aprobacion__isnull=False)
+             .annotate(mes=TruncMonth('fecha_aprobacion')).values('mes').annotate(n=Count('beca_id')).order_by())
+    filas += [EstadisticaBeca(dimension=EstadisticaBeca.APROBACION_MES, clave=f"{fila['mes']:%Y-%m}", total=fila['n'])
+              for fila in meses]
+
+    EstadisticaBeca.objects.all().delete()
+    EstadisticaBeca.objects.bulk_create(filas)
+
+
+def estudiantes_con_asistencia_activa(hoy=None):
+    """
+    Estudiantes distintos con un período de asistencia que incluye `hoy` (sin
+    fecha_fin cuenta como abierto). Depende del día, así que no va en la tabla:
+    se guarda en cache por día y versión de becas / asistencias.
+    """
+    hoy = hoy or date.today()
+    version = "-".join(map(str, versiones(Beca, AsistenciaBeca)))
+    clave = f"api:estadisticas:activos:{hoy.isoformat()}:{version}"
+    total = cache.get(clave)
+    if total is None:
+        total = (Beca.objects
+                 .filter(beca_id__in=traslape('beca_id', hoy, hoy), numero_control__isnull=False)
+                 .values('numero_control').distinct().count())
+        cache.set(clave, total, 24 * 60 * 60)
+    return total
+
+
+def resumen(hoy=None):
+    """Estadísticas para /api/becas/stats/: lee la tabla de conteos (recalculándola si está vacía)."""
+    filas = list(EstadisticaBeca.objects.values_list('dimension', 'clave', 'total'))
+    if not any(dimension == EstadisticaBeca.TOTAL for dimension, _, _ in filas):
+        recalcular()
+        filas = list(EstadisticaBeca.objects.values_list('dimension', 'clave', 'total'))
+
+    por_dimension = {}
+    for dimension, clave, total in filas:
+        # Las claves que llegaron a 0 (p. ej. un estatus que ya nadie tiene) no se muestran
+        if total or dimension == EstadisticaBeca.TOTAL:
+            por_dimension.setdefault(dimension, {})[clave] = total
+    return {
+        'total': por_dimension.get(EstadisticaBeca.TOTAL, {}).get('', 0),
+        'por_estatus': dict(sorted(por_dimension.get(EstadisticaBeca.ESTATUS, {}).items())),
+        'por_tipo_beca': dict(sorted(por_dimension.get(EstadisticaBeca.TIPO_BECA, {}).items())),
+        'aprobaciones_por_mes': [
+            {'mes': mes, 'total': total}
+            for mes, total in sorted(por_dimension.get(EstadisticaBeca.APROBACION_MES, {}).items())
+        ],
+        'estudiantes_con_asistencia_activa': estudiantes_con_asistencia_activa(hoy),
+    }
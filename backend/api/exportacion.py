@@ -0,0 +1,88 @@
+import csv
+import json
+import tempfile
+from datetime import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+
+from api.reportes import FILAS_POR_CHUNK
+
+FORMATOS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+def filas(queryset, columnas):
+    """
+    Tuplas con `columnas` (lookups de values_list) leídas con un cursor del
+    lado del servidor, sin instancias de modelo ni serializers.
+    """
+    return queryset.values_list(*columnas).iterator(chunk_size=FILAS_POR_CHUNK)
+
+
+class _Eco:
+    """Archivo falso para csv.writer: devuelve lo escrito en lugar de guardarlo."""
+
+    def write(self, valor):
+        return valor
+
+
+def csv_por_partes(encabezados, filas):
+    escritor = csv.writer(_Eco())
+    # BOM para que Excel abra el CSV como UTF-8 (acentos en los nombres)
+    yield '\ufeff' + escritor.writerow(encabezados)
+    for fila in filas:
+        yield escritor.writerow(fila)
+
+
+def jsonl_por_partes(encabezados, filas):
+    for fila in filas:
+        yield json.dumps(dict(zip(encabezados, fila)), cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+def _celda_xlsx(valor):
+    # Excel no admite zonas horarias
+    if isinstance(valor, datetime) and timezone.is_aware(valor):
+        return timezone.localtime(valor).replace(tzinfo=None)
+    return valor
+
+
+def xlsx_temporal(encabezados, filas, titulo):
+    """
+    XLSX en un archivo temporal. En modo write-only openpyxl escribe cada fila
+    a disco conforme llega, así que la memoria no depende del número de filas.
+    """
+    from openpyxl import Workbook
+
+    libro = Workbook(write_only=True)
+    hoja = libro.create_sheet(titulo)
+    hoja.append(encabezados)
+    for fila in filas:
+        hoja.append([_celda_xlsx(v) for v in fila])
+    archivo = tempfile.TemporaryFile()
+    libro.save(archivo)
+    archivo.seek(0)
+    return archivo
+
+
+def respuesta_exportacion(formato, queryset, columnas, nombre):
+    """
+    Respuesta de descarga con `queryset` en `formato` (csv, jsonl, xlsx).
+    `columnas`: lista de (encabezado, lookup). CSV y JSON Lines se envían
+    conforme se leen las filas; el XLSX se arma en disco y se envía por partes.
+    """
+    encabezados = [encabezado for encabezado, _ in columnas]
+    datos = filas(queryset, [lookup for _, lookup in columnas])
+
+    if formato == 'xlsx':
+        return FileResponse(xlsx_temporal(encabezados, datos, nombre), as_attachment=True,
+                            filename=f"{nombre}.xlsx", content_type=FORMATOS['xlsx'])
+
+    partes = csv_por_partes(encabezados, datos) if formato == 'csv' else jsonl_por_partes(encabezados, datos)
+    response = StreamingHttpResponse(partes, content_type=FORMATOS[formato])
+    response['Content-Disposition'] = f'attachment; filename="{nombre}.{formato}"'
+    return response
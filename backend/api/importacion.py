@@ -0,0 +1,238 @@
+import codecs
+import csv
+import io
+from datetime import date, datetime, time
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework import serializers
+
+from api import cambios, estadisticas
+from api.models import Beca, Cambio, Estudiante
+from api.pdf_utils import lotes
+from api.serializers import BecaSerializer, EstudianteSerializer
+from api.versiones import incrementar_version
+
+
+class ArchivoInvalido(ValueError):
+    """El archivo no se puede leer (formato, encabezados). El mensaje es para el cliente."""
+
+
+# --- Lectura ---
+def _valor_celda(valor):
+    """Normaliza una celda de XLSX a lo que esperan los serializers."""
+    if isinstance(valor, datetime):
+        return valor.date().isoformat() if valor.time() == time(0) else valor.isoformat()
+    if isinstance(valor, date):
+        return valor.isoformat()
+    if isinstance(valor, float) and valor.is_integer():
+        # Excel guarda los números de control como 22290697.0
+        return str(int(valor))
+    return valor
+
+
+def _limpiar(fila):
+    """Quita columnas vacías para que apliquen los defaults y los `required` del serializer."""
+    return {k: v for k, v in fila.items() if k and v is not None and v != ''}
+
+
+def _decodifica(decodificador, bloque, final=False):
+    try:
+        decodificador.decode(bloque, final)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def _codificacion_csv(archivo):
+    """
+    'utf-8-sig' si el archivo es UTF-8 válido; si no, 'cp1252', que es lo que
+    guarda Excel en Windows como CSV. Se revisa todo el archivo por bloques antes
+    de importar, para no descubrir el error con lotes ya guardados.
+    """
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    cp1252 = codecs.getincrementaldecoder('cp1252')()
+    es_utf8 = es_cp1252 = True
+    for bloque in iter(lambda: archivo.read(64 * 1024), b''):
+        es_utf8 = es_utf8 and _decodifica(utf8, bloque)
+        es_cp1252 = es_cp1252 and _decodifica(cp1252, bloque)
+        if not (es_utf8 or es_cp1252):
+            break
+    archivo.seek(0)
+    if es_utf8 and _decodifica(utf8, b'', final=True):
+        return 'utf-8-sig'
+    if es_cp1252:
+        return 'cp1252'
+    raise ArchivoInvalido("No se pudo leer el CSV: guardarlo con codificación UTF-8")
+
+
+def leer_filas(archivo, nombre):
+    """
+    Genera (número de fila, dict) de un CSV o XLSX con encabezados en la
+    primera fila. El número de fila es el del archivo (el encabezado es la 1).
+    Los CSV se leen como UTF-8 o, si no lo son, como cp1252 (Excel en Windows).
+    """
+    if nombre.lower().endswith('.xlsx'):
+        from openpyxl import load_workbook
+        try:
+            libro = load_workbook(archivo, read_only=True, data_only=True)
+        except Exception:
+            raise ArchivoInvalido("No se pudo leer el archivo XLSX")
+        filas = libro.active.iter_rows(values_only=True)
+        encabezados = [str(c).strip().lower() if c is not None else '' for c in next(filas, ())]
+        for numero, valores in enumerate(filas, start=2):
+            fila = _limpiar({k: _valor_celda(v) for k, v in zip(encabezados, valores)})
+            if fila:
+                yield numero, fila
+        libro.close()
+    elif nombre.lower().endswith('.csv'):
+        texto = io.TextIOWrapper(archivo, encoding=_codificacion_csv(archivo), newline='')
+        lector = csv.DictReader(texto)
+        if lector.fieldnames is None:
+            return
+        lector.fieldnames = [c.strip().lower() for c in lector.fieldnames]
+        for fila in lector:
+            fila = _limpiar({k: v.strip() if isinstance(v, str) else v for k, v in fila.items()})
+            if fila:
+                yield lector.line_num, fila
+    else:
+        raise ArchivoInvalido("Formato no soportado: usar .csv o .xlsx")
+
+
+# --- Validación ---
+# Sin los validadores que consultan la base por fila (unicidad, FK): la
+# existencia se resuelve con una consulta por lote.
+class EstudianteImportacionSerializer(EstudianteSerializer):
+    class Meta(EstudianteSerializer.Meta):
+        extra_kwargs = {'numero_control': {'validators': []}}
+
+
+class BecaImportacionSerializer(BecaSerializer):
+    numero_control = serializers.CharField(max_length=20)
+
+    class Meta(BecaSerializer.Meta):
+        fields = [f for f in BecaSerializer.Meta.fields if f not in ('beca_id', 'estudiante', 'asistencias')]
+
+
+class Importacion:
+    """
+    Importa filas validando con los serializers de la API y escribiendo por
+    lotes con bulk_create (upsert por numero_control en estudiantes). Las filas
+    con errores se reportan y el resto del archivo sigue.
+    """
+    serializer_class = None
+    modelo = None
+
+    def __init__(self, tamano_lote=None, actualizar=True):
+        self.tamano_lote = tamano_lote or settings.IMPORTACION_TAMANO_LOTE
+        self.actualizar = actualizar
+        self.creados = 0
+        self.actualizados = 0
+        self.errores = []
+
+    def ejecutar(self, filas):
+        """`filas`: iterable de (número de fila, dict). Devuelve el reporte."""
+        for lote in lotes(filas, self.tamano_lote):
+            validas = []
+            for numero, datos in lote:
+                serializer = self.serializer_class(data=datos)
+                if serializer.is_valid():
+                    validas.append((numero, serializer.validated_data))
+                else:
+                    self.errores.append({'fila': numero, 'errores': serializer.errors})
+            if validas:
+                with transaction.atomic():
+                    self.guardar_lote(validas)
+                # bulk_create no dispara post_save: se invalida una vez por lote
+                # (guardar_lote anota los cambios en la bitácora)
+                incrementar_version(self.modelo)
+        return self.reporte()
+
+    def guardar_lote(self, validas):
+        raise NotImplementedError
+
+    def reporte(self):
+        return {
+            'creados': self.creados,
+            'actualizados': self.actualizados,
+            'con_errores': len(self.errores),
+            'errores': self.errores,
+        }
+
+
+class ImportacionEstudiantes(Importacion):
+    serializer_class = EstudianteImportacionSerializer
+    modelo = Estudiante
+
+    def guardar_lote(self, validas):
+        # Si un número de control se repite en el lote gana la última fila
+        por_nc = {str(datos['numero_control']): datos for _, datos in validas}
+        existentes = set(
+            str(nc) for nc in Estudiante.objects.filter(pk__in=list(por_nc)).values_list('pk', flat=True))
+
+        if not self.actualizar:
+            for numero, datos in validas:
+                if str(datos['numero_control']) in existentes:
+                    self.errores.append({'fila': numero, 'errores': {
+                        'numero_control': ['Ya existe un estudiante con este número de control.']}})
+            por_nc = {nc: datos for nc, datos in por_nc.items() if nc not in existentes}
+            existentes = set()
+
+        # Se actualizan solo las columnas que trae cada fila (las vacías se quitan
+        # en _limpiar); las demás se conservan. Un upsert por combinación de
+        # columnas, para que una celda vacía no se pise con la de otra fila.
+        por_columnas = {}
+        for nc, datos in por_nc.items():
+            por_columnas.setdefault(frozenset(datos) - {'numero_control'}, []).append(datos)
+        for columnas, filas in por_columnas.items():
+            campos = sorted(columnas)
+            hay_existentes = any(str(datos['numero_control']) in existentes for datos in filas)
+            Estudiante.objects.bulk_create(
+                [Estudiante(**datos) for datos in filas],
+                batch_size=self.tamano_lote,
+                update_conflicts=bool(hay_existentes and campos),
+                unique_fields=['numero_control'] if hay_existentes and campos else None,
+                update_fields=campos if hay_existentes and campos else None,
+                ignore_conflicts=bool(hay_existentes and not campos),
+            )
+        cambios.registrar(Estudiante, list(por_nc), Cambio.UPSERT)
+        self.actualizados += len(existentes)
+        self.creados += len(por_nc) - len(existentes)
+
+
+class ImportacionBecas(Importacion):
+    serializer_class = BecaImportacionSerializer
+    modelo = Beca
+
+    def guardar_lote(self, validas):
+        ncs = {datos['numero_control'] for _, datos in validas}
+        existentes = {
+            str(nc): nc for nc in Estudiante.objects.filter(pk__in=list(ncs)).values_list('pk', flat=True)}
+
+        becas = []
+        for numero, datos in validas:
+            nc = existentes.get(datos['numero_control'])
+            if nc is None:
+                self.errores.append({'fila': numero, 'errores': {
+                    'numero_control': [f"No existe el estudiante {datos['numero_control']}."]}})
+                continue
+            becas.append(Beca(numero_control_id=nc, **{k: v for k, v in datos.items() if k != 'numero_control'}))
+        Beca.objects.bulk_create(becas, batch_size=self.tamano_lote)
+        estadisticas.sumar_becas(becas)
+        cambios.registrar(Beca, [beca.pk for beca in becas], Cambio.UPSERT)
+        self.creados += len(becas)
+
+
+IMPORTACIONES = {
+    'estudiantes': ImportacionEstudiantes,
+    'becas': ImportacionBecas,
+}
+
+
+def importar(tipo, archivo, nombre, tamano_lote=None, actualizar=True):
+    """Importa `archivo` (CSV / XLSX) como `tipo` ('estudiantes' o 'becas') y devuelve el reporte."""
+    importacion = IMPORTACIONES[tipo](tamano_lote=tamano_lote, actualizar=actualizar)
+    reporte = importacion.ejecutar(leer_filas(archivo, nombre))
+    # Errores en el orden del archivo aunque algunos se detecten al guardar el lote
+    reporte['errores'].sort(key=lambda e: e['fila'])
+    return reporte
@@ -0,0 +1,115 @@
+from datetime import date
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from api.models import AsistenciaBeca
+
+
+def rango_postgres():
+    """
+    Período de asistencia_beca como daterange cerrado; sin fecha_fin queda
+    abierto. Un fin anterior al inicio se toma como período de un día (daterange
+    no acepta rangos invertidos). Debe coincidir con el índice GiST (migración 0006).
+    """
+    return ("daterange(fecha_inicio, CASE WHEN fecha_fin < fecha_inicio THEN fecha_inicio "
+            "ELSE fecha_fin END, '[]')")
+
+
+class IntervalosPostgres:
+    """`&&` sobre el índice GiST de daterange."""
+
+    def traslape(self, columna, desde, hasta):
+        return RawSQL(
+            f"SELECT {columna} FROM asistencia_beca WHERE fecha_inicio IS NOT NULL "
+            f"AND {rango_postgres()} && daterange(%s, %s, '[]')",
+            [desde, hasta],
+        )
+
+
+class IntervalosGenerico:
+    """
+    Comparaciones de fechas; en SQLite las resuelve el índice compuesto
+    (fecha_inicio, fecha_fin) con un recorrido por rango sobre fecha_inicio.
+    """
+
+    def traslape(self, columna, desde, hasta):
+        periodos = AsistenciaBeca.objects.filter(fecha_inicio__isnull=False)
+        if hasta:
+            periodos = periodos.filter(fecha_inicio__lte=hasta)
+        if desde:
+            periodos = periodos.filter(Q(fecha_fin__gte=desde) | Q(fecha_fin__isnull=True))
+        campo = AsistenciaBeca._meta.get_field(columna)
+        return periodos.values(campo.attname)
+
+
+# Backend por motor de base de datos; los que no aparecen usan el genérico
+BACKENDS = {
+    'postgresql': IntervalosPostgres,
+}
+
+
+def traslape(columna, desde=None, hasta=None):
+    """
+    Valores de `columna` ('asistencia_id' o 'beca_id') de los períodos de
+    asistencia que se cruzan con [desde, hasta] (extremos inclusivos; None es
+    abierto). Los períodos sin fecha_fin siguen vigentes; sin fecha_inicio no cuentan.
+    """
+    return BACKENDS.get(connection.vendor, IntervalosGenerico)().traslape(columna, desde, hasta)
+
+
+def periodo_vigente(numero_control, hoy=None):
+    """
+    Período de asistencia (fecha_inicio, fecha_fin) del alumno para los PDFs:
+    el que incluye `hoy` o, si no hay, el último que ya empezó. Un período sin
+    fecha_fin termina `hoy`. None si el alumno no tiene períodos.
+    """
+    hoy = hoy or date.today()
+    periodos = (AsistenciaBeca.objects
+                .filter(beca_id__numero_control=numero_control, fecha_inicio__lte=hoy)
+                .order_by('-fecha_inicio', '-asistencia_id'))
+    periodo = (periodos.filter(asistencia_id__in=traslape('asistencia_id', hoy, hoy)).first()
+               or periodos.first())
+    if periodo is None:
+        return None
+    return periodo.fecha_inicio, periodo.fecha_fin or hoy
+
+
+def _fecha(request, nombre):
+    valor = request.query_params.get(nombre)
+    if not valor:
+        return None
+    try:
+        fecha = parse_date(valor)
+    except ValueError:
+        # Bien formada pero inexistente (2025-13-01, 2025-02-30)
+        fecha = None
+    if fecha is None:
+        raise ValidationError({nombre: 'Formato esperado YYYY-MM-DD.'})
+    return fecha
+
+
+class TraslapeFechasFilter(BaseFilterBackend):
+    """
+    ?activa_en=YYYY-MM-DD: registros con un período de asistencia que incluye
+    esa fecha. ?periodo_desde= / ?periodo_hasta=: períodos que se cruzan con
+    el rango (puede faltar uno de los extremos). La vista indica con
+    `columna_intervalo` qué columna de asistencia_beca es su llave.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        activa_en = _fecha(request, 'activa_en')
+        desde, hasta = _fecha(request, 'periodo_desde'), _fecha(request, 'periodo_hasta')
+        if desde and hasta and hasta < desde:
+            raise ValidationError({'periodo_hasta': 'Debe ser posterior o igual a periodo_desde.'})
+
+        llave = queryset.model._meta.pk.name
+        if activa_en:
+            queryset = queryset.filter(**{f"{llave}__in": traslape(view.columna_intervalo, activa_en, activa_en)})
+        if desde or hasta:
+            queryset = queryset.filter(**{f"{llave}__in": traslape(view.columna_intervalo, desde, hasta)})
+        return queryset
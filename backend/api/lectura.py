@@ -0,0 +1,152 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from rest_framework import serializers
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.response import Response
+
+
+class _NoSoportado(Exception):
+    """El serializer tiene algo que el camino rápido no sabe armar; se usa el de DRF."""
+
+
+def _convertidor(campo):
+    """Función valor -> representación equivalente a `campo.to_representation` (sin None)."""
+    if isinstance(campo, PrimaryKeyRelatedField) and campo.pk_field is None:
+        return None  # la llave tal cual, como PKOnlyObject
+    if type(campo) in (serializers.CharField, serializers.EmailField):
+        return str
+    if type(campo) is serializers.IntegerField:
+        return int
+    if isinstance(campo, serializers.SerializerMethodField) or isinstance(campo, serializers.RelatedField):
+        raise _NoSoportado(campo)
+    return campo.to_representation
+
+
+class Plan:
+    """
+    Cómo armar la representación de un serializer a partir de filas de
+    .values(): columnas a pedir y, por campo, de dónde sale su valor.
+
+    - Campos simples: la columna `source`, convertida como lo haría el campo.
+    - Serializer anidado (FK hacia adelante): columnas con JOIN en la misma
+      consulta (`source__campo`), como select_related.
+    - Lista anidada (FK inversa): una consulta por nivel con
+      `fk__in=<llaves de la página>`, como prefetch_related.
+    """
+
+    def __init__(self, serializer, prefijo=''):
+        self.modelo = serializer.Meta.model
+        self.prefijo = prefijo
+        self.simples = []   # (nombre, columna, convertidor)
+        self.objetos = []   # (nombre, columna de la FK, Plan)
+        self.listas = []    # (nombre, columna llave del padre, lookup de la FK en el hijo, columna FK en el hijo, Plan)
+        self.orden = []
+        opciones = self.modelo._meta
+
+        for nombre, campo in serializer.fields.items():
+            if campo.write_only:
+                continue
+            self.orden.append(nombre)
+            if isinstance(campo, serializers.ListSerializer):
+                if prefijo:
+                    raise _NoSoportado(nombre)
+                relacion = opciones.get_field(campo.source)
+                if not relacion.one_to_many:
+                    raise _NoSoportado(nombre)
+                fk = relacion.field
+                self.listas.append((nombre, fk.target_field.attname, fk.name, fk.attname, Plan(campo.child)))
+            elif isinstance(campo, serializers.BaseSerializer):
+                fk = opciones.get_field(campo.source)
+                if not fk.many_to_one:
+                    raise _NoSoportado(nombre)
+                self.objetos.append((nombre, f"{prefijo}{fk.attname}", Plan(campo, f"{prefijo}{fk.name}__")))
+            else:
+                if '.' in campo.source or campo.source == '*':
+                    raise _NoSoportado(nombre)
+                self.simples.append((nombre, f"{prefijo}{campo.source}", _convertidor(campo)))
+
+    def columnas(self):
+        cols = [col for _, col, _ in self.simples]
+        for _, fk, plan in self.objetos:
+            cols.append(fk)
+            cols += plan.columnas()
+        for _, llave, _, _, _ in self.listas:
+            cols.append(f"{self.prefijo}{llave}")
+        return list(dict.fromkeys(cols))
+
+    def armar(self, filas):
+        """Lista de dicts (en el orden de los campos del serializer) para `filas`."""
+        hijos = {}
+        for nombre, llave, fk, fk_columna, plan in self.listas:
+            llaves = list(dict.fromkeys(f[llave] for f in filas if f[llave] is not None))
+            por_padre = {}
+            if llaves:
+                filas_hijo = list(plan.modelo._default_manager.filter(**{f"{fk}__in": llaves})
+                                  .values(*plan.columnas(), fk_columna))
+                for fila_hijo, dato in zip(filas_hijo, plan.armar(filas_hijo)):
+                    por_padre.setdefault(fila_hijo[fk_columna], []).append(dato)
+            hijos[nombre] = (llave, por_padre)
+        return [self._uno(fila, hijos) for fila in filas]
+
+    def _uno(self, fila, hijos):
+        datos = {}
+        for nombre, columna, convertir in self.simples:
+            valor = fila[columna]
+            datos[nombre] = valor if valor is None or convertir is None else convertir(valor)
+        for nombre, fk, plan in self.objetos:
+            datos[nombre] = None if fila[fk] is None else plan._uno(fila, {})
+        for nombre, (llave, por_padre) in hijos.items():
+            datos[nombre] = por_padre.get(fila[llave], [])
+        # Mismo orden de llaves que el serializer
+        return {nombre: datos[nombre] for nombre in self.orden}
+
+
+class LecturaRapidaMixin:
+    """
+    list / retrieve sin instancias de modelo: las filas salen de .values() y
+    las relaciones de consultas por nivel (ver Plan), con la misma selección
+    de ?fields= / ?expand=, búsqueda, orden y paginación. El JSON es idéntico
+    al del serializer. Si el serializer tiene algo que Plan no sabe armar, o
+    API_LECTURA_RAPIDA=False, se usa el camino normal de DRF.
+    """
+
+    def _plan(self, **kwargs):
+        if not settings.API_LECTURA_RAPIDA:
+            return None
+        try:
+            return Plan(self.get_serializer(**kwargs))
+        except _NoSoportado:
+            return None
+
+    def _base_valores(self, plan, extra=()):
+        queryset = self.filter_queryset(self.queryset.model._default_manager.all())
+        return queryset.values(*plan.columnas(), *extra)
+
+    def list(self, request, *args, **kwargs):
+        plan = self._plan()
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        # Las columnas del cursor keyset deben venir en cada fila
+        orden = [o.lstrip('-') for o in getattr(self, 'keyset_ordering', ())]
+        filas = self._base_valores(plan, orden)
+        pagina = self.paginate_queryset(filas)
+        if pagina is not None:
+            return self.get_paginated_response(plan.armar(list(pagina)))
+        return Response(plan.armar(list(filas)))
+
+    def retrieve(self, request, *args, **kwargs):
+        plan = self._plan()
+        if plan is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        lookup = self.lookup_url_kwarg or self.lookup_field
+        try:
+            filas = list(self._base_valores(plan).filter(**{self.lookup_field: kwargs[lookup]})[:2])
+        except (TypeError, ValueError, ValidationError):
+            # Llave con formato inválido (p. ej. /api/becas/abc/): 404, como get_object_or_404
+            raise Http404
+        if len(filas) != 1:
+            raise Http404
+        return Response(plan.armar(filas)[0])
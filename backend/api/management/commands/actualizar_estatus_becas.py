@@ -0,0 +1,48 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from api.transiciones import TRANSICIONES, aplicar, simular
+
+
+class Command(BaseCommand):
+    help = ("Aplica las transiciones automáticas de estatus de becas (p. ej. aprobada -> finalizada al pasar "
+            "fecha_fin) con UPDATE por lotes. Con --cada N se repite cada N segundos en este proceso.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--transicion', action='append', choices=sorted(TRANSICIONES),
+                            help="Solo estas transiciones (se puede repetir; default: todas).")
+        parser.add_argument('--dry-run', action='store_true', help="Solo reporta cuántas becas cambiarían.")
+        parser.add_argument('--tamano-lote', type=int, default=None,
+                            help="Becas por UPDATE (default TRANSICIONES_TAMANO_LOTE).")
+        parser.add_argument('--fecha', default=None, help="Fecha de referencia YYYY-MM-DD (default: hoy).")
+        parser.add_argument('--cada', type=float, default=None,
+                            help="Segundos entre ejecuciones; sin esta opción corre una vez.")
+
+    def handle(self, *args, **options):
+        try:
+            fecha = date.fromisoformat(options['fecha']) if options['fecha'] else None
+        except ValueError:
+            raise CommandError("--fecha debe tener formato YYYY-MM-DD")
+        transiciones = [TRANSICIONES[n] for n in (options['transicion'] or sorted(TRANSICIONES))]
+
+        while True:
+            close_old_connections()
+            for transicion in transiciones:
+                self._ejecutar(transicion, fecha, options)
+            if options['cada'] is None:
+                return
+            time.sleep(options['cada'])
+
+    def _ejecutar(self, transicion, fecha, options):
+        destino = f"{'/'.join(transicion.desde)} -> {transicion.hacia}"
+        if options['dry_run']:
+            por_estatus = simular(transicion, fecha)
+            self.stdout.write(f"[dry-run] {transicion.nombre} ({destino}): {sum(por_estatus.values())} becas {por_estatus}")
+            return
+        por_estatus = aplicar(transicion, fecha, options['tamano_lote'],
+                              al_terminar_lote=lambda n: self.stdout.write(f"  lote: {n} becas"))
+        self.stdout.write(self.style.SUCCESS(
+            f"{transicion.nombre} ({destino}): {sum(por_estatus.values())} becas {por_estatus}"))
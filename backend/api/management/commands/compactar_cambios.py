@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from api import cambios
+
+
+class Command(BaseCommand):
+    help = ("Compacta la bitácora de /api/changes/: deja solo la última entrada de cada registro "
+            "entre las de más de --dias días. Pensado para cron (p. ej. diario).")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dias", type=int, default=None,
+                            help="Antigüedad mínima de las entradas a compactar (default: CAMBIOS_COMPACTAR_DIAS).")
+
+    def handle(self, *args, **options):
+        borradas = cambios.compactar(options["dias"])
+        self.stdout.write(self.style.SUCCESS(f"Entradas compactadas: {borradas}"))
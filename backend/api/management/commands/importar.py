@@ -0,0 +1,32 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.importacion import IMPORTACIONES, ArchivoInvalido, importar
+
+
+class Command(BaseCommand):
+    help = "Importa estudiantes o becas desde un CSV / XLSX (mismo proceso que POST /api/importar/<tipo>/)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('tipo', choices=sorted(IMPORTACIONES))
+        parser.add_argument('archivo')
+        parser.add_argument('--tamano-lote', type=int, default=None, help="Filas por lote (default IMPORTACION_TAMANO_LOTE).")
+        parser.add_argument('--sin-actualizar', action='store_true', help="Reporta como error los números de control que ya existen.")
+        parser.add_argument('--json', action='store_true', help="Imprime el reporte completo en JSON.")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['archivo'], 'rb') as archivo:
+                reporte = importar(options['tipo'], archivo, options['archivo'],
+                                   tamano_lote=options['tamano_lote'], actualizar=not options['sin_actualizar'])
+        except (OSError, ArchivoInvalido) as e:
+            raise CommandError(str(e))
+
+        if options['json']:
+            self.stdout.write(json.dumps(reporte, ensure_ascii=False, indent=2))
+            return
+        for error in reporte['errores']:
+            self.stdout.write(f"Fila {error['fila']}: {json.dumps(error['errores'], ensure_ascii=False)}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Creados: {reporte['creados']}  Actualizados: {reporte['actualizados']}  Con errores: {reporte['con_errores']}"))
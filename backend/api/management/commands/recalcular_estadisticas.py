@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from api import estadisticas
+
+
+class Command(BaseCommand):
+    help = "Reconstruye los conteos de becas de /api/becas/stats/ (tras cambios masivos hechos fuera de Django)."
+
+    def handle(self, *args, **options):
+        estadisticas.recalcular()
+        resumen = estadisticas.resumen()
+        self.stdout.write(self.style.SUCCESS(f"Becas: {resumen['total']}  Estatus: {resumen['por_estatus']}"))
@@ -0,0 +1,13 @@
+"""Utilidades compartidas por las migraciones con SQL propio de cada motor."""
+
+
+def ejecutar_por_motor(sentencias):
+    """
+    Operación para RunPython que ejecuta las sentencias del motor en uso.
+    `sentencias` es {vendor: [sql, ...]}; los motores que no aparecen no hacen nada.
+    """
+    def operacion(apps, schema_editor):
+        por_motor = sentencias.get(schema_editor.connection.vendor, [])
+        for sql in por_motor:
+            schema_editor.execute(sql)
+    return operacion
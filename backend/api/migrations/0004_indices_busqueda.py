@@ -0,0 +1,83 @@
+from django.db import migrations
+
+from api.migraciones import ejecutar_por_motor
+
+# Debe coincidir con api.busqueda.documento_postgres()
+DOCUMENTO = (
+    "f_unaccent(lower(coalesce(numero_control, '') || ' ' || coalesce(nombre, '') || ' ' "
+    "|| coalesce(apellido, '') || ' ' || coalesce(email, '')))"
+)
+
+POSTGRES = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    # unaccent() no es IMMUTABLE y no puede usarse en un índice; este wrapper sí
+    """
+    CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    SET search_path = public, extensions, pg_temp
+    AS $$ SELECT unaccent('unaccent'::regdictionary, $1) $$
+    """,
+    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS estudiante_busqueda_trgm ON estudiante USING gin (({DOCUMENTO}) gin_trgm_ops)",
+]
+
+POSTGRES_REVERSA = [
+    "DROP INDEX CONCURRENTLY IF EXISTS estudiante_busqueda_trgm",
+    "DROP FUNCTION IF EXISTS f_unaccent(text)",
+]
+
+# Tabla FTS5 de contenido externo: guarda solo el índice y lee las filas de
+# `estudiante` por rowid. Los triggers la mantienen al día (también con
+# bulk_create / update masivos). Tras un VACUUM: INSERT INTO estudiante_fts(estudiante_fts) VALUES('rebuild')
+SQLITE = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS estudiante_fts USING fts5(
+        numero_control, nombre, apellido, email,
+        content='estudiante', tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS estudiante_fts_ai AFTER INSERT ON estudiante BEGIN
+        INSERT INTO estudiante_fts(rowid, numero_control, nombre, apellido, email)
+        VALUES (new.rowid, new.numero_control, new.nombre, new.apellido, new.email);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS estudiante_fts_ad AFTER DELETE ON estudiante BEGIN
+        INSERT INTO estudiante_fts(estudiante_fts, rowid, numero_control, nombre, apellido, email)
+        VALUES ('delete', old.rowid, old.numero_control, old.nombre, old.apellido, old.email);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS estudiante_fts_au AFTER UPDATE ON estudiante BEGIN
+        INSERT INTO estudiante_fts(estudiante_fts, rowid, numero_control, nombre, apellido, email)
+        VALUES ('delete', old.rowid, old.numero_control, old.nombre, old.apellido, old.email);
+        INSERT INTO estudiante_fts(rowid, numero_control, nombre, apellido, email)
+        VALUES (new.rowid, new.numero_control, new.nombre, new.apellido, new.email);
+    END
+    """,
+    "INSERT INTO estudiante_fts(estudiante_fts) VALUES ('rebuild')",
+]
+
+SQLITE_REVERSA = [
+    "DROP TRIGGER IF EXISTS estudiante_fts_ai",
+    "DROP TRIGGER IF EXISTS estudiante_fts_ad",
+    "DROP TRIGGER IF EXISTS estudiante_fts_au",
+    "DROP TABLE IF EXISTS estudiante_fts",
+]
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY no puede ir dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ('api', '0003_alter_asistenciabeca_options_alter_beca_options_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            ejecutar_por_motor({'postgresql': POSTGRES, 'sqlite': SQLITE}),
+            ejecutar_por_motor({'postgresql': POSTGRES_REVERSA, 'sqlite': SQLITE_REVERSA}),
+        ),
+    ]
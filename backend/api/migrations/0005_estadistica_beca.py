@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-18 07:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_indices_busqueda'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EstadisticaBeca',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('total', 'Total'), ('estatus', 'Estatus'), ('tipo_beca', 'Tipo de beca'), ('aprobacion_mes', 'Aprobaciones por mes')], max_length=20)),
+                ('clave', models.CharField(blank=True, default='', max_length=255)),
+                ('total', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'api_estadistica_beca',
+                'constraints': [models.UniqueConstraint(fields=('dimension', 'clave'), name='estadistica_beca_unica')],
+            },
+        ),
+    ]
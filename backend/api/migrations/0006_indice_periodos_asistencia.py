@@ -0,0 +1,42 @@
+from django.db import migrations
+
+from api.migraciones import ejecutar_por_motor
+
+# Debe coincidir con api.intervalos.rango_postgres()
+RANGO = ("daterange(fecha_inicio, CASE WHEN fecha_fin < fecha_inicio THEN fecha_inicio "
+         "ELSE fecha_fin END, '[]')")
+
+POSTGRES = [
+    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS asistencia_beca_periodo_gist ON asistencia_beca "
+    f"USING gist (({RANGO})) WHERE fecha_inicio IS NOT NULL",
+]
+
+POSTGRES_REVERSA = [
+    "DROP INDEX CONCURRENTLY IF EXISTS asistencia_beca_periodo_gist",
+]
+
+# Sin tipos de rango: índice compuesto, la condición fecha_inicio <= hasta
+# recorre un rango del índice y fecha_fin se compara sin leer la tabla
+SQLITE = [
+    "CREATE INDEX IF NOT EXISTS asistencia_beca_periodo ON asistencia_beca (fecha_inicio, fecha_fin)",
+]
+
+SQLITE_REVERSA = [
+    "DROP INDEX IF EXISTS asistencia_beca_periodo",
+]
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY no puede ir dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ('api', '0005_estadistica_beca'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            ejecutar_por_motor({'postgresql': POSTGRES, 'sqlite': SQLITE}),
+            ejecutar_por_motor({'postgresql': POSTGRES_REVERSA, 'sqlite': SQLITE_REVERSA}),
+        ),
+    ]
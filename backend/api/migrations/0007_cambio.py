@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-18 07:15
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_indice_periodos_asistencia'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Cambio',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('modelo', models.CharField(max_length=20)),
+                ('llave', models.CharField(max_length=64)),
+                ('operacion', models.CharField(choices=[('upsert', 'Alta o cambio'), ('delete', 'Baja')], max_length=10)),
+                ('fecha', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'api_cambio',
+                'indexes': [models.Index(fields=['modelo', 'llave', 'id'], name='cambio_modelo_llave'), models.Index(fields=['fecha'], name='cambio_fecha')],
+            },
+        ),
+    ]
@@ -62,4 +62,57 @@ class AsistenciaBeca(models.Model):
         return f"Beca - {estudiante or 'Sin estudiante'}"
 
 
- 
\ No newline at end of file
+# --- Tabla: EstadisticaBeca (conteos de becas mantenidos por api.estadisticas) ---
+class EstadisticaBeca(models.Model):
+    TOTAL = 'total'
+    ESTATUS = 'estatus'
+    TIPO_BECA = 'tipo_beca'
+    APROBACION_MES = 'aprobacion_mes'
+    DIMENSION_CHOICES = [
+        (TOTAL, 'Total'),
+        (ESTATUS, 'Estatus'),
+        (TIPO_BECA, 'Tipo de beca'),
+        (APROBACION_MES, 'Aprobaciones por mes'),
+    ]
+
+    dimension = models.CharField(max_length=20, choices=DIMENSION_CHOICES)
+    # Valor agrupado: el estatus, el tipo ('' si no tiene) o el mes 'YYYY-MM'
+    clave = models.CharField(max_length=255, blank=True, default='')
+    total = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'api_estadistica_beca'
+        constraints = [
+            models.UniqueConstraint(fields=['dimension', 'clave'], name='estadistica_beca_unica'),
+        ]
+
+    def __str__(self):
+        return f"{self.dimension}={self.clave}: {self.total}"
+
+
+# --- Tabla: Cambio (bitácora de altas / cambios / bajas para /api/changes/, ver api.cambios) ---
+class Cambio(models.Model):
+    UPSERT = 'upsert'
+    DELETE = 'delete'
+    OPERACION_CHOICES = [
+        (UPSERT, 'Alta o cambio'),
+        (DELETE, 'Baja'),
+    ]
+
+    # El id es el cursor de ?since=: solo crece
+    id = models.BigAutoField(primary_key=True)
+    modelo = models.CharField(max_length=20)
+    llave = models.CharField(max_length=64)
+    operacion = models.CharField(max_length=10, choices=OPERACION_CHOICES)
+    fecha = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'api_cambio'
+        indexes = [
+            models.Index(fields=['modelo', 'llave', 'id'], name='cambio_modelo_llave'),
+            models.Index(fields=['fecha'], name='cambio_fecha'),
+        ]
+
+    def __str__(self):
+        return f"#{self.id} {self.operacion} {self.modelo}:{self.llave}"
+
@@ -0,0 +1,223 @@
+import base64
+import hashlib
+import json
+from functools import cached_property, reduce
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+# Parámetros que no cambian el total de filas
+PARAMETROS_SIN_FILTRO = {'page', 'page_size', 'cursor', 'ordering', 'fields', 'expand', 'format'}
+
+
+def estimar_filas(modelo):
+    """Filas según las estadísticas del planner (pg_class.reltuples); None fuera de Postgres o sin ANALYZE."""
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                       [modelo._meta.db_table])
+        fila = cursor.fetchone()
+    return fila[0] if fila and fila[0] >= 0 else None
+
+
+class PaginatorConteoCache(Paginator):
+    """
+    Paginator cuyo `count` viene de `conteo()` (cache o estimación) en vez de
+    un COUNT(*) por request. `exacto` indica si el total es exacto.
+    """
+
+    def __init__(self, object_list, per_page, conteo=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self._conteo = conteo
+        self.exacto = True
+
+    @cached_property
+    def count(self):
+        if self._conteo is None:
+            return super().count
+        total, self.exacto = self._conteo(lambda: Paginator.count.func(self))
+        return total
+
+
+class KeysetPageNumberPagination(PageNumberPagination):
+    """
+    Paginación por número de página (?page=N, la de siempre) o por keyset
+    (?cursor=...).
+
+    En modo página el total (`count`) se guarda en cache por ruta + filtros (con
+    CONTEO_CACHE) y se invalida al guardar o borrar filas de los modelos
+    involucrados; en tablas grandes sin filtros puede ser la estimación de
+    Postgres, y entonces `count_exacto` es false.
+
+    En modo keyset la página se pide con un WHERE sobre el orden de la vista
+    (`view.keyset_ordering`, que debe terminar en una columna única) en lugar de
+    COUNT + OFFSET, así que la página 500 cuesta lo mismo que la primera. Se
+    entra con ?cursor= vacío y se navega con los links next / previous.
+    """
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Cursor inválido.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.cursor_query_param in request.query_params
+        if not self.keyset:
+            self.view = view
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.orden = list(view.keyset_ordering)
+        posicion, reversa = self._decodificar(request.query_params[self.cursor_query_param])
+        page_size = self.get_page_size(request)
+
+        campos = [o.lstrip('-') for o in self.orden]
+        cargados, es_defer = queryset.query.deferred_loading
+        if cargados and not es_defer:
+            # Con .only() (?fields=) las columnas del cursor también deben venir en la consulta
+            queryset = queryset.only(*cargados, *campos)
+
+        queryset = queryset.order_by(*[self._invertir(o) if reversa else o for o in self.orden])
+        if posicion is not None:
+            queryset = queryset.filter(self._despues_de(self._convertir(queryset.model, posicion), reversa))
+
+        filas = list(queryset[:page_size + 1])
+        hay_mas = len(filas) > page_size
+        filas = filas[:page_size]
+        if reversa:
+            filas.reverse()
+
+        # Hacia adelante: hay anterior si venimos de un cursor. Hacia atrás: al revés.
+        hay_siguiente, hay_anterior = (True, hay_mas) if reversa else (hay_mas, posicion is not None)
+        self.cursor_siguiente = self._codificar(self._posicion(filas[-1]), False) if filas and hay_siguiente else None
+        self.cursor_anterior = self._codificar(self._posicion(filas[0]), True) if filas and hay_anterior else None
+        return filas
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return Response({
+                'count': self.page.paginator.count,
+                'count_exacto': self.page.paginator.exacto,
+                'next': self.get_next_link(),
+                'previous': self.get_previous_link(),
+                'results': data,
+            })
+        return Response({
+            'next': self._link(self.cursor_siguiente),
+            'previous': self._link(self.cursor_anterior),
+            'results': data,
+        })
+
+    def django_paginator_class(self, object_list, per_page, **kwargs):
+        return PaginatorConteoCache(object_list, per_page, conteo=self._conteo(object_list), **kwargs)
+
+    # --- Conteo ---
+    def _conteo(self, queryset):
+        """
+        Total de filas: primero el cache con CONTEO_CACHE (clave = ruta + filtros
+        + versiones de los modelos, ver api.versiones); si no está y la consulta
+        no tiene filtros, la estimación del planner para tablas grandes; si no,
+        COUNT(*).
+        """
+        from api.versiones import versiones
+
+        filtros = sorted((k, v) for k, v in self.request.query_params.lists() if k not in PARAMETROS_SIN_FILTRO)
+
+        def calcular(contar):
+            estimado = None if filtros else estimar_filas(queryset.model)
+            if estimado is not None and estimado >= settings.CONTEO_ESTIMADO_MINIMO:
+                return estimado, False
+            return contar(), True
+
+        if not settings.CONTEO_CACHE:
+            return calcular
+        # La vista puede declarar `conteo_modelos` si sus filtros cruzan relaciones
+        modelos = getattr(self.view, 'conteo_modelos', None) or (queryset.model,)
+        clave = 'api:conteo:' + hashlib.sha256(json.dumps(
+            [self.request.path, filtros, versiones(*modelos)]).encode()).hexdigest()
+
+        def conteo(contar):
+            guardado = cache.get(clave)
+            if guardado is not None:
+                return guardado
+            resultado = calcular(contar)
+            cache.set(clave, resultado, settings.CONTEO_CACHE_SEGUNDOS)
+            return resultado
+        return conteo
+
+    # --- Keyset ---
+    @staticmethod
+    def _invertir(orden):
+        return orden[1:] if orden.startswith('-') else f'-{orden}'
+
+    def _posicion(self, obj):
+        # Instancias de modelo o filas de .values() (api.lectura)
+        if isinstance(obj, dict):
+            return [obj[o.lstrip('-')] for o in self.orden]
+        return [getattr(obj, o.lstrip('-')) for o in self.orden]
+
+    def _despues_de(self, posicion, reversa):
+        """
+        (a, b, c) > (x, y, z) como OR de prefijos iguales:
+        a > x  OR  (a = x AND b > y)  OR  (a = x AND b = y AND c > z)
+        """
+        condiciones = []
+        for i, orden in enumerate(self.orden):
+            campo = orden.lstrip('-')
+            mayor = orden.startswith('-') == reversa
+            iguales = [Q(**{self.orden[j].lstrip('-'): posicion[j]}) for j in range(i)]
+            siguiente = Q(**{f"{campo}__{'gt' if mayor else 'lt'}": posicion[i]})
+            condiciones.append(reduce(lambda a, b: a & b, iguales, siguiente))
+        # La primera columna acotada por rango para que el índice pueda usarse
+        primera = self.orden[0].lstrip('-')
+        rango = Q(**{f"{primera}__{'gte' if self.orden[0].startswith('-') == reversa else 'lte'}": posicion[0]})
+        return rango & reduce(lambda a, b: a | b, condiciones)
+
+    def _codificar(self, posicion, reversa):
+        datos = json.dumps({'p': posicion, 'r': reversa}, default=str, separators=(',', ':'))
+        return base64.urlsafe_b64encode(datos.encode()).decode()
+
+    def _decodificar(self, cursor):
+        if not cursor:
+            return None, False
+        try:
+            datos = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            posicion, reversa = datos['p'], datos['r']
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        # Una posición por columna de orden; cualquier otra forma es un cursor alterado
+        if not isinstance(posicion, list) or len(posicion) != len(self.orden) or not isinstance(reversa, bool):
+            raise NotFound(self.invalid_cursor_message)
+        return posicion, reversa
+
+    def _convertir(self, modelo, posicion):
+        """
+        Valores del cursor al tipo de cada columna. Solo se aceptan escalares JSON
+        (null, booleanos, listas u objetos no salen de _codificar) y un valor que
+        no convierte es un cursor inválido.
+        """
+        valores = []
+        for orden, valor in zip(self.orden, posicion):
+            if isinstance(valor, bool) or not isinstance(valor, (str, int, float)):
+                raise NotFound(self.invalid_cursor_message)
+            try:
+                valor = modelo._meta.get_field(orden.lstrip('-')).to_python(valor)
+            except (TypeError, ValueError, DjangoValidationError):
+                raise NotFound(self.invalid_cursor_message)
+            if valor is None:
+                raise NotFound(self.invalid_cursor_message)
+            valores.append(valor)
+        return valores
+
+    def _link(self, cursor):
+        if cursor is None:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
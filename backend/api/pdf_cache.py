@@ -0,0 +1,167 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from django.conf import settings
+
+
+def clave_cache(*partes):
+    """Hash de los parámetros que determinan el contenido del PDF."""
+    return hashlib.sha256("\x1f".join(str(p) for p in partes).encode("utf-8")).hexdigest()
+
+
+class _Vuelo:
+    """Render en curso de una clave; los demás requests esperan su resultado."""
+
+    def __init__(self):
+        self.evento = threading.Event()
+        self.resultado = None
+        self.error = None
+
+
+class CachePDF:
+    """
+    Cache de PDFs renderizados, direccionado por contenido.
+
+    Dos niveles: un LRU en memoria (por número de entradas) y un directorio en
+    disco con límite de tamaño, donde se eliminan primero los archivos usados
+    hace más tiempo. Requests simultáneos con la misma clave esperan un solo
+    render (single-flight).
+
+    El tamaño del disco se lleva como un contador que suma cada escritura; el
+    directorio solo se recorre cuando el contador pasa el límite (o la primera
+    vez), y entonces se desaloja hasta FRACCION_DESALOJO del límite para que las
+    siguientes escrituras no vuelvan a recorrerlo. Lo que escriban otros procesos
+    se cuenta en ese recorrido.
+    """
+
+    FRACCION_DESALOJO = 0.9
+
+    def __init__(self, directorio, max_entradas_memoria=128, max_bytes_disco=256 * 1024 * 1024):
+        self.directorio = Path(directorio)
+        self.max_entradas_memoria = max_entradas_memoria
+        self.max_bytes_disco = max_bytes_disco
+        self._memoria = OrderedDict()
+        self._en_vuelo = {}
+        self._lock = threading.Lock()
+        self._lock_disco = threading.Lock()
+        self._bytes_disco = None  # None: aún no se ha recorrido el directorio
+
+    def obtener(self, clave, render):
+        """Devuelve los bytes de `clave`, llamando a `render()` solo si no están en ningún nivel."""
+        with self._lock:
+            if clave in self._memoria:
+                self._memoria.move_to_end(clave)
+                return self._memoria[clave]
+            vuelo = self._en_vuelo.get(clave)
+            lider = vuelo is None
+            if lider:
+                vuelo = self._en_vuelo[clave] = _Vuelo()
+
+        if not lider:
+            vuelo.evento.wait()
+            if vuelo.error is not None:
+                raise vuelo.error
+            return vuelo.resultado
+
+        try:
+            contenido = self._leer_disco(clave)
+            if contenido is None:
+                contenido = render()
+                self._escribir_disco(clave, contenido)
+            self._guardar_memoria(clave, contenido)
+            vuelo.resultado = contenido
+            return contenido
+        except Exception as e:
+            vuelo.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._en_vuelo[clave]
+            vuelo.evento.set()
+
+    def limpiar_memoria(self):
+        with self._lock:
+            self._memoria.clear()
+
+    # --- Memoria ---
+    def _guardar_memoria(self, clave, contenido):
+        with self._lock:
+            self._memoria[clave] = contenido
+            self._memoria.move_to_end(clave)
+            while len(self._memoria) > self.max_entradas_memoria:
+                self._memoria.popitem(last=False)
+
+    # --- Disco ---
+    def _ruta(self, clave):
+        return self.directorio / clave[:2] / f"{clave}.pdf"
+
+    def _leer_disco(self, clave):
+        ruta = self._ruta(clave)
+        try:
+            contenido = ruta.read_bytes()
+            # Marca el archivo como usado recientemente para el desalojo
+            os.utime(ruta)
+        except FileNotFoundError:
+            # No existe o lo desalojó otro hilo / proceso entre la lectura y el utime
+            return None
+        return contenido
+
+    def _escribir_disco(self, clave, contenido):
+        ruta = self._ruta(clave)
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        # Escritura atómica: otro proceso nunca lee un archivo a medias
+        fd, temporal = tempfile.mkstemp(dir=ruta.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(contenido)
+        try:
+            anterior = ruta.stat().st_size
+        except FileNotFoundError:
+            anterior = 0
+        os.replace(temporal, ruta)
+
+        with self._lock_disco:
+            if self._bytes_disco is not None:
+                self._bytes_disco += len(contenido) - anterior
+                if self._bytes_disco <= self.max_bytes_disco:
+                    return
+            self._desalojar_disco()
+
+    def _desalojar_disco(self):
+        """Recorre el directorio y borra los menos usados; se llama con _lock_disco."""
+        archivos = []
+        total = 0
+        for carpeta in self.directorio.iterdir():
+            if not carpeta.is_dir():
+                continue
+            for entrada in os.scandir(carpeta):
+                if entrada.name.endswith(".pdf"):
+                    try:
+                        info = entrada.stat()
+                    except FileNotFoundError:
+                        continue
+                    archivos.append((info.st_mtime, info.st_size, entrada.path))
+                    total += info.st_size
+
+        if total > self.max_bytes_disco:
+            objetivo = self.max_bytes_disco * self.FRACCION_DESALOJO
+            archivos.sort()
+            for _, tamano, ruta in archivos:
+                if total <= objetivo:
+                    break
+                try:
+                    os.remove(ruta)
+                except FileNotFoundError:
+                    pass
+                total -= tamano
+        self._bytes_disco = total
+
+
+cache_asistencia = CachePDF(
+    settings.PDF_CACHE_DIR,
+    max_entradas_memoria=settings.PDF_CACHE_MAX_ENTRADAS,
+    max_bytes_disco=settings.PDF_CACHE_MAX_BYTES,
+)
@@ -0,0 +1,142 @@
+import io
+from collections import deque
+
+from pypdf import PdfReader
+from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, NameObject, StreamObject
+
+# Objetos fijos del documento unido; el resto se numera a partir de 3
+CATALOGO = 1
+PAGINAS = 2
+
+
+class UnionPDFIncremental:
+    """
+    Une varios PDFs en uno solo escribiendo los bytes conforme llegan.
+
+    Cada PDF parcial se copia completo (páginas y sus recursos) y se descarta,
+    así que en memoria solo queda la lista de offsets del xref y los números de
+    las páginas. El árbol de páginas, el catálogo y el xref se escriben al final.
+
+        union = UnionPDFIncremental()
+        yield union.inicio()
+        for parcial in parciales:
+            yield union.agregar(parcial)
+        yield union.cerrar()
+    """
+
+    def __init__(self):
+        self._posicion = 0
+        self._offsets = {}
+        self._siguiente = PAGINAS + 1
+        self._paginas = []
+
+    def _emitir(self, salida, datos):
+        salida.write(datos)
+        self._posicion += len(datos)
+
+    def inicio(self):
+        salida = io.BytesIO()
+        self._emitir(salida, b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        return salida.getvalue()
+
+    def agregar(self, contenido_pdf):
+        """Copia las páginas de `contenido_pdf` y devuelve los bytes a enviar."""
+        reader = PdfReader(io.BytesIO(contenido_pdf))
+        mapa = {}
+        pendientes = deque()
+
+        def numero(referencia):
+            clave = (referencia.idnum, referencia.generation)
+            if clave not in mapa:
+                mapa[clave] = self._siguiente
+                self._siguiente += 1
+                pendientes.append(referencia)
+            return mapa[clave]
+
+        paginas = {}
+        for pagina in reader.pages:
+            num = numero(pagina.indirect_reference)
+            paginas[num] = pagina
+            self._paginas.append(num)
+
+        salida = io.BytesIO()
+        while pendientes:
+            referencia = pendientes.popleft()
+            num = mapa[(referencia.idnum, referencia.generation)]
+            objeto = paginas[num] if num in paginas else referencia.get_object()
+
+            self._offsets[num] = self._posicion
+            cuerpo = io.BytesIO()
+            cuerpo.write(b"%d 0 obj\n" % num)
+            _escribir(cuerpo, objeto, numero, es_pagina=num in paginas)
+            cuerpo.write(b"\nendobj\n")
+            self._emitir(salida, cuerpo.getvalue())
+
+        return salida.getvalue()
+
+    def cerrar(self):
+        """Escribe el árbol de páginas, el catálogo, el xref y el trailer."""
+        salida = io.BytesIO()
+
+        self._offsets[PAGINAS] = self._posicion
+        kids = b" ".join(b"%d 0 R" % num for num in self._paginas)
+        self._emitir(salida, b"%d 0 obj\n<< /Type /Pages /Count %d /Kids [%s] >>\nendobj\n"
+                     % (PAGINAS, len(self._paginas), kids))
+
+        self._offsets[CATALOGO] = self._posicion
+        self._emitir(salida, b"%d 0 obj\n<< /Type /Catalog /Pages %d 0 R >>\nendobj\n" % (CATALOGO, PAGINAS))
+
+        inicio_xref = self._posicion
+        total = self._siguiente
+        xref = [b"xref\n0 %d\n" % total, b"0000000000 65535 f \n"]
+        xref.extend(b"%010d 00000 n \n" % self._offsets[num] for num in range(1, total))
+        xref.append(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+                    % (total, CATALOGO, inicio_xref))
+        self._emitir(salida, b"".join(xref))
+        return salida.getvalue()
+
+
+def _escribir(salida, objeto, numero, es_pagina=False):
+    """Serializa un objeto de pypdf renumerando sus referencias indirectas con `numero`."""
+    if isinstance(objeto, IndirectObject):
+        salida.write(b"%d 0 R" % numero(objeto))
+    elif isinstance(objeto, DictionaryObject):
+        es_stream = isinstance(objeto, StreamObject)
+        salida.write(b"<<")
+        for clave, valor in objeto.items():
+            if es_pagina and clave == "/Parent":
+                continue
+            if es_stream and clave == "/Length":
+                continue
+            salida.write(b" ")
+            NameObject(clave).write_to_stream(salida)
+            salida.write(b" ")
+            _escribir(salida, valor, numero)
+        if es_pagina:
+            salida.write(b" /Parent %d 0 R" % PAGINAS)
+        if es_stream:
+            # Se copian los bytes ya codificados (p. ej. Flate) sin descomprimir
+            datos = objeto._data
+            salida.write(b" /Length %d >>\nstream\n" % len(datos))
+            salida.write(datos)
+            salida.write(b"\nendstream")
+        else:
+            salida.write(b" >>")
+    elif isinstance(objeto, ArrayObject):
+        salida.write(b"[")
+        for i, valor in enumerate(objeto):
+            if i:
+                salida.write(b" ")
+            _escribir(salida, valor, numero)
+        salida.write(b"]")
+    else:
+        objeto.write_to_stream(salida)
+
+
+def unir_pdfs(parciales):
+    """Generador con los bytes del PDF que une `parciales`, en orden."""
+    union = UnionPDFIncremental()
+    yield union.inicio()
+    for parcial in parciales:
+        yield union.agregar(parcial)
+    yield union.cerrar()
@@ -0,0 +1,278 @@
+import io
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from functools import lru_cache
+import multiprocessing
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Table, TableStyle
+
+WEEKDAY_NAMES = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes"]
+
+# --- Colores predefinidos (formato individual) ---
+COLOR_MAP = {
+    "red": (0.75, 0.12, 0.15),
+    "green": (0.0, 0.6, 0.3),
+    "blue": (0.0, 0.3, 0.7),
+    "orange": (1.0, 0.5, 0.0),
+    "purple": (0.5, 0.0, 0.5),
+    "teal": (0.0, 0.5, 0.5),
+    "yellow": (1.0, 0.9, 0.0),
+    "pink": (1.0, 0.4, 0.6),
+    "gray": (0.5, 0.5, 0.5),
+    "brown": (0.6, 0.4, 0.2),
+}
+COLOR_DEFAULT = COLOR_MAP["red"]
+
+# --- Colores del formato general (rotan cada ALUMNOS_POR_COLOR alumnos) ---
+COLOR_MAP_GENERAL = {
+    "yellow": (0.894, 0.922, 0.157),
+    "red": (0.722, 0.200, 0.086),
+    "green": (0.310, 0.722, 0.086),
+    "blue": (0.086, 0.565, 0.722),
+    "pink": (0.800, 0.094, 0.753),
+}
+ALUMNOS_POR_COLOR = 15
+
+# Cambiar al modificar el layout: forma parte de la clave del cache de PDFs
+VERSION_PLANTILLA = 1
+
+# Alumnos por PDF parcial al renderizar por lotes (stream / procesos)
+ALUMNOS_POR_LOTE = 50
+
+# Márgenes y medidas de la hoja
+WIDTH, HEIGHT = A4
+LEFT_MARGIN = 20 * mm
+RIGHT_MARGIN = 20 * mm
+TOP_MARGIN = 20 * mm
+USABLE_WIDTH = WIDTH - LEFT_MARGIN - RIGHT_MARGIN
+HEADER_HEIGHT = 18 * mm
+FILA_ALTO_FECHA = 12 * mm
+FILA_ALTO_FIRMA = 20 * mm
+
+TABLE_STYLE = TableStyle([
+    ("GRID", (0, 0), (-1, -1), 0.6, colors.black),
+    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+    ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
+    ("FONTSIZE", (0, 0), (-1, -1), 9),
+])
+
+
+def color_general(indice):
+    """Color de encabezado del alumno en la posición `indice` del formato general."""
+    nombres = list(COLOR_MAP_GENERAL.keys())
+    return COLOR_MAP_GENERAL[nombres[(indice // ALUMNOS_POR_COLOR) % len(nombres)]]
+
+
+def get_weeks(fecha_inicio, fecha_fin):
+    # --- Calcular primer lunes ---
+    # Si fecha_inicio cae en sabado (5) o domingo (6), avanzamos al lunes siguiente
+    if fecha_inicio.weekday() == 5:
+        primer_lunes = fecha_inicio + timedelta(days=2)
+    elif fecha_inicio.weekday() == 6:
+        primer_lunes = fecha_inicio + timedelta(days=1)
+    else:
+        primer_lunes = fecha_inicio - timedelta(days=fecha_inicio.weekday())
+
+    semanas = []
+    cursor = primer_lunes
+    while cursor <= fecha_fin:
+        semana = []
+        for d in range(5):
+            dia_fecha = cursor + timedelta(days=d)
+            if fecha_inicio <= dia_fecha <= fecha_fin:
+                fecha_str = dia_fecha.strftime("%d/%m/%Y")
+                semana.append({"dia": WEEKDAY_NAMES[d], "fecha": fecha_str})
+            else:
+                semana.append({"dia": WEEKDAY_NAMES[d], "fecha": ""})
+        semanas.append(semana)
+        cursor += timedelta(weeks=1)
+    return semanas
+
+
+class PlantillaAsistencia:
+    """
+    Layout del formato de asistencia para un período.
+
+    Las semanas, la tabla y su paginado se calculan una sola vez. La parte
+    estática de cada página (título, período y tabla) se dibuja como un form
+    XObject por documento, así que por alumno solo se estampan la banda de
+    color, el NC y el nombre.
+    """
+
+    def __init__(self, fecha_inicio, fecha_fin):
+        self.fecha_inicio = fecha_inicio
+        self.fecha_fin = fecha_fin
+        self.semanas = get_weeks(fecha_inicio, fecha_fin)
+
+        # Posiciones de los textos de cada página
+        self.y_datos = HEIGHT - TOP_MARGIN - HEADER_HEIGHT - 12
+        self.y_periodo = self.y_datos - 16
+        self.y_tabla = self.y_periodo - 22
+
+        # --- Construir tabla ---
+        data = []
+        for semana in self.semanas:
+            fila_fechas = []
+            for cel in semana:
+                texto = cel["dia"]
+                if cel["fecha"]:
+                    texto = f"{texto}\n{cel['fecha']}"
+                fila_fechas.append(texto)
+            data.append(fila_fechas)
+            data.append([""] * 5)
+
+        if not data:
+            data = [[f"{d}\n" for d in WEEKDAY_NAMES], [""] * 5]
+
+        row_heights = [FILA_ALTO_FECHA if i % 2 == 0 else FILA_ALTO_FIRMA for i in range(len(data))]
+
+        # --- Paginado: filas que caben en cada página ---
+        self.paginas = []
+        remaining_height = self.y_tabla - 40
+        current_row = 0
+        while current_row < len(data):
+            h_sum = 0
+            rows_fit = 0
+            for r in range(current_row, len(data)):
+                h_sum += row_heights[r]
+                if h_sum <= remaining_height:
+                    rows_fit += 1
+                else:
+                    break
+            rows_fit = max(rows_fit, 1)
+            self.paginas.append((
+                data[current_row: current_row + rows_fit],
+                row_heights[current_row: current_row + rows_fit],
+            ))
+            current_row += rows_fit
+
+        self.texto_periodo = f"Período: {fecha_inicio.strftime('%d/%m/%Y')} — {fecha_fin.strftime('%d/%m/%Y')}"
+        self._prefijo_forma = f"asistencia_{fecha_inicio:%Y%m%d}_{fecha_fin:%Y%m%d}"
+
+    def _nombre_forma(self, pagina):
+        return f"{self._prefijo_forma}_{pagina}"
+
+    def _definir_formas(self, pdf):
+        """Registra en el documento un form XObject por página de la plantilla (una sola vez)."""
+        if pdf.hasForm(self._nombre_forma(0)):
+            return
+
+        col_width = USABLE_WIDTH / 5.0
+        for pagina, (sub_data, sub_heights) in enumerate(self.paginas):
+            pdf.beginForm(self._nombre_forma(pagina))
+
+            pdf.setFillColor(colors.white)
+            pdf.setFont("Helvetica-Bold", 14)
+            pdf.drawCentredString(LEFT_MARGIN + USABLE_WIDTH / 2, HEIGHT - TOP_MARGIN - HEADER_HEIGHT / 2 + 4, "FORMATO DE ASISTENCIA")
+
+            pdf.setFillColor(colors.black)
+            pdf.setFont("Helvetica", 11)
+            pdf.drawString(LEFT_MARGIN, self.y_periodo, self.texto_periodo)
+
+            tabla = Table(sub_data, colWidths=[col_width] * 5, rowHeights=sub_heights)
+            tabla.setStyle(TABLE_STYLE)
+            tabla.wrapOn(pdf, LEFT_MARGIN, self.y_tabla)
+            tabla.drawOn(pdf, LEFT_MARGIN, self.y_tabla - sum(sub_heights))
+
+            pdf.endForm()
+
+    def dibujar(self, pdf, nc, nombre, header_color):
+        """Agrega al canvas las páginas de un alumno."""
+        self._definir_formas(pdf)
+
+        for pagina in range(len(self.paginas)):
+            # Banda de encabezado (el título blanco viene en la forma)
+            pdf.setFillColorRGB(*header_color)
+            pdf.rect(LEFT_MARGIN, HEIGHT - TOP_MARGIN - HEADER_HEIGHT, USABLE_WIDTH, HEADER_HEIGHT, stroke=0, fill=1)
+
+            pdf.doForm(self._nombre_forma(pagina))
+
+            # Datos del alumno
+            pdf.setFillColor(colors.black)
+            pdf.setFont("Helvetica", 11)
+            pdf.drawString(LEFT_MARGIN, self.y_datos, f"NC: {nc}")
+            pdf.drawString(LEFT_MARGIN + 220, self.y_datos, f"Nombre completo: {nombre}")
+
+            pdf.showPage()
+
+
+@lru_cache(maxsize=32)
+def plantilla_asistencia(fecha_inicio, fecha_fin):
+    """Plantilla compartida por período; es inmutable, así que se reutiliza entre requests."""
+    return PlantillaAsistencia(fecha_inicio, fecha_fin)
+
+
+def render_pdf_alumno(nc, nombre, fecha_inicio, fecha_fin, header_color):
+    """PDF de asistencia de un alumno. Invariante: mismos parámetros, mismos bytes."""
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4, invariant=1)
+    plantilla_asistencia(fecha_inicio, fecha_fin).dibujar(pdf, nc, nombre, header_color)
+    pdf.save()
+    return buffer.getvalue()
+
+
+def render_lote_asistencia(alumnos, fecha_inicio, fecha_fin, indice_inicial=0):
+    """
+    Renderiza un PDF con las hojas de `alumnos` (lista de (nc, nombre)).
+
+    `indice_inicial` es la posición del primer alumno dentro del formato
+    general, para que la rotación de colores continúe entre lotes. El canvas
+    es invariante (sin fecha ni id aleatorio), así que el mismo lote produce
+    siempre los mismos bytes.
+    """
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4, invariant=1)
+    plantilla = plantilla_asistencia(fecha_inicio, fecha_fin)
+    for i, (nc, nombre) in enumerate(alumnos, start=indice_inicial):
+        plantilla.dibujar(pdf, nc, nombre, color_general(i))
+    pdf.save()
+    return buffer.getvalue()
+
+
+def lotes(iterable, tamano):
+    """Agrupa `iterable` en listas de `tamano` elementos (la última puede ser menor)."""
+    lote = []
+    for elemento in iterable:
+        lote.append(elemento)
+        if len(lote) == tamano:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def render_lotes_asistencia(alumnos, fecha_inicio, fecha_fin, workers=1, tamano_lote=ALUMNOS_POR_LOTE):
+    """
+    Genera, en orden, un PDF parcial por cada lote de `alumnos`.
+
+    Con workers > 1 los lotes se renderizan en un pool de procesos; como
+    mucho hay 2 lotes por proceso en vuelo, así que `alumnos` se consume de
+    forma perezosa igual que en el modo serial. Los bytes son idénticos en
+    ambos modos.
+    """
+    tareas = (
+        (lote, fecha_inicio, fecha_fin, n * tamano_lote)
+        for n, lote in enumerate(lotes(alumnos, tamano_lote))
+    )
+
+    if workers <= 1:
+        for tarea in tareas:
+            yield render_lote_asistencia(*tarea)
+        return
+
+    # spawn: los procesos hijos no heredan conexiones ni hilos del worker de Django
+    contexto = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=contexto) as pool:
+        pendientes = deque()
+        for tarea in tareas:
+            pendientes.append(pool.submit(render_lote_asistencia, *tarea))
+            if len(pendientes) >= workers * 2:
+                yield pendientes.popleft().result()
+        while pendientes:
+            yield pendientes.popleft().result()
@@ -0,0 +1,34 @@
+from rest_framework.utils import encoders
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - sin orjson se usa el json de la stdlib
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer con orjson. La salida compacta es la misma, byte por byte,
+    que la de JSONRenderer: fechas y tipos que orjson no maneja igual pasan
+    por el encoder de DRF, y U+2028 / U+2029 se escapan como allá. Con indent
+    (API navegable, `; indent=N`) o sin orjson se usa el renderer original.
+    """
+    _encoder = encoders.JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (orjson is None or self.ensure_ascii or not self.compact
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            contenido = orjson.dumps(
+                data, default=self._encoder.default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS,
+            )
+        except orjson.JSONEncodeError:
+            # p. ej. enteros de más de 64 bits
+            return super().render(data, accepted_media_type, renderer_context)
+        return contenido.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
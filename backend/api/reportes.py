@@ -0,0 +1,130 @@
+import io
+import itertools
+import time
+import zipfile
+from datetime import datetime
+
+from django.conf import settings
+
+from api.models import Beca
+from api.pdf_stream import unir_pdfs
+from api.pdf_utils import ALUMNOS_POR_LOTE, render_lotes_asistencia, render_pdf_alumno
+
+
+def fechas_reporte(parametros):
+    """
+    Lee fecha_inicio / fecha_fin (YYYY-MM-DD) de un QueryDict o dict.
+    Lanza ValueError con el mensaje para el cliente.
+    """
+    start = parametros.get("fecha_inicio", datetime.today().strftime("%Y-%m-%d"))
+    end = parametros.get("fecha_fin", "2025-11-30")
+
+    try:
+        fecha_inicio = datetime.strptime(start, "%Y-%m-%d").date()
+        fecha_fin = datetime.strptime(end, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        raise ValueError("Fechas deben tener formato YYYY-MM-DD")
+
+    if fecha_fin < fecha_inicio:
+        raise ValueError("La fecha fin debe ser posterior o igual a la fecha inicio")
+    return fecha_inicio, fecha_fin
+
+
+# Filas por fetch del cursor del lado del servidor al leer becas para reportes
+FILAS_POR_CHUNK = 2000
+
+
+def becas_aprobadas(tipo_beca=None, carrera=None):
+    becas = Beca.objects.filter(estatus="aprobada", numero_control__isnull=False).order_by("beca_id")
+    if tipo_beca:
+        becas = becas.filter(tipo_beca__iexact=tipo_beca)
+    if carrera:
+        becas = becas.filter(numero_control__carrera__iexact=carrera)
+    return becas
+
+
+def alumnos_de_becas(becas):
+    """
+    (nc, nombre completo) por beca.
+
+    Solo se piden las tres columnas que se dibujan (nada de observaciones /
+    notas_internas ni instancias de modelo) y se leen con un cursor del lado
+    del servidor en bloques de FILAS_POR_CHUNK, así la memoria queda plana.
+    """
+    filas = becas.values_list("numero_control_id", "numero_control__nombre", "numero_control__apellido")
+    for nc, nombre, apellido in filas.iterator(chunk_size=FILAS_POR_CHUNK):
+        yield nc, f"{nombre} {apellido}"
+
+
+def alumnos_o_none(becas):
+    """
+    Iterador de alumnos_de_becas, o None si no hay ninguno. Se lee la primera
+    fila en lugar de hacer un exists() aparte, así la consulta corre una sola vez.
+    """
+    alumnos = alumnos_de_becas(becas)
+    primero = next(alumnos, None)
+    if primero is None:
+        return None
+    return itertools.chain([primero], alumnos)
+
+
+def pdf_asistencia_general(alumnos, fecha_inicio, fecha_fin, al_terminar_lote=None):
+    """
+    Bytes del PDF general, por partes. Cada lote de ALUMNOS_POR_LOTE alumnos se
+    renderiza como PDF parcial (en paralelo si PDF_RENDER_WORKERS > 1) y se une
+    en orden. `al_terminar_lote(n)` recibe los alumnos renderizados hasta ahora.
+    """
+    parciales = render_lotes_asistencia(alumnos, fecha_inicio, fecha_fin, workers=settings.PDF_RENDER_WORKERS)
+    if al_terminar_lote is not None:
+        parciales = _con_avance(parciales, al_terminar_lote)
+    return unir_pdfs(parciales)
+
+
+def _con_avance(parciales, al_terminar_lote):
+    for n, parcial in enumerate(parciales, start=1):
+        yield parcial
+        al_terminar_lote(n * ALUMNOS_POR_LOTE)
+
+
+class _SalidaZip(io.RawIOBase):
+    """Destino no seekable para ZipFile: acumula lo escrito hasta que se vacía."""
+
+    def __init__(self):
+        super().__init__()
+        self._partes = []
+
+    def writable(self):
+        return True
+
+    def write(self, datos):
+        self._partes.append(bytes(datos))
+        return len(datos)
+
+    def vaciar(self):
+        datos = b"".join(self._partes)
+        self._partes.clear()
+        return datos
+
+
+def zip_asistencias(alumnos, fecha_inicio, fecha_fin, header_color):
+    """
+    Bytes de un ZIP con un asistencia_{nc}.pdf por alumno, por partes.
+
+    Cada PDF se renderiza, se comprime y se envía antes de pasar al siguiente,
+    así que en memoria solo está la entrada actual.
+    """
+    salida = _SalidaZip()
+    fecha_zip = time.localtime()[:6]
+    usados = {}
+    with zipfile.ZipFile(salida, "w", compression=zipfile.ZIP_DEFLATED) as archivo_zip:
+        for nc, nombre in alumnos:
+            # Un alumno con varias becas aprobadas: asistencia_{nc}_2.pdf, ...
+            usados[nc] = usados.get(nc, 0) + 1
+            sufijo = f"_{usados[nc]}" if usados[nc] > 1 else ""
+
+            info = zipfile.ZipInfo(f"asistencia_{nc}{sufijo}.pdf", date_time=fecha_zip)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            archivo_zip.writestr(info, render_pdf_alumno(nc, nombre, fecha_inicio, fecha_fin, header_color))
+            yield salida.vaciar()
+    # Directorio central del ZIP
+    yield salida.vaciar()
@@ -0,0 +1,76 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from api.versiones import modificado, versiones
+
+
+class CacheRespuestaMixin:
+    """
+    Cache de list / retrieve por (ruta, query params, formato) con las
+    versiones de `cache_modelos` dentro de la clave: un post_save / post_delete
+    en cualquiera de ellos invalida todas las respuestas que dependen de él.
+
+    La clave es también el ETag y Last-Modified es el último cambio de esos
+    modelos, así que If-None-Match / If-Modified-Since responden 304 sin tocar
+    la base ni el cache de contenido. El backend es el alias API_CACHE_ALIAS de
+    CACHES (locmem, file o db según CACHE_BACKEND).
+    """
+    cache_modelos = ()
+
+    def list(self, request, *args, **kwargs):
+        return self._respuesta_cacheada(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._respuesta_cacheada(super().retrieve, request, *args, **kwargs)
+
+    def _clave_respuesta(self, request):
+        modelos = self.cache_modelos or (self.queryset.model,)
+        partes = [
+            request.path,
+            sorted(request.query_params.lists()),
+            request.accepted_renderer.format,
+            versiones(*modelos),
+        ]
+        return hashlib.sha256(json.dumps(partes).encode()).hexdigest()
+
+    def _respuesta_cacheada(self, vista, request, *args, **kwargs):
+        if not settings.API_CACHE_RESPUESTAS:
+            return vista(request, *args, **kwargs)
+
+        clave = self._clave_respuesta(request)
+        etag = quote_etag(clave)
+        # HTTP maneja segundos enteros
+        ultimo_cambio = int(modificado(*(self.cache_modelos or (self.queryset.model,))))
+
+        no_modificada = get_conditional_response(request, etag=etag, last_modified=ultimo_cambio)
+        if no_modificada is not None:
+            return self._con_cabeceras(no_modificada, etag, ultimo_cambio)
+
+        cache = caches[settings.API_CACHE_ALIAS]
+        entrada = cache.get(f"api:respuesta:{clave}")
+        if entrada is None:
+            response = vista(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            response = self.finalize_response(request, response, *args, **kwargs)
+            response.render()
+            entrada = (response.content, response['Content-Type'])
+            cache.set(f"api:respuesta:{clave}", entrada, settings.API_CACHE_SEGUNDOS)
+
+        contenido, content_type = entrada
+        return self._con_cabeceras(HttpResponse(contenido, content_type=content_type), etag, ultimo_cambio)
+
+    @staticmethod
+    def _con_cabeceras(response, etag, ultimo_cambio):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(ultimo_cambio)
+        # El navegador guarda la respuesta pero revalida cada vez (304 si no cambió)
+        response['Cache-Control'] = 'no-cache'
+        patch_vary_headers(response, ['Accept'])
+        return response
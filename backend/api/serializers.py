@@ -1,21 +1,53 @@
 from rest_framework import serializers
 from .models import Estudiante, Beca, AsistenciaBeca
+from .campos import incluye, parametros_campos, sub_seleccion
 
-class EstudianteMiniSerializer(serializers.ModelSerializer):
+class CamposDinamicosMixin:
+    """
+    Aplica ?fields= / ?expand= (ver api.campos) quitando de `fields` lo que no se
+    pidió. Las relaciones anidadas se listan en `relaciones_expandibles`.
+    """
+    relaciones_expandibles = ()
+
+    def __init__(self, *args, **kwargs):
+        campos = kwargs.pop('campos', None)
+        expandir = kwargs.pop('expandir', None)
+        super().__init__(*args, **kwargs)
+
+        if expandir is None:
+            request = self.context.get('request')
+            if request is None or not hasattr(request, 'query_params') or request.method != 'GET':
+                return
+            campos, expandir = parametros_campos(request.query_params)
+        if expandir is not None:
+            self.aplicar_seleccion(campos, expandir)
+
+    def aplicar_seleccion(self, campos, expandir):
+        for nombre in list(self.fields):
+            es_relacion = nombre in self.relaciones_expandibles
+            if not incluye(nombre, campos, expandir, es_relacion):
+                self.fields.pop(nombre)
+            elif es_relacion:
+                campo = self.fields[nombre]
+                anidado = getattr(campo, 'child', campo)
+                anidado.aplicar_seleccion(*sub_seleccion(nombre, campos, expandir))
+
+class EstudianteMiniSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     class Meta:
         model = Estudiante
         fields = ['numero_control', 'nombre', 'apellido']
         
-class AsistenciaBecaSerializer(serializers.ModelSerializer):
+class AsistenciaBecaSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     class Meta:
         model = AsistenciaBeca
         fields = [
             'asistencia_id', 'fecha_inicio', 'fecha_fin', 'beca_id'
         ]
         
-class BecaSerializer(serializers.ModelSerializer):
+class BecaSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     estudiante = EstudianteMiniSerializer(source='numero_control', read_only=True)
     asistencias = AsistenciaBecaSerializer(many=True, read_only=True)
+    relaciones_expandibles = ('estudiante', 'asistencias')
     
     class Meta:
         model = Beca
@@ -25,8 +57,10 @@ class BecaSerializer(serializers.ModelSerializer):
             'estatus', 'observaciones', 'notas_internas', 'estudiante', 'asistencias'
         ]
 
-class EstudianteSerializer(serializers.ModelSerializer):
+class EstudianteSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     becas = BecaSerializer(many=True, read_only=True)
+    relaciones_expandibles = ('becas',)
+
     class Meta:
         model = Estudiante
         fields = [
@@ -34,4 +68,3 @@ class EstudianteSerializer(serializers.ModelSerializer):
             'email', 'carrera', 'semestre', 'telefono',
             'fecha_registro', 'becas'
         ]
-
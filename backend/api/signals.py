@@ -0,0 +1,47 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from api import cambios, estadisticas
+from api.models import AsistenciaBeca, Beca, Cambio, Estudiante
+from api.versiones import incrementar_version
+
+
+@receiver([post_save, post_delete], sender=Estudiante)
+@receiver([post_save, post_delete], sender=Beca)
+@receiver([post_save, post_delete], sender=AsistenciaBeca)
+def invalidar_cache_modelo(sender, using, **kwargs):
+    incrementar_version(sender, using=using)
+
+
+# --- Bitácora de cambios para /api/changes/ (api.cambios) ---
+@receiver(post_save, sender=Estudiante)
+@receiver(post_save, sender=Beca)
+@receiver(post_save, sender=AsistenciaBeca)
+def registrar_guardado(sender, instance, using, **kwargs):
+    cambios.registrar(sender, [instance.pk], Cambio.UPSERT, using=using)
+
+
+@receiver(post_delete, sender=Estudiante)
+@receiver(post_delete, sender=Beca)
+@receiver(post_delete, sender=AsistenciaBeca)
+def registrar_borrado(sender, instance, using, **kwargs):
+    cambios.registrar(sender, [instance.pk], Cambio.DELETE, using=using)
+
+
+# --- Conteos de becas (api.estadisticas) ---
+@receiver(pre_save, sender=Beca)
+def recordar_estado_beca(sender, instance, **kwargs):
+    anterior = None
+    if not instance._state.adding and instance.pk is not None:
+        anterior = Beca.objects.filter(pk=instance.pk).values_list('estatus', 'tipo_beca', 'fecha_aprobacion').first()
+    instance._estado_anterior = anterior
+
+
+@receiver(post_save, sender=Beca)
+def contar_beca_guardada(sender, instance, **kwargs):
+    estadisticas.cambio_beca(getattr(instance, '_estado_anterior', None), estadisticas.estado_beca(instance))
+
+
+@receiver(post_delete, sender=Beca)
+def descontar_beca_borrada(sender, instance, **kwargs):
+    estadisticas.cambio_beca(estadisticas.estado_beca(instance), None)
@@ -1,3 +1,1021 @@
-from django.test import TestCase
+import base64
+import io
+import json
+import tempfile
+import threading
+import time
+import zipfile
+from datetime import date, datetime
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.test import SimpleTestCase, TestCase, override_settings
+from pypdf import PdfReader
+
+from api.models import Estudiante, Beca, AsistenciaBeca
+from api.serializers import AsistenciaBecaSerializer, BecaSerializer, EstudianteSerializer
+from api.pdf_cache import CachePDF
+from api.pdf_stream import unir_pdfs
+from api.pdf_utils import render_lote_asistencia, render_lotes_asistencia
+
+FECHA_INICIO = date(2025, 8, 25)
+FECHA_FIN = date(2025, 12, 12)
+
+
+def _contenidos(pdf_bytes):
+    return [pagina.get_contents().get_data() for pagina in PdfReader(io.BytesIO(pdf_bytes)).pages]
+
+
+class RenderPorLotesTests(SimpleTestCase):
+    alumnos = [(f"2229{i:04d}", f"Alumno {i}") for i in range(40)]
+
+    def test_paralelo_identico_al_serial(self):
+        serial = b"".join(unir_pdfs(render_lotes_asistencia(
+            self.alumnos, FECHA_INICIO, FECHA_FIN, workers=1, tamano_lote=7)))
+        paralelo = b"".join(unir_pdfs(render_lotes_asistencia(
+            self.alumnos, FECHA_INICIO, FECHA_FIN, workers=3, tamano_lote=7)))
+        self.assertEqual(serial, paralelo)
+
+    def test_lotes_conservan_orden_y_colores(self):
+        # Un solo documento vs. lotes de 7: la rotación cada 15 alumnos cruza los lotes
+        completo = render_lote_asistencia(self.alumnos, FECHA_INICIO, FECHA_FIN)
+        por_lotes = b"".join(unir_pdfs(render_lotes_asistencia(
+            self.alumnos, FECHA_INICIO, FECHA_FIN, tamano_lote=7)))
+        self.assertEqual(_contenidos(completo), _contenidos(por_lotes))
+
+
+class PlantillaAsistenciaTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(3):
+            estudiante = Estudiante.objects.create(
+                numero_control=f"2230{i:04d}", nombre=f"Alumno{i}", apellido="Plantilla", email=f"p{i}@test.mx")
+            Beca.objects.create(numero_control=estudiante, estatus="aprobada")
+
+    def _pdf(self, fecha_inicio, fecha_fin):
+        respuesta = self.client.get("/api/pdf/asistencia_general/", {"fecha_inicio": fecha_inicio, "fecha_fin": fecha_fin})
+        self.assertEqual(respuesta.status_code, 200)
+        return respuesta.content
+
+    @staticmethod
+    def _paginas(pdf):
+        return pdf.count(b"/Type /Page") - pdf.count(b"/Type /Pages")
+
+    def test_periodo_largo_se_pagina(self):
+        self.assertEqual(self._paginas(self._pdf("2025-11-03", "2025-11-28")), 3)
+        # 16 semanas no caben en una hoja: cada alumno ocupa 3 páginas
+        self.assertEqual(self._paginas(self._pdf("2025-08-25", "2025-12-12")), 3 * 3)
+
+    def test_formas_compartidas_entre_alumnos(self):
+        # Una forma por página de la plantilla, no una por página del documento
+        self.assertEqual(self._pdf("2025-08-25", "2025-12-12").count(b"/Subtype /Form"), 3)
+
+
+class AsistenciaGeneralTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(60):
+            estudiante = Estudiante.objects.create(
+                numero_control=f"2229{i:04d}", nombre=f"Alumno{i}", apellido="Prueba", email=f"a{i}@test.mx",
+                carrera="Sistemas" if i % 2 else "Industrial")
+            Beca.objects.create(numero_control=estudiante, estatus="aprobada" if i % 4 else "pendiente")
+
+    def _get(self, **params):
+        params = {"fecha_inicio": "2025-08-25", "fecha_fin": "2025-12-12", **params}
+        return self.client.get("/api/pdf/asistencia_general/", params)
+
+    def test_stream_igual_a_respuesta_completa(self):
+        completo = self._get()
+        stream = self._get(stream="1")
+        self.assertEqual(completo.status_code, 200)
+        self.assertTrue(stream.streaming)
+        contenido = b"".join(stream.streaming_content)
+        self.assertEqual(contenido, completo.content)
+        self.assertEqual(len(PdfReader(io.BytesIO(contenido)).pages), 45 * 3)
+
+    @override_settings(PDF_RENDER_WORKERS=2)
+    def test_paralelo_igual_a_serial(self):
+        paralelo = self._get().content
+        with self.settings(PDF_RENDER_WORKERS=1):
+            serial = self._get().content
+        self.assertEqual(paralelo, serial)
+
+    def test_zip_por_alumno_con_filtros(self):
+        respuesta = self.client.get("/api/pdf/asistencia_zip/", {
+            "fecha_inicio": "2025-11-03", "fecha_fin": "2025-11-28", "carrera": "sistemas"})
+        self.assertTrue(respuesta.streaming)
+        archivo = zipfile.ZipFile(io.BytesIO(b"".join(respuesta.streaming_content)))
+        nombres = archivo.namelist()
+        # Impares (Sistemas) con beca aprobada (i % 4 != 0): 30 alumnos
+        self.assertEqual(len(nombres), 30)
+        self.assertEqual(nombres[0], "asistencia_22290001.pdf")
+        self.assertIsNone(archivo.testzip())
+        self.assertEqual(len(PdfReader(io.BytesIO(archivo.read(nombres[0]))).pages), 1)
+
+    def test_sin_becas_aprobadas(self):
+        Beca.objects.filter(estatus="aprobada").update(estatus="pendiente")
+        self.assertEqual(self._get().status_code, 400)
+
+
+class CachePDFTests(SimpleTestCase):
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+
+    def test_single_flight(self):
+        cache = CachePDF(self.directorio.name)
+        llamadas = []
+
+        def render():
+            llamadas.append(1)
+            time.sleep(0.2)
+            return b"%PDF"
+
+        resultados = []
+        hilos = [threading.Thread(target=lambda: resultados.append(cache.obtener("abc", render))) for _ in range(8)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        self.assertEqual(len(llamadas), 1)
+        self.assertEqual(resultados, [b"%PDF"] * 8)
+
+    def test_nivel_disco_y_desalojo(self):
+        cache = CachePDF(self.directorio.name, max_entradas_memoria=1, max_bytes_disco=25)
+        cache.obtener("aa1", lambda: b"1" * 10)
+        time.sleep(0.05)
+        cache.obtener("bb2", lambda: b"2" * 10)
+        time.sleep(0.05)
+        # aa1 ya no está en memoria pero sí en disco
+        self.assertEqual(cache.obtener("aa1", lambda: self.fail("no debe renderizar")), b"1" * 10)
+        time.sleep(0.05)
+        cache.obtener("cc3", lambda: b"3" * 10)
+        # Se desaloja bb2, el usado hace más tiempo
+        archivos = sorted(p.name for p in Path(self.directorio.name).rglob("*.pdf"))
+        self.assertEqual(archivos, ["aa1.pdf", "cc3.pdf"])
+
+    def test_desalojo_solo_recorre_al_pasar_el_limite(self):
+        cache = CachePDF(self.directorio.name, max_entradas_memoria=1, max_bytes_disco=100)
+        with mock.patch.object(cache, "_desalojar_disco", wraps=cache._desalojar_disco) as desalojar:
+            for i in range(9):
+                cache.obtener(f"{i:02d}x", lambda: b"x" * 10)
+            # Solo el recorrido inicial; después basta con el contador
+            self.assertEqual(desalojar.call_count, 1)
+            cache.obtener("10x", lambda: b"x" * 10)
+            cache.obtener("11x", lambda: b"x" * 10)
+            self.assertEqual(desalojar.call_count, 2)
+        # Se desaloja hasta el 90% del límite
+        self.assertEqual(cache._bytes_disco, 90)
+        self.assertEqual(len(list(Path(self.directorio.name).rglob("*.pdf"))), 9)
+
+    def test_archivo_desalojado_durante_la_lectura(self):
+        cache = CachePDF(self.directorio.name, max_entradas_memoria=1)
+        cache.obtener("aa1", lambda: b"viejo")
+        cache.limpiar_memoria()
+        with mock.patch("api.pdf_cache.os.utime", side_effect=FileNotFoundError):
+            self.assertEqual(cache.obtener("aa1", lambda: b"nuevo"), b"nuevo")
+
+
+class AsistenciaIndividualTests(SimpleTestCase):
+    url = "/api/pdf/asistencia/?nc=22290697&nombre=Ana&fecha_inicio=2025-11-03&fecha_fin=2025-11-28&color=green"
+
+    def setUp(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        patcher = mock.patch("api.views.cache_asistencia", CachePDF(directorio.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_etag_y_304(self):
+        respuesta = self.client.get(self.url)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertTrue(respuesta["ETag"])
+
+        revalidacion = self.client.get(self.url, HTTP_IF_NONE_MATCH=respuesta["ETag"])
+        self.assertEqual(revalidacion.status_code, 304)
+
+        otro_color = self.client.get(self.url.replace("green", "blue"), HTTP_IF_NONE_MATCH=respuesta["ETag"])
+        self.assertEqual(otro_color.status_code, 200)
+        self.assertNotEqual(otro_color.content, respuesta.content)
+
+    def test_parametros_invalidos(self):
+        self.assertEqual(self.client.get("/api/pdf/asistencia/?nc=1&fecha_inicio=2025-13-01").status_code, 400)
+
+
+class ConsultasPorEndpointTests(TestCase):
+    """Número de consultas constante por request, sin importar cuántas filas trae la página."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(12):
+            estudiante = Estudiante.objects.create(
+                numero_control=f"2230{i:04d}", nombre=f"Alumno{i}", apellido="Prueba", email=f"c{i}@test.mx")
+            for _ in range(2):
+                beca = Beca.objects.create(numero_control=estudiante, tipo_beca="Alimenticia", estatus="aprobada")
+                AsistenciaBeca.objects.create(beca_id=beca, fecha_inicio=FECHA_INICIO, fecha_fin=FECHA_FIN)
+                AsistenciaBeca.objects.create(beca_id=beca, fecha_inicio=FECHA_INICIO, fecha_fin=FECHA_FIN)
+
+    def setUp(self):
+        # Sin totales en cache de otros tests: cada lista cuenta su COUNT
+        cache.clear()
+
+    def test_lista_estudiantes(self):
+        # COUNT + página + becas + asistencias
+        with self.assertNumQueries(4):
+            datos = self.client.get("/api/estudiantes/").json()
+        self.assertEqual(len(datos["results"]), 10)
+        self.assertEqual(len(datos["results"][0]["becas"][0]["asistencias"]), 2)
+        self.assertEqual(datos["results"][0]["becas"][0]["estudiante"]["nombre"], datos["results"][0]["nombre"])
+
+    def test_detalle_estudiante(self):
+        with self.assertNumQueries(3):
+            self.client.get("/api/estudiantes/22300001/")
+
+    def test_lista_becas(self):
+        # COUNT + página (con estudiante por JOIN) + asistencias
+        with self.assertNumQueries(3):
+            datos = self.client.get("/api/becas/").json()
+        self.assertEqual(len(datos["results"]), 10)
+        self.assertEqual(datos["results"][0]["estudiante"]["apellido"], "Prueba")
+
+    def test_detalle_beca(self):
+        beca = Beca.objects.first()
+        with self.assertNumQueries(2):
+            self.client.get(f"/api/becas/{beca.pk}/")
+
+    def test_fields_sin_relaciones(self):
+        # Sin expand no se prefetchean becas: COUNT + página
+        with self.assertNumQueries(2):
+            datos = self.client.get("/api/estudiantes/?fields=numero_control,nombre,email").json()
+        self.assertEqual(set(datos["results"][0]), {"numero_control", "nombre", "email"})
+
+    def test_expand_anidado(self):
+        with CaptureQueriesContext(connection) as consultas:
+            datos = self.client.get(
+                "/api/estudiantes/?fields=numero_control,becas.tipo_beca,becas.asistencias.fecha_inicio"
+                "&expand=becas.asistencias").json()
+        beca = datos["results"][0]["becas"][0]
+        self.assertEqual(set(beca), {"tipo_beca", "asistencias"})
+        self.assertEqual(set(beca["asistencias"][0]), {"fecha_inicio"})
+        # Las columnas no pedidas se difieren en SQL
+        self.assertEqual(len(consultas), 4)
+        self.assertNotIn("notas_internas", consultas[2]["sql"])
+        self.assertNotIn("email", consultas[1]["sql"])
+
+    def test_expand_en_becas(self):
+        with self.assertNumQueries(2):
+            datos = self.client.get("/api/becas/?fields=beca_id,estatus&expand=estudiante").json()
+        self.assertEqual(set(datos["results"][0]), {"beca_id", "estatus", "estudiante"})
+
+
+class KeysetPaginacionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Apellidos y nombres repetidos para probar el desempate por numero_control
+        for i in range(35):
+            estudiante = Estudiante.objects.create(
+                numero_control=f"2231{i:04d}", nombre=f"N{i % 3}", apellido=f"A{i % 4}", email=f"k{i}@test.mx")
+            Beca.objects.create(numero_control=estudiante, estatus="pendiente")
+
+    def _recorrer(self, url, campo):
+        vistos, paginas = [], 0
+        while url:
+            datos = self.client.get(url).json()
+            vistos += [fila[campo] for fila in datos["results"]]
+            url, paginas = datos["next"], paginas + 1
+        return vistos, paginas, datos
+
+    def test_mismo_orden_que_paginas(self):
+        por_pagina = []
+        for page in range(1, 5):
+            por_pagina += [e["numero_control"] for e in self.client.get(f"/api/estudiantes/?page={page}").json()["results"]]
+        keyset, paginas, _ = self._recorrer("/api/estudiantes/?cursor=", "numero_control")
+        self.assertEqual(keyset, por_pagina)
+        self.assertEqual(paginas, 4)
+
+    def test_previous_regresa_a_la_pagina_anterior(self):
+        primera = self.client.get("/api/estudiantes/?cursor=&fields=numero_control").json()
+        self.assertIsNone(primera["previous"])
+        segunda = self.client.get(primera["next"]).json()
+        regreso = self.client.get(segunda["previous"]).json()
+        self.assertEqual(regreso["results"], primera["results"])
+        self.assertIsNone(regreso["previous"])
+
+    def test_pagina_profunda_sin_count_ni_offset(self):
+        url = self.client.get("/api/becas/?cursor=&fields=beca_id").json()["next"]
+        for _ in range(2):
+            url = self.client.get(url).json()["next"]
+        with CaptureQueriesContext(connection) as consultas:
+            self.client.get(url)
+        self.assertEqual(len(consultas), 1)
+        self.assertNotIn("COUNT", consultas[0]["sql"].upper())
+        self.assertNotIn("OFFSET", consultas[0]["sql"].upper())
+
+    def test_cursor_invalido(self):
+        self.assertEqual(self.client.get("/api/becas/?cursor=no-es-un-cursor").status_code, 404)
+        for datos in ({"p": 5, "r": False}, {"p": [], "r": False}, {"p": [1, 2, 3], "r": False},
+                      {"p": ["abc"], "r": False}, {"p": [1], "r": "no"}, [1],
+                      {"p": [None], "r": False}, {"p": [True], "r": False}, {"p": [[1]], "r": False}):
+            cursor = base64.urlsafe_b64encode(json.dumps(datos).encode()).decode()
+            with self.subTest(datos=datos):
+                self.assertEqual(self.client.get("/api/becas/", {"cursor": cursor}).status_code, 404)
+        for posicion in ([None, "Ana", "22290001"], ["Pérez", {"a": 1}, "22290001"], ["Pérez", "Ana", None]):
+            cursor = base64.urlsafe_b64encode(json.dumps({"p": posicion, "r": False}).encode()).decode()
+            with self.subTest(posicion=posicion):
+                self.assertEqual(self.client.get("/api/estudiantes/", {"cursor": cursor}).status_code, 404)
+
+
+@override_settings(CONTEO_CACHE=True)
+class ConteoCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(12):
+            estudiante = Estudiante.objects.create(
+                numero_control=f"2240{i:04d}", nombre=f"Alumno{i}", apellido="Conteo", email=f"k{i}@test.mx")
+            Beca.objects.create(numero_control=estudiante, tipo_beca="Alimenticia", estatus="aprobada")
+
+    def setUp(self):
+        cache.clear()
+
+    def _counts(self, url):
+        with CaptureQueriesContext(connection) as consultas:
+            datos = self.client.get(url).json()
+        return datos, sum("COUNT" in c["sql"].upper() for c in consultas)
+
+    def test_segunda_pagina_usa_el_total_en_cache(self):
+        datos, counts = self._counts("/api/estudiantes/?fields=numero_control")
+        self.assertEqual((datos["count"], datos["count_exacto"], counts), (12, True, 1))
+        datos, counts = self._counts("/api/estudiantes/?fields=numero_control&page=2")
+        self.assertEqual((datos["count"], counts), (12, 0))
+
+    def test_filtros_distintos_no_comparten_total(self):
+        self._counts("/api/estudiantes/?fields=numero_control")
+        datos, counts = self._counts("/api/estudiantes/?fields=numero_control&search=Alumno1")
+        self.assertEqual((datos["count"], counts), (3, 1))
+
+    def test_guardar_invalida_el_total(self):
+        self._counts("/api/becas/?fields=beca_id")
+        with self.captureOnCommitCallbacks(execute=True):
+            Beca.objects.create(numero_control=Estudiante.objects.first(), tipo_beca="Transporte", estatus="pendiente")
+            # Hasta el commit la versión no cambia: una lectura no guarda filas sin confirmar con la nueva
+            self.assertEqual(self._counts("/api/becas/?fields=beca_id")[1], 0)
+        datos, counts = self._counts("/api/becas/?fields=beca_id")
+        self.assertEqual((datos["count"], counts), (13, 1))
+        # Un cambio en estudiantes también invalida las becas (la búsqueda cruza la relación)
+        with self.captureOnCommitCallbacks(execute=True):
+            Estudiante.objects.filter(pk=Estudiante.objects.first().pk).first().save()
+        self.assertEqual(self._counts("/api/becas/?fields=beca_id")[1], 1)
+
+    def test_estimacion_en_tablas_grandes(self):
+        with mock.patch("api.pagination.estimar_filas", return_value=250000), \
+                override_settings(CONTEO_ESTIMADO_MINIMO=100000):
+            datos, counts = self._counts("/api/estudiantes/?fields=numero_control")
+            self.assertEqual((datos["count"], datos["count_exacto"], counts), (250000, False, 0))
+            # Con filtros siempre se cuenta
+            datos, counts = self._counts("/api/estudiantes/?fields=numero_control&search=Alumno1")
+            self.assertEqual((datos["count_exacto"], counts), (True, 1))
+
+    @override_settings(CONTEO_CACHE=False)
+    def test_sin_cache_cuenta_en_cada_pagina(self):
+        self._counts("/api/estudiantes/?fields=numero_control")
+        datos, counts = self._counts("/api/estudiantes/?fields=numero_control&page=2")
+        self.assertEqual((datos["count"], counts), (12, 1))
+
+    def test_advertencia_con_cache_por_proceso(self):
+        from api.checks import cache_conteos_compartido
+        with override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}):
+            self.assertEqual([a.id for a in cache_conteos_compartido(None)], ["api.W002"])
+            with self.settings(CONTEO_CACHE=False):
+                self.assertEqual(cache_conteos_compartido(None), [])
+
+
+class BusquedaIndexadaTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        datos = [
+            ("22500001", "José", "Pérez", "jose.perez@test.mx"),
+            ("22500002", "Jose Luis", "Ramírez", "jl@test.mx"),
+            ("22500003", "María", "Josefina", "maria@test.mx"),
+            ("22500004", "Ana", "López", "ana@test.mx"),
+        ]
+        for nc, nombre, apellido, email in datos:
+            estudiante = Estudiante.objects.create(numero_control=nc, nombre=nombre, apellido=apellido, email=email)
+            Beca.objects.create(numero_control=estudiante, tipo_beca="Alimenticia", estatus="aprobada")
+        Beca.objects.create(numero_control_id="22500004", tipo_beca="Transporte", estatus="pendiente")
+
+    def setUp(self):
+        cache.clear()
+
+    def _estudiantes(self, parametros):
+        datos = self.client.get(f"/api/estudiantes/?fields=numero_control&{parametros}").json()
+        return [e["numero_control"] for e in datos["results"]]
+
+    def test_sin_acentos_ni_mayusculas(self):
+        self.assertEqual(self._estudiantes("search=PEREZ"), ["22500001"])
+        self.assertEqual(self._estudiantes("search=maria"), ["22500003"])
+
+    def test_cada_termino_debe_coincidir(self):
+        self.assertEqual(self._estudiantes("search=jose luis"), ["22500002"])
+        self.assertEqual(sorted(self._estudiantes("search=2250000")), ["22500001", "22500002", "22500003", "22500004"])
+
+    def test_ordenado_por_relevancia(self):
+        # "jose" es el nombre completo del primero; en el tercero solo prefijo del apellido
+        resultado = self._estudiantes("search=jose")
+        self.assertEqual(set(resultado), {"22500001", "22500002", "22500003"})
+        self.assertEqual(resultado[-1], "22500003")
+        # Con ?ordering= manda el orden pedido
+        self.assertEqual(self._estudiantes("search=jose&ordering=-numero_control"), ["22500003", "22500002", "22500001"])
+
+    def test_becas_por_estudiante_y_campos_propios(self):
+        becas = self.client.get("/api/becas/?fields=beca_id,tipo_beca&search=lopez transporte").json()["results"]
+        self.assertEqual([b["tipo_beca"] for b in becas], ["Transporte"])
+        becas = self.client.get("/api/becas/?fields=beca_id&search=ramirez").json()["results"]
+        self.assertEqual(len(becas), 1)
+
+    def test_indice_al_dia_con_cambios(self):
+        estudiante = Estudiante.objects.get(pk="22500004")
+        estudiante.apellido = "Núñez"
+        estudiante.save()
+        self.assertEqual(self._estudiantes("search=nunez"), ["22500004"])
+        self.assertEqual(self._estudiantes("search=lopez"), [])
+        Estudiante.objects.filter(pk="22500004").delete()
+        self.assertEqual(self._estudiantes("search=nunez"), [])
+
+    @override_settings(BUSQUEDA_INDEXADA=False)
+    def test_sin_indice_usa_icontains(self):
+        self.assertEqual(self._estudiantes("search=Ramírez"), ["22500002"])
+        self.assertEqual(self._estudiantes("search=ramirez"), [])
+
+
+class ImportacionTests(TestCase):
+    CSV_ESTUDIANTES = (
+        "numero_control,nombre,apellido,email,carrera,semestre\n"
+        "22600001,Ana,Ruiz,ana@test.mx,Sistemas,3\n"
+        "22600002,Luis,Soto,no-es-email,Sistemas,3\n"
+        "22600003,Eva,Mora,eva@test.mx,,\n"
+    )
+
+    def setUp(self):
+        cache.clear()
+
+    def _subir(self, tipo, contenido, nombre, **parametros):
+        archivo = io.BytesIO(contenido)
+        archivo.name = nombre
+        url = f"/api/importar/{tipo}/" + ("?" + "&".join(f"{k}={v}" for k, v in parametros.items()) if parametros else "")
+        return self.client.post(url, {"archivo": archivo})
+
+    def test_csv_con_errores_por_fila(self):
+        respuesta = self._subir("estudiantes", self.CSV_ESTUDIANTES.encode(), "alumnos.csv")
+        self.assertEqual(respuesta.status_code, 200)
+        reporte = respuesta.json()
+        self.assertEqual((reporte["creados"], reporte["actualizados"], reporte["con_errores"]), (2, 0, 1))
+        self.assertEqual(reporte["errores"][0]["fila"], 3)
+        self.assertIn("email", reporte["errores"][0]["errores"])
+        self.assertEqual(Estudiante.objects.get(pk="22600003").carrera, None)
+
+    def test_csv_latin1_de_excel(self):
+        contenido = "numero_control,nombre,apellido,email\n22600004,Begoña,Núñez,bego@test.mx\n".encode("cp1252")
+        respuesta = self._subir("estudiantes", contenido, "alumnos.csv")
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta.json()["creados"], 1)
+        estudiante = Estudiante.objects.get(pk="22600004")
+        self.assertEqual((estudiante.nombre, estudiante.apellido), ("Begoña", "Núñez"))
+
+    def test_csv_con_codificacion_ilegible(self):
+        # 0x81 no es UTF-8 válido aquí ni existe en cp1252
+        respuesta = self._subir("estudiantes", b"numero_control,nombre\n22600005,\x81\xff\x81\n", "alumnos.csv")
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertIn("UTF-8", respuesta.json()["error"])
+        self.assertFalse(Estudiante.objects.filter(pk="22600005").exists())
+
+    def test_upsert_conserva_columnas_ausentes(self):
+        self._subir("estudiantes", self.CSV_ESTUDIANTES.encode(), "alumnos.csv")
+        reporte = self._subir("estudiantes", b"numero_control,nombre,apellido,email\n22600001,Ana Maria,Ruiz,ana@test.mx\n",
+                              "alumnos.csv").json()
+        self.assertEqual((reporte["creados"], reporte["actualizados"]), (0, 1))
+        estudiante = Estudiante.objects.get(pk="22600001")
+        self.assertEqual((estudiante.nombre, estudiante.carrera), ("Ana Maria", "Sistemas"))
+
+        reporte = self._subir("estudiantes", b"numero_control,nombre,apellido,email\n22600001,X,Y,x@test.mx\n",
+                              "alumnos.csv", actualizar=0).json()
+        self.assertEqual((reporte["actualizados"], reporte["con_errores"]), (0, 1))
+
+    def test_celda_vacia_no_depende_de_las_otras_filas(self):
+        self._subir("estudiantes", self.CSV_ESTUDIANTES.encode(), "alumnos.csv")
+        reporte = self._subir("estudiantes", (
+            "numero_control,nombre,apellido,email,carrera\n"
+            "22600001,Ana,Ruiz,ana@test.mx,\n"
+            "22600003,Eva,Mora,eva@test.mx,Industrial\n"
+            "22600004,Leo,Gil,leo@test.mx,\n"
+        ).encode(), "alumnos.csv").json()
+        self.assertEqual((reporte["creados"], reporte["actualizados"]), (1, 2))
+        self.assertEqual(Estudiante.objects.get(pk="22600001").carrera, "Sistemas")
+        self.assertEqual(Estudiante.objects.get(pk="22600003").carrera, "Industrial")
+        self.assertEqual(Estudiante.objects.get(pk="22600004").carrera, None)
+
+    def test_xlsx_becas_por_lotes(self):
+        from openpyxl import Workbook
+        Estudiante.objects.create(numero_control="22600010", nombre="Sol", apellido="Paz", email="s@test.mx")
+        libro = Workbook()
+        hoja = libro.active
+        hoja.append(["numero_control", "tipo_beca", "estatus", "fecha_solicitud"])
+        for i in range(7):
+            hoja.append([22600010.0, "Alimenticia", "pendiente", datetime(2025, 8, i + 1)])
+        hoja.append([22699999, "Transporte", "pendiente", None])
+        salida = io.BytesIO()
+        libro.save(salida)
+
+        with CaptureQueriesContext(connection) as consultas:
+            reporte = self._subir("becas", salida.getvalue(), "becas.xlsx", tamano_lote=3).json()
+        self.assertEqual((reporte["creados"], reporte["con_errores"]), (7, 1))
+        self.assertEqual(reporte["errores"][0]["fila"], 9)
+        self.assertEqual(Beca.objects.filter(numero_control_id="22600010").count(), 7)
+        self.assertEqual(Beca.objects.order_by("beca_id").first().fecha_solicitud, date(2025, 8, 1))
+        # Por lote: estudiantes existentes + INSERT + conteos de becas + bitácora de cambios
+        # (más SAVEPOINT / RELEASE), no una consulta por fila
+        self.assertLessEqual(len(consultas), 3 * 6)
+
+    def test_formato_no_soportado(self):
+        self.assertEqual(self._subir("estudiantes", b"x", "alumnos.txt").status_code, 400)
+
+    def test_comando(self):
+        with tempfile.NamedTemporaryFile("wb", suffix=".csv", delete=False) as archivo:
+            archivo.write(self.CSV_ESTUDIANTES.encode())
+        salida = io.StringIO()
+        call_command("importar", "estudiantes", archivo.name, "--tamano-lote", "2", stdout=salida)
+        Path(archivo.name).unlink()
+        self.assertIn("Creados: 2", salida.getvalue())
+        self.assertIn("Fila 3", salida.getvalue())
+
+
+class ExportacionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(5):
+            estudiante = Estudiante.objects.create(
+                numero_control=f"2270{i:04d}", nombre=f"Alumno{i}", apellido="Núñez", email=f"x{i}@test.mx")
+            beca = Beca.objects.create(numero_control=estudiante, tipo_beca="Alimenticia", estatus="aprobada",
+                                       fecha_solicitud=FECHA_INICIO)
+            AsistenciaBeca.objects.create(beca_id=beca, fecha_inicio=FECHA_INICIO, fecha_fin=FECHA_FIN)
+
+    def _contenido(self, respuesta):
+        self.assertEqual(respuesta.status_code, 200)
+        return b"".join(respuesta.streaming_content)
+
+    def test_csv_en_streaming_con_orden(self):
+        respuesta = self.client.get("/api/estudiantes/exportar/?formato=csv&ordering=-numero_control")
+        self.assertTrue(respuesta.streaming)
+        lineas = self._contenido(respuesta).decode("utf-8-sig").splitlines()
+        self.assertEqual(lineas[0].split(",")[:3], ["numero_control", "nombre", "apellido"])
+        self.assertEqual(len(lineas), 6)
+        self.assertTrue(lineas[1].startswith("22700004,Alumno4,Núñez"))
+
+    def test_jsonl_respeta_busqueda(self):
+        contenido = self._contenido(self.client.get("/api/becas/exportar/?formato=jsonl&search=alumno3"))
+        filas = [json.loads(linea) for linea in contenido.decode().splitlines()]
+        self.assertEqual(len(filas), 1)
+        self.assertEqual((filas[0]["nombre"], filas[0]["fecha_solicitud"]), ("Alumno3", FECHA_INICIO.isoformat()))
+
+    def test_xlsx(self):
+        from openpyxl import load_workbook
+        contenido = self._contenido(self.client.get("/api/asistencias/exportar/?formato=xlsx"))
+        hoja = load_workbook(io.BytesIO(contenido), read_only=True).active
+        filas = list(hoja.iter_rows(values_only=True))
+        self.assertEqual(filas[0][:2], ("asistencia_id", "beca_id"))
+        self.assertEqual(len(filas), 6)
+
+    def test_sin_instancias_ni_prefetch(self):
+        with CaptureQueriesContext(connection) as consultas:
+            self._contenido(self.client.get("/api/estudiantes/exportar/?formato=csv"))
+        self.assertEqual(len(consultas), 1)
+
+    def test_formato_invalido(self):
+        self.assertEqual(self.client.get("/api/becas/exportar/?formato=pdf").status_code, 400)
+
+
+@override_settings(API_CACHE_RESPUESTAS=True)
+class CacheRespuestasTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        estudiante = Estudiante.objects.create(numero_control="22800001", nombre="Ana", apellido="Cache", email="a@test.mx")
+        Beca.objects.create(numero_control=estudiante, tipo_beca="Alimenticia", estatus="aprobada")
+
+    def setUp(self):
+        cache.clear()
+
+    def test_segunda_lectura_sin_consultas(self):
+        primera = self.client.get("/api/becas/")
+        with self.assertNumQueries(0):
+            segunda = self.client.get("/api/becas/")
+        self.assertEqual(segunda.content, primera.content)
+        self.assertEqual(segunda["ETag"], primera["ETag"])
+
+    def test_304_con_etag_y_last_modified(self):
+        primera = self.client.get("/api/estudiantes/22800001/")
+        with self.assertNumQueries(0):
+            respuesta = self.client.get("/api/estudiantes/22800001/", HTTP_IF_NONE_MATCH=primera["ETag"])
+        self.assertEqual(respuesta.status_code, 304)
+        respuesta = self.client.get("/api/estudiantes/22800001/", HTTP_IF_MODIFIED_SINCE=primera["Last-Modified"])
+        self.assertEqual(respuesta.status_code, 304)
+
+    def test_cambio_en_modelo_anidado_invalida(self):
+        primera = self.client.get("/api/estudiantes/")
+        beca = Beca.objects.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            AsistenciaBeca.objects.create(beca_id=beca, fecha_inicio=FECHA_INICIO, fecha_fin=FECHA_FIN)
+        segunda = self.client.get("/api/estudiantes/", HTTP_IF_NONE_MATCH=primera["ETag"])
+        self.assertEqual(segunda.status_code, 200)
+        self.assertNotEqual(segunda["ETag"], primera["ETag"])
+        self.assertEqual(len(segunda.json()["results"][0]["becas"][0]["asistencias"]), 1)
+
+    def test_query_params_distintos_no_comparten_entrada(self):
+        completa = self.client.get("/api/becas/").json()
+        parcial = self.client.get("/api/becas/?fields=beca_id").json()
+        self.assertNotEqual(completa["results"][0].keys(), parcial["results"][0].keys())
+
+    def test_advertencia_con_cache_por_proceso(self):
+        from api.checks import cache_respuestas_compartido
+        with override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}):
+            self.assertEqual([a.id for a in cache_respuestas_compartido(None)], ["api.W001"])
+        with override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.db.DatabaseCache",
+                                                   "LOCATION": "django_cache"}}):
+            self.assertEqual(cache_respuestas_compartido(None), [])
+
+    @override_settings(API_CACHE_RESPUESTAS=False)
+    def test_desactivado(self):
+        self.client.get("/api/becas/")
+        respuesta = self.client.get("/api/becas/")
+        self.assertNotIn("ETag", respuesta)
+
+
+@override_settings(API_CACHE_RESPUESTAS=False)
+class LecturaRapidaTests(TestCase):
+    URLS = [
+        "/api/estudiantes/",
+        "/api/estudiantes/?page=2",
+        "/api/estudiantes/?cursor=",
+        "/api/estudiantes/?fields=numero_control,becas&expand=becas",
+        "/api/estudiantes/?fields=nombre&expand=becas.asistencias",
+        "/api/estudiantes/?search=pérez&ordering=-fecha_registro",
+        "/api/estudiantes/22900003/",
+        "/api/becas/",
+        "/api/becas/?fields=beca_id,estudiante&expand=estudiante",
+        "/api/becas/?search=perez",
+        "/api/asistencias/",
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        from django.utils import timezone
+        for i in range(12):
+            estudiante = Estudiante.objects.create(
+                numero_control=f"2290{i:04d}", nombre=f"José{i}", apellido="Pérez" if i % 2 else "Ruiz",
+                email=f"r{i}@test.mx", semestre=i % 9 or None,
+                fecha_registro=timezone.now() if i % 3 else None)
+            for j in range(i % 3):
+                beca = Beca.objects.create(numero_control=estudiante, tipo_beca="Alimenticia", estatus="aprobada",
+                                           fecha_solicitud=FECHA_INICIO, observaciones="línea\u2028separada")
+                AsistenciaBeca.objects.create(beca_id=beca, fecha_inicio=FECHA_INICIO, fecha_fin=None)
+        Beca.objects.create(numero_control=None, tipo_beca="Transporte", estatus="pendiente", fecha_fin=None)
+
+    def test_mismo_json_que_los_serializers(self):
+        from api.lectura import Plan
+        for serializer in (EstudianteSerializer, BecaSerializer, AsistenciaBecaSerializer):
+            Plan(serializer())  # no cae al camino de DRF
+        for url in self.URLS:
+            with self.subTest(url=url), override_settings(API_LECTURA_RAPIDA=False):
+                esperado = self.client.get(url, HTTP_ACCEPT="application/json").content
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url, HTTP_ACCEPT="application/json").content, esperado)
+
+    def test_renderer_igual_a_json_renderer(self):
+        from rest_framework.renderers import JSONRenderer
+        from api.renderers import ORJSONRenderer
+        datos = {"a": "línea\u2028x\u2029", "b": [1, None, True], "c": FECHA_INICIO,
+                 "d": datetime(2025, 1, 2, 3, 4, 5, 678901)}
+        self.assertEqual(ORJSONRenderer().render(datos), JSONRenderer().render(datos))
+        self.assertEqual(ORJSONRenderer().render(datos, "application/json; indent=2"),
+                         JSONRenderer().render(datos, "application/json; indent=2"))
+
+    def test_detalle_inexistente(self):
+        self.assertEqual(self.client.get("/api/estudiantes/99999999/").status_code, 404)
+
+    def test_detalle_con_llave_no_numerica(self):
+        for url in ("/api/becas/abc/", "/api/asistencias/abc/"):
+            for rapida in (True, False):
+                with self.subTest(url=url, rapida=rapida), override_settings(API_LECTURA_RAPIDA=rapida):
+                    self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class EstadisticasBecasTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(6):
+            estudiante = Estudiante.objects.create(
+                numero_control=f"2300{i:04d}", nombre=f"E{i}", apellido="Stats", email=f"st{i}@test.mx")
+            beca = Beca.objects.create(
+                numero_control=estudiante, tipo_beca="Alimenticia" if i % 2 else "Transporte",
+                estatus="aprobada" if i < 4 else "pendiente",
+                fecha_aprobacion=date(2025, 8 + i % 2, 10) if i < 4 else None)
+            if i < 3:
+                AsistenciaBeca.objects.create(beca_id=beca, fecha_inicio=date(2025, 1, 1),
+                                              fecha_fin=None if i == 0 else date(2025, 1, 31))
+
+    def setUp(self):
+        cache.clear()
+
+    def _stats(self):
+        return self.client.get("/api/becas/stats/").json()
+
+    def test_conteos_y_recalculo_inicial(self):
+        datos = self._stats()
+        self.assertEqual(datos["total"], 6)
+        self.assertEqual(datos["por_estatus"], {"aprobada": 4, "pendiente": 2})
+        self.assertEqual(datos["por_tipo_beca"], {"Alimenticia": 3, "Transporte": 3})
+        self.assertEqual(datos["aprobaciones_por_mes"], [{"mes": "2025-08", "total": 2}, {"mes": "2025-09", "total": 2}])
+
+    def test_asistencia_activa_por_dia(self):
+        from api.estadisticas import estudiantes_con_asistencia_activa
+        self.assertEqual(estudiantes_con_asistencia_activa(date(2025, 1, 15)), 3)
+        self.assertEqual(estudiantes_con_asistencia_activa(date(2025, 3, 1)), 1)
+
+    def test_incremental_en_alta_cambio_y_baja(self):
+        self._stats()
+        beca = Beca.objects.filter(estatus="pendiente").first()
+        beca.estatus = "aprobada"
+        beca.fecha_aprobacion = date(2025, 10, 1)
+        beca.save()
+        Beca.objects.create(numero_control_id="23000000", tipo_beca="Deportiva", estatus="pendiente")
+        Beca.objects.filter(tipo_beca="Transporte").first().delete()
+
+        datos = self._stats()
+        from api.estadisticas import recalcular
+        recalcular()
+        self.assertEqual(self._stats(), datos)
+        self.assertEqual(datos["total"], 6)
+        self.assertEqual(datos["por_estatus"], {"aprobada": 4, "pendiente": 2})
+        self.assertEqual(datos["por_tipo_beca"]["Deportiva"], 1)
+        self.assertEqual(datos["aprobaciones_por_mes"][-1], {"mes": "2025-10", "total": 1})
+
+    def test_lectura_constante(self):
+        self._stats()
+        # Tabla de conteos + versiones en cache; sin agregaciones sobre las becas
+        with CaptureQueriesContext(connection) as consultas:
+            self._stats()
+        self.assertEqual(len(consultas), 1)
+        self.assertIn("api_estadistica_beca", consultas[0]["sql"])
+
+
+class PeriodosAsistenciaTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        periodos = [
+            (date(2025, 1, 1), date(2025, 1, 31)),
+            (date(2025, 2, 1), date(2025, 2, 28)),
+            (date(2025, 3, 1), None),  # abierto
+            (None, date(2025, 1, 15)),  # sin inicio: no cuenta
+        ]
+        cls.becas = []
+        for i, (inicio, fin) in enumerate(periodos):
+            estudiante = Estudiante.objects.create(
+                numero_control=f"2400{i:04d}", nombre=f"P{i}", apellido="Periodo", email=f"p{i}@test.mx")
+            beca = Beca.objects.create(numero_control=estudiante, tipo_beca="Alimenticia", estatus="aprobada")
+            AsistenciaBeca.objects.create(beca_id=beca, fecha_inicio=inicio, fecha_fin=fin)
+            cls.becas.append(beca)
+
+    def setUp(self):
+        cache.clear()
+
+    def _asistencias(self, **params):
+        return sorted(a["beca_id"] for a in self.client.get("/api/asistencias/", params).json())
+
+    def _becas(self, **params):
+        return sorted(b["beca_id"] for b in self.client.get("/api/becas/", params).json()["results"])
+
+    def test_activa_en_fecha(self):
+        ids = [b.beca_id for b in self.becas]
+        self.assertEqual(self._asistencias(activa_en="2025-01-31"), [ids[0]])
+        self.assertEqual(self._asistencias(activa_en="2026-06-01"), [ids[2]])
+        self.assertEqual(self._becas(activa_en="2025-02-10"), [ids[1]])
+
+    def test_traslape_de_rangos(self):
+        ids = [b.beca_id for b in self.becas]
+        self.assertEqual(self._asistencias(periodo_desde="2025-01-20", periodo_hasta="2025-02-05"), ids[:2])
+        self.assertEqual(self._becas(periodo_desde="2025-02-15"), ids[1:3])
+        self.assertEqual(self._becas(periodo_hasta="2025-01-01"), [ids[0]])
+        self.assertEqual(self.client.get("/api/becas/", {"periodo_desde": "2025-02-01",
+                                                         "periodo_hasta": "2025-01-01"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/asistencias/", {"activa_en": "ayer"}).status_code, 400)
+
+    def test_fecha_bien_formada_pero_inexistente(self):
+        for parametro in ("activa_en", "periodo_desde", "periodo_hasta"):
+            with self.subTest(parametro=parametro):
+                respuesta = self.client.get("/api/becas/", {parametro: "2025-13-01"})
+                self.assertEqual(respuesta.status_code, 400)
+                self.assertIn(parametro, respuesta.json())
+
+    @mock.patch("api.views.render_pdf_alumno", return_value=b"%PDF")
+    def test_pdf_usa_el_periodo_del_alumno(self, render):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        with mock.patch("api.views.cache_asistencia", CachePDF(directorio.name)), \
+                mock.patch("api.intervalos.date") as fecha:
+            fecha.today.return_value = date(2025, 2, 10)
+            self.client.get("/api/pdf/asistencia/", {"nc": "24000001", "nombre": "P1"})
+        self.assertEqual(render.call_args.args[2:4], (date(2025, 2, 1), date(2025, 2, 28)))
+
+        self.assertEqual(self.client.get("/api/pdf/asistencia/", {"nc": "99999999"}).status_code, 400)
+
+
+class LoteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.becas = []
+        for i in range(3):
+            estudiante = Estudiante.objects.create(
+                numero_control=f"2500{i:04d}", nombre=f"L{i}", apellido="Lote", email=f"l{i}@test.mx")
+            beca = Beca.objects.create(numero_control=estudiante, tipo_beca="Alimenticia", estatus="aprobada")
+            AsistenciaBeca.objects.create(beca_id=beca, fecha_inicio=FECHA_INICIO, fecha_fin=FECHA_FIN)
+            cls.becas.append(beca)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_orden_pedido_y_faltantes(self):
+        with CaptureQueriesContext(connection) as consultas:
+            datos = self.client.get("/api/estudiantes/batch/", {"ids": "25000002,99999999,25000000,25000002"}).json()
+        self.assertEqual([e["numero_control"] for e in datos["results"]], ["25000002", "25000000"])
+        self.assertEqual(datos["missing"], ["99999999"])
+        self.assertEqual(len(datos["results"][0]["becas"][0]["asistencias"]), 1)
+        # Estudiantes + becas + asistencias, sin importar cuántos ids
+        self.assertEqual(len(consultas), 3)
+
+    @override_settings(API_LECTURA_RAPIDA=False)
+    def test_post_con_serializer_y_ids_invalidos(self):
+        ids = [self.becas[1].beca_id, "abc", self.becas[0].beca_id]
+        datos = self.client.post("/api/becas/batch/?fields=beca_id,estatus", {"ids": ids},
+                                 content_type="application/json").json()
+        self.assertEqual(datos["results"], [{"beca_id": self.becas[1].beca_id, "estatus": "aprobada"},
+                                            {"beca_id": self.becas[0].beca_id, "estatus": "aprobada"}])
+        self.assertEqual(datos["missing"], ["abc"])
+
+    @override_settings(API_LOTE_MAXIMO=2)
+    def test_limite_de_ids(self):
+        self.assertEqual(self.client.get("/api/becas/batch/", {"ids": "1,2,3"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/becas/batch/").status_code, 400)
+
+
+class CambiosTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _cambios(self, since, **params):
+        return self.client.get("/api/changes/", {"since": since, **params}).json()
+
+    def test_upserts_y_deletes_desde_cursor(self):
+        cursor = self.client.get("/api/changes/").json()["cursor"]
+        with self.captureOnCommitCallbacks(execute=True):
+            estudiante = Estudiante.objects.create(
+                numero_control="26000001", nombre="C", apellido="Feed", email="c@test.mx")
+        with self.captureOnCommitCallbacks(execute=True):
+            beca = Beca.objects.create(numero_control=estudiante, tipo_beca="Alimenticia", estatus="pendiente")
+            beca.estatus = "aprobada"
+            beca.save()
+            AsistenciaBeca.objects.create(beca_id=beca, fecha_inicio=FECHA_INICIO, fecha_fin=FECHA_FIN)
+
+        datos = self._cambios(cursor)
+        self.assertFalse(datos["has_more"])
+        self.assertEqual([e["numero_control"] for e in datos["upserts"]["estudiantes"]], [26000001])
+        self.assertEqual([(b["beca_id"], b["estatus"], b["numero_control"]) for b in datos["upserts"]["becas"]],
+                         [(beca.beca_id, "aprobada", 26000001)])
+        self.assertEqual(len(datos["upserts"]["asistencias"]), 1)
+
+        # La beca se borra (y su asistencia en cascada): solo deletes desde el cursor nuevo
+        beca_id = beca.beca_id
+        with self.captureOnCommitCallbacks(execute=True):
+            beca.delete()
+        datos = self._cambios(datos["cursor"])
+        self.assertEqual(datos["deletes"]["becas"], [str(beca_id)])
+        self.assertEqual(len(datos["deletes"]["asistencias"]), 1)
+        self.assertEqual(datos["upserts"]["becas"], [])
+        # Lo reciente bajo el cursor se vuelve a entregar (ventana de confirmaciones tardías), sin avanzar
+        repetido = self._cambios(datos["cursor"])
+        self.assertEqual((repetido["cursor"], repetido["deletes"]["becas"]), (datos["cursor"], [str(beca_id)]))
+        with override_settings(CAMBIOS_VENTANA_SEGUNDOS=-1):
+            self.assertEqual(self._cambios(datos["cursor"])["deletes"]["becas"], [])
+
+    def test_en_la_misma_transaccion_y_rollback(self):
+        from django.db import transaction
+        from api.models import Cambio
+
+        with transaction.atomic():
+            for i in range(3):
+                Estudiante.objects.create(numero_control=f"2600010{i}", nombre="L", apellido="Lote", email="l@t.mx")
+            # Se escribe junto con el cambio, sin esperar al commit
+            self.assertEqual(Cambio.objects.count(), 3)
+        self.assertEqual(Cambio.objects.count(), 3)
+
+        try:
+            with transaction.atomic():
+                Estudiante.objects.create(numero_control="26000200", nombre="R", apellido="Rollback", email="r@t.mx")
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertEqual(Cambio.objects.count(), 3)
+
+    def test_confirmacion_tardia_con_id_menor(self):
+        from api.models import Cambio
+
+        Estudiante.objects.create(numero_control="26000400", nombre="T", apellido="Tarde", email="t@t.mx")
+        Cambio.objects.all().delete()
+        Cambio.objects.create(id=1000, modelo="estudiantes", llave="26000499", operacion=Cambio.DELETE)
+        cursor = self.client.get("/api/changes/").json()["cursor"]
+        self.assertEqual(cursor, 1000)
+        # Otra transacción tomó el id 900 antes pero confirmó después de entregar el cursor 1000
+        Cambio.objects.create(id=900, modelo="estudiantes", llave="26000400", operacion=Cambio.UPSERT)
+        datos = self._cambios(cursor)
+        self.assertEqual(datos["cursor"], 1000)
+        self.assertEqual([e["numero_control"] for e in datos["upserts"]["estudiantes"]], [26000400])
+
+    def test_paginado_y_compactacion(self):
+        from api.cambios import compactar
+        from api.models import Cambio
+
+        cursor = self.client.get("/api/changes/").json()["cursor"]
+        with self.captureOnCommitCallbacks(execute=True):
+            estudiante = Estudiante.objects.create(
+                numero_control="26000300", nombre="P", apellido="Pag", email="p@t.mx")
+        for i in range(3):
+            with self.captureOnCommitCallbacks(execute=True):
+                estudiante.semestre = i + 1
+                estudiante.save()
+
+        primera = self._cambios(cursor, limit=2)
+        self.assertTrue(primera["has_more"])
+        segunda = self._cambios(primera["cursor"], limit=2)
+        self.assertFalse(segunda["has_more"])
+        self.assertEqual(segunda["upserts"]["estudiantes"][0]["semestre"], 3)
+
+        self.assertEqual(compactar(dias=0), 3)
+        self.assertEqual(Cambio.objects.count(), 1)
+        self.assertEqual(self._cambios(cursor)["upserts"]["estudiantes"][0]["semestre"], 3)
+        self.assertEqual(self.client.get("/api/changes/", {"since": "x"}).status_code, 400)
+
+    def test_limit_menor_a_uno(self):
+        for limite in ("-5", "-1", "0"):
+            respuesta = self.client.get("/api/changes/", {"since": 0, "limit": limite})
+            self.assertEqual(respuesta.status_code, 400, limite)
+
+
+class TransicionesBecasTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        estudiante = Estudiante.objects.create(numero_control="27000001", nombre="T", apellido="Vence", email="t@t.mx")
+        casos = [("aprobada", date(2025, 1, 31))] * 4 + [
+            ("entregada", date(2025, 2, 1)),
+            ("aprobada", date(2025, 12, 31)),   # todavía vigente
+            ("pendiente", date(2025, 1, 1)),    # no aplica
+        ]
+        for estatus, fin in casos:
+            Beca.objects.create(numero_control=estudiante, tipo_beca="Alimenticia", estatus=estatus, fecha_fin=fin)
+
+    def setUp(self):
+        cache.clear()
+
+    def _llamar(self, *args):
+        salida = io.StringIO()
+        call_command("actualizar_estatus_becas", "--fecha", "2025-06-01", *args, stdout=salida)
+        return salida.getvalue()
+
+    def test_dry_run_no_modifica(self):
+        salida = self._llamar("--dry-run")
+        self.assertIn("5 becas", salida)
+        self.assertEqual(Beca.objects.filter(estatus="finalizada").count(), 0)
+
+    def test_update_por_lotes_con_estadisticas_y_cache(self):
+        from api.versiones import version
+        self.client.get("/api/becas/stats/")
+        version_antes = version(Beca)
+        cursor = self.client.get("/api/changes/").json()["cursor"]
+
+        with self.captureOnCommitCallbacks(execute=True), CaptureQueriesContext(connection) as consultas:
+            salida = self._llamar("--tamano-lote", "2")
+        updates = [q for q in consultas if q["sql"].startswith('UPDATE "beca"')]
+        self.assertEqual(len(updates), 3)  # 5 becas en lotes de 2
+        self.assertEqual(salida.count("lote:"), 3)
+        self.assertEqual(version(Beca), version_antes + 3)
+
+        self.assertEqual(Beca.objects.filter(estatus="finalizada").count(), 5)
+        self.assertEqual(set(Beca.objects.exclude(estatus="finalizada").values_list("estatus", flat=True)),
+                         {"aprobada", "pendiente"})
+        stats = self.client.get("/api/becas/stats/").json()
+        self.assertEqual(stats["por_estatus"], {"aprobada": 1, "finalizada": 5, "pendiente": 1})
+        with override_settings(CAMBIOS_VENTANA_SEGUNDOS=-1):
+            self.assertEqual(len(self.client.get("/api/changes/", {"since": cursor}).json()["upserts"]["becas"]), 5)
+
+        # Idempotente
+        self.assertIn("0 becas", self._llamar())
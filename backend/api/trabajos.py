@@ -0,0 +1,29 @@
+import tempfile
+from datetime import date
+
+from django.core.files import File
+
+from api.reportes import alumnos_de_becas, becas_aprobadas, pdf_asistencia_general
+from trabajos.registro import registrar, reportar_progreso
+
+
+@registrar("asistencia_general")
+def asistencia_general(trabajo):
+    """PDF de asistencia general como trabajo en segundo plano; avance = alumnos renderizados."""
+    fecha_inicio = date.fromisoformat(trabajo.parametros["fecha_inicio"])
+    fecha_fin = date.fromisoformat(trabajo.parametros["fecha_fin"])
+
+    becas = becas_aprobadas()
+    total = becas.count()
+    if not total:
+        raise ValueError("No hay becas aprobadas en este momento")
+    reportar_progreso(trabajo, 0, total)
+
+    def al_terminar_lote(renderizados):
+        reportar_progreso(trabajo, min(renderizados, total))
+
+    with tempfile.TemporaryFile() as archivo:
+        for bloque in pdf_asistencia_general(alumnos_de_becas(becas), fecha_inicio, fecha_fin, al_terminar_lote):
+            archivo.write(bloque)
+        archivo.seek(0)
+        trabajo.archivo.save(f"asistencia_general_{trabajo.pk}.pdf", File(archivo), save=False)
@@ -0,0 +1,81 @@
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+
+from api import cambios, estadisticas
+from api.models import Beca, Cambio, EstadisticaBeca
+from api.versiones import incrementar_version
+
+
+@dataclass(frozen=True)
+class Transicion:
+    """Becas con estatus en `desde` que cumplen `condicion(hoy)` pasan a `hacia`."""
+    nombre: str
+    desde: tuple
+    hacia: str
+    condicion: object  # hoy -> Q
+
+
+TRANSICIONES = {
+    t.nombre: t for t in [
+        Transicion(
+            'vencer', desde=('aprobada', 'entregada'), hacia='finalizada',
+            condicion=lambda hoy: Q(fecha_fin__lt=hoy),
+        ),
+    ]
+}
+
+
+def candidatas(transicion, hoy=None):
+    hoy = hoy or date.today()
+    return Beca.objects.filter(estatus__in=transicion.desde).filter(transicion.condicion(hoy))
+
+
+def simular(transicion, hoy=None):
+    """Cuántas becas cambiarían, por estatus actual, sin modificar nada."""
+    filas = candidatas(transicion, hoy).values('estatus').annotate(n=Count('beca_id')).order_by('estatus')
+    return {fila['estatus']: fila['n'] for fila in filas}
+
+
+def aplicar(transicion, hoy=None, tamano_lote=None, al_terminar_lote=None):
+    """
+    Aplica la transición por lotes de llaves consecutivas: un UPDATE por lote
+    (re-verificando estatus y condición, por si otra petición la cambió), los
+    deltas de EstadisticaBeca, la bitácora de /api/changes/ y una sola
+    invalidación de versión por lote (UPDATE no dispara señales). Devuelve
+    {estatus anterior: becas actualizadas}.
+    """
+    hoy = hoy or date.today()
+    tamano_lote = tamano_lote or settings.TRANSICIONES_TAMANO_LOTE
+    total = Counter()
+    ultima = None
+    while True:
+        pendientes = candidatas(transicion, hoy).order_by('beca_id')
+        if ultima is not None:
+            pendientes = pendientes.filter(beca_id__gt=ultima)
+        llaves = list(pendientes.values_list('beca_id', flat=True)[:tamano_lote])
+        if not llaves:
+            break
+        ultima = llaves[-1]
+
+        with transaction.atomic():
+            filas = list(candidatas(transicion, hoy).filter(beca_id__in=llaves)
+                         .select_for_update().values_list('beca_id', 'estatus'))
+            actualizadas = [beca_id for beca_id, _ in filas]
+            por_estatus = Counter(estatus for _, estatus in filas)
+            if actualizadas:
+                Beca.objects.filter(beca_id__in=actualizadas).update(estatus=transicion.hacia)
+                deltas = Counter({(EstadisticaBeca.ESTATUS, transicion.hacia): len(actualizadas)})
+                deltas.subtract({(EstadisticaBeca.ESTATUS, estatus): n for estatus, n in por_estatus.items()})
+                estadisticas.aplicar(deltas)
+                cambios.registrar(Beca, actualizadas, Cambio.UPSERT)
+        if actualizadas:
+            incrementar_version(Beca)
+        total.update(por_estatus)
+        if al_terminar_lote:
+            al_terminar_lote(len(actualizadas))
+    return dict(total)
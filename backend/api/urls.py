@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework import routers
-from api.views import EstudianteViewSet, BecaViewSet, AsistenciaBecaViewSet, generar_pdf_asistencia, generar_pdf_asistencia_general
+from api.views import EstudianteViewSet, BecaViewSet, AsistenciaBecaViewSet, generar_pdf_asistencia, generar_pdf_asistencia_general, generar_zip_asistencias, AsistenciaGeneralTrabajoAPIView, ImportacionAPIView, CambiosAPIView
 
 router = routers.DefaultRouter()
 
@@ -11,5 +11,9 @@ router.register(r'asistencias', AsistenciaBecaViewSet, basename='asistencia')
 urlpatterns = [
     path('api/', include(router.urls)),
     path('api/pdf/asistencia/', generar_pdf_asistencia, name="generar_pdf_asistencia"),
-    path('api/pdf/asistencia_general/', generar_pdf_asistencia_general, name="generar_pdf_asistencia_general")
-]
\ No newline at end of file
+    path('api/pdf/asistencia_general/', generar_pdf_asistencia_general, name="generar_pdf_asistencia_general"),
+    path('api/pdf/asistencia_zip/', generar_zip_asistencias, name="generar_zip_asistencias"),
+    path('api/pdf/asistencia_general/trabajos/', AsistenciaGeneralTrabajoAPIView.as_view(), name="asistencia_general_trabajo"),
+    path('api/importar/<str:tipo>/', ImportacionAPIView.as_view(), name="importar"),
+    path('api/changes/', CambiosAPIView.as_view(), name="cambios"),
+]
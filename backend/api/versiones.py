@@ -0,0 +1,54 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+# Versión por modelo en el cache compartido. Cada post_save / post_delete la
+# incrementa (api.signals), así que cualquier clave que incluya las versiones
+# queda invalidada sin tener que buscar y borrar entradas.
+
+
+def _clave(modelo):
+    return f"api:version:{modelo._meta.label_lower}"
+
+
+def _clave_modificado(modelo):
+    return f"api:modificado:{modelo._meta.label_lower}"
+
+
+def _inicial():
+    # Si la clave se expulsa del cache, la versión nueva no debe repetir una
+    # anterior (habría entradas viejas con esa clave): se parte del reloj.
+    return time.time_ns() // 1000
+
+
+def version(modelo):
+    return cache.get_or_set(_clave(modelo), _inicial, timeout=None)
+
+
+def versiones(*modelos):
+    """Tupla de versiones, para usar dentro de una clave de cache."""
+    return tuple(version(modelo) for modelo in modelos)
+
+
+def modificado(*modelos):
+    """Último cambio (timestamp) entre `modelos`; sin registro se toma el momento actual."""
+    return max(cache.get_or_set(_clave_modificado(modelo), time.time, timeout=None) for modelo in modelos)
+
+
+def incrementar_version(modelo, using='default'):
+    """
+    Invalida las entradas de `modelo` al confirmarse la transacción en curso
+    (o al momento, fuera de una). Si se incrementara antes del commit, una
+    lectura simultánea podría guardar las filas anteriores con la versión nueva.
+    """
+    transaction.on_commit(lambda: _incrementar(modelo), using=using)
+
+
+def _incrementar(modelo):
+    try:
+        cache.incr(_clave(modelo))
+    except ValueError:
+        # La clave no existía (cache vacío o expulsada)
+        cache.set(_clave(modelo), _inicial(), timeout=None)
+    cache.set(_clave_modificado(modelo), time.time(), timeout=None)
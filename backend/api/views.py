@@ -1,188 +1,96 @@
 from rest_framework import viewsets
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
 from api.models import Estudiante, Beca, AsistenciaBeca
+from django.db.models import Prefetch
+from api.busqueda import BusquedaFilter
+from api.intervalos import TraslapeFechasFilter, periodo_vigente
+from api.campos import columnas, incluye, parametros_campos, sub_seleccion
 from api.serializers import EstudianteSerializer, BecaSerializer, AsistenciaBecaSerializer
 from rest_framework.filters import SearchFilter, OrderingFilter
-from django.http import HttpResponse, HttpResponseBadRequest
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.pdfgen import canvas
-from reportlab.platypus import Table, TableStyle
-from reportlab.lib.units import mm
-from datetime import datetime, timedelta
-
-WEEKDAY_NAMES = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes"]
-
-def generar_pdf_asistencia(request):
+from django.http import HttpResponse, HttpResponseBadRequest, StreamingHttpResponse
+from django.views.decorators.http import condition
+from datetime import datetime
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from api.pdf_utils import COLOR_MAP, COLOR_DEFAULT, VERSION_PLANTILLA, render_pdf_alumno
+from api.pdf_cache import cache_asistencia, clave_cache
+from api.reportes import alumnos_o_none, becas_aprobadas, fechas_reporte, pdf_asistencia_general, zip_asistencias
+from api.respuestas import CacheRespuestaMixin
+from api.lectura import LecturaRapidaMixin
+from api.estadisticas import resumen as resumen_becas
+from api.exportacion import FORMATOS, respuesta_exportacion
+from rest_framework.decorators import action
+from api.importacion import IMPORTACIONES, ArchivoInvalido, importar
+from api.cambios import cambios_desde, cursor_actual
+from rest_framework.parsers import MultiPartParser
+from trabajos.registro import encolar
+from trabajos.serializers import TrabajoSerializer
+
+def _parametros_asistencia(request):
     """
-    GET /api/pdf/asistencia/?nc=22290697&nombre=Alan%20Emiliano&fecha_inicio=2025-11-01&fecha_fin=2025-11-30&color=green
+    Valida los parámetros de generar_pdf_asistencia. Lanza ValueError con el mensaje para el cliente.
+    Sin fecha_inicio / fecha_fin se usa el período de asistencia vigente del alumno.
     """
     nc = request.GET.get("nc")
     nombre = request.GET.get("nombre", "")
-    start = request.GET.get("fecha_inicio", datetime.today())
-    end = request.GET.get("fecha_fin", "2025-11-30")
+    start = request.GET.get("fecha_inicio")
+    end = request.GET.get("fecha_fin")
     color_param = request.GET.get("color", "red")
 
-    if not (nc and start and end):
-        return HttpResponseBadRequest("Faltan parámetros: nc, start, end")
+    if not nc:
+        raise ValueError("Faltan parámetros: nc")
 
     try:
-        fecha_inicio = datetime.strptime(start, "%Y-%m-%d").date()
-        fecha_fin = datetime.strptime(end, "%Y-%m-%d").date()
+        fecha_inicio = datetime.strptime(start, "%Y-%m-%d").date() if start else None
+        fecha_fin = datetime.strptime(end, "%Y-%m-%d").date() if end else None
     except ValueError:
-        return HttpResponseBadRequest("Fechas deben tener formato YYYY-MM-DD")
+        raise ValueError("Fechas deben tener formato YYYY-MM-DD")
+
+    if fecha_inicio is None or fecha_fin is None:
+        periodo = periodo_vigente(nc)
+        if periodo is None:
+            raise ValueError("Faltan fecha_inicio / fecha_fin y el alumno no tiene períodos de asistencia")
+        fecha_inicio = fecha_inicio or periodo[0]
+        fecha_fin = fecha_fin or periodo[1]
 
     if fecha_fin < fecha_inicio:
-        return HttpResponseBadRequest("La fecha fin debe ser posterior o igual a la fecha inicio")
-
-# --- Colores predefinidos ---
-    COLOR_MAP = {
-        "red": (0.75, 0.12, 0.15),
-        "green": (0.0, 0.6, 0.3),
-        "blue": (0.0, 0.3, 0.7),
-        "orange": (1.0, 0.5, 0.0),
-        "purple": (0.5, 0.0, 0.5),
-        "teal": (0.0, 0.5, 0.5),
-        "yellow": (1.0, 0.9, 0.0),
-        "pink": (1.0, 0.4, 0.6),
-        "gray": (0.5, 0.5, 0.5),
-        "brown": (0.6, 0.4, 0.2),
-    }
-
-    header_color = COLOR_MAP.get(color_param.lower(), (0.75, 0.12, 0.15))
-
-    # --- Calcular primer lunes ---
-    # Si fecha_inicio cae en sabado (5), no retrocedemos
-    if fecha_inicio.weekday() == 5:  # sabado
-        primer_lunes = fecha_inicio + timedelta(days=2)
-    elif fecha_inicio.weekday() == 6:
-        primer_lunes = fecha_inicio + timedelta(days=1)
-    else:
-        primer_lunes = fecha_inicio - timedelta(days=fecha_inicio.weekday())
-
-    semanas = []
-    cursor = primer_lunes
-    while cursor <= fecha_fin:
-        semana = []
-        for d in range(5):
-            dia_fecha = cursor + timedelta(days=d)
-            if fecha_inicio <= dia_fecha <= fecha_fin:
-                fecha_str = dia_fecha.strftime("%d/%m/%Y")
-                semana.append({"dia": WEEKDAY_NAMES[d], "fecha": fecha_str})
-            else:
-                semana.append({"dia": WEEKDAY_NAMES[d], "fecha": ""})
-        semanas.append(semana)
-        cursor += timedelta(weeks=1)
-
-    # --- Crear PDF ---
-    response = HttpResponse(content_type="application/pdf")
-    response["Content-Disposition"] = f'inline; filename="asistencia_{nc}.pdf"'
+        raise ValueError("La fecha fin debe ser posterior o igual a la fecha inicio")
 
-    pdf = canvas.Canvas(response, pagesize=A4)
-    width, height = A4
-
-    # Márgenes
-    left_margin = 20 * mm
-    right_margin = 20 * mm
-    top_margin = 20 * mm
-    usable_width = width - left_margin - right_margin
-    header_height = 18 * mm
-
-    # Dibujar encabezado
-    pdf.setFillColorRGB(*header_color)
-    pdf.rect(left_margin, height - top_margin - header_height, usable_width, header_height, stroke=0, fill=1)
-
-    pdf.setFillColor(colors.white)
-    pdf.setFont("Helvetica-Bold", 14)
-    pdf.drawCentredString(left_margin + usable_width / 2, height - top_margin - header_height/2 + 4, "FORMATO DE ASISTENCIA")
-
-    # Datos estudiante
-    pdf.setFillColor(colors.black)
-    pdf.setFont("Helvetica", 11)
-    y = height - top_margin - header_height - 12
-    pdf.drawString(left_margin, y, f"NC: {nc}")
-    pdf.drawString(left_margin + 220, y, f"Nombre completo: {nombre}")
-    y -= 16
-    pdf.drawString(left_margin, y, f"Período: {fecha_inicio.strftime('%d/%m/%Y')} — {fecha_fin.strftime('%d/%m/%Y')}")
-    y -= 22
-
-    # --- Construir tabla ---
-    col_width = usable_width / 5.0
-    data = []
-    for semana in semanas:
-        fila_fechas = []
-        for cel in semana:
-            texto = cel["dia"]
-            if cel["fecha"]:
-                texto = f"{texto}\n{cel['fecha']}"
-            fila_fechas.append(texto)
-        data.append(fila_fechas)
-        data.append([""] * 5)
-
-    if not data:
-        data = [[f"{d}\n" for d in WEEKDAY_NAMES], [""] * 5]
-
-    fila_alto_fecha = 12 * mm
-    fila_alto_firma = 20 * mm
-    row_heights = [fila_alto_fecha if i % 2 == 0 else fila_alto_firma for i in range(len(data))]
-
-    style = TableStyle([
-        ("GRID", (0, 0), (-1, -1), 0.6, colors.black),
-        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-        ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
-        ("FONTSIZE", (0, 0), (-1, -1), 9),
-    ])
-
-    # --- Dibujar tabla con paginado ---
-    pdf_y_start = y
-    current_row = 0
-    total_rows = len(data)
-
-    while current_row < total_rows:
-        remaining_height = pdf_y_start - 40
-        h_sum = 0
-        rows_fit = 0
-        for r in range(current_row, total_rows):
-            h_sum += row_heights[r]
-            if h_sum <= remaining_height:
-                rows_fit += 1
-            else:
-                break
-        if rows_fit == 0:
-            rows_fit = 1
-
-        sub_data = data[current_row: current_row + rows_fit]
-        sub_heights = row_heights[current_row: current_row + rows_fit]
-        sub_table = Table(sub_data, colWidths=[col_width]*5, rowHeights=sub_heights)
-        sub_table.setStyle(style)
-        sub_table.wrapOn(pdf, left_margin, pdf_y_start)
-        sub_table.drawOn(pdf, left_margin, pdf_y_start - sum(sub_heights))
-
-        pdf_y_start -= sum(sub_heights) + 10
-        current_row += rows_fit
-
-        if current_row < total_rows:
-            pdf.showPage()
-            pdf.setFillColorRGB(*header_color)
-            pdf.rect(left_margin, height - top_margin - header_height, usable_width, header_height, stroke=0, fill=1)
-            pdf.setFillColor(colors.white)
-            pdf.setFont("Helvetica-Bold", 14)
-            pdf.drawCentredString(left_margin + usable_width / 2, height - top_margin - header_height/2 + 4, "FORMATO DE ASISTENCIA")
-            pdf.setFillColor(colors.black)
-            pdf.setFont("Helvetica", 11)
-            y_page = height - top_margin - header_height - 12
-            pdf.drawString(left_margin, y_page, f"NC: {nc}")
-            pdf.drawString(left_margin + 220, y_page, f"Nombre completo: {nombre}")
-            y_page -= 16
-            pdf.drawString(left_margin, y_page, f"Período: {fecha_inicio.strftime('%d/%m/%Y')} — {fecha_fin.strftime('%d/%m/%Y')}")
-            pdf_y_start = y_page - 22
-
-    # Firma
-    pdf.setFont("Helvetica", 11)
-    
+    header_color = COLOR_MAP.get(color_param.lower(), COLOR_DEFAULT)
+    return nc, nombre, fecha_inicio, fecha_fin, header_color
+
+
+def _etag_pdf_asistencia(request):
+    try:
+        parametros = _parametros_asistencia(request)
+    except ValueError:
+        return None
+    return clave_cache(VERSION_PLANTILLA, *parametros)
+
+
+@condition(etag_func=_etag_pdf_asistencia)
+def generar_pdf_asistencia(request):
+    """
+    GET /api/pdf/asistencia/?nc=22290697&nombre=Alan%20Emiliano&fecha_inicio=2025-11-01&fecha_fin=2025-11-30&color=green
+
+    El PDF solo depende de los parámetros, así que se sirve desde cache_asistencia
+    y el ETag (hash de los parámetros) permite responder 304 sin renderizar.
+    """
+    try:
+        parametros = _parametros_asistencia(request)
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+
+    nc = parametros[0]
+    contenido = cache_asistencia.obtener(
+        clave_cache(VERSION_PLANTILLA, *parametros),
+        lambda: render_pdf_alumno(*parametros),
+    )
 
-    pdf.showPage()
-    pdf.save()
+    response = HttpResponse(contenido, content_type="application/pdf")
+    response["Content-Disposition"] = f'inline; filename="asistencia_{nc}.pdf"'
     return response
 
 
@@ -190,167 +98,327 @@ def generar_pdf_asistencia_general(request):
     """
     Genera un solo PDF con todos los alumnos con beca aprobada.
     Cada alumno tiene su formato de asistencia en páginas consecutivas.
-    Cada 10 alumnos cambia el color de encabezado.
-    """
-    start = request.GET.get("fecha_inicio", datetime.today().strftime("%Y-%m-%d"))
-    end = request.GET.get("fecha_fin", "2025-11-30")
+    Cada 15 alumnos cambia el color de encabezado.
 
+    Los alumnos se renderizan por lotes (ver api.reportes) y las becas se leen
+    con un cursor del lado del servidor. Con ?stream=1 cada lote se envía en cuanto termina, así la
+    memoria no crece con el número de alumnos.
+    """
     try:
-        fecha_inicio = datetime.strptime(start, "%Y-%m-%d").date()
-        fecha_fin = datetime.strptime(end, "%Y-%m-%d").date()
-    except ValueError:
-        return HttpResponseBadRequest("Fechas deben tener formato YYYY-MM-DD")
-
-    if fecha_fin < fecha_inicio:
-        return HttpResponseBadRequest("La fecha fin debe ser posterior o igual a la fecha inicio")
-
-    COLOR_MAP = {
-    "yellow": (0.894, 0.922, 0.157),
-    "red": (0.722, 0.200, 0.086),
-    "green": (0.310, 0.722, 0.086),
-    "blue": (0.086, 0.565, 0.722),
-    "pink": (0.800, 0.094, 0.753),
-}
-
-    color_names = list(COLOR_MAP.keys())
+        fecha_inicio, fecha_fin = fechas_reporte(request.GET)
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
 
     # --- Obtener becas aprobadas ---
-    becas = Beca.objects.filter(estatus="aprobada").select_related("numero_control")
-    if not becas.exists():
+    alumnos = alumnos_o_none(becas_aprobadas())
+    if alumnos is None:
         return HttpResponseBadRequest("No hay becas aprobadas en este momento")
 
-    response = HttpResponse(content_type="application/pdf")
+    contenido = pdf_asistencia_general(alumnos, fecha_inicio, fecha_fin)
+
+    if request.GET.get("stream") in ("1", "true"):
+        response = StreamingHttpResponse(contenido, content_type="application/pdf")
+    else:
+        response = HttpResponse(b"".join(contenido), content_type="application/pdf")
     response["Content-Disposition"] = 'inline; filename="asistencia_general.pdf"'
+    return response
 
-    pdf = canvas.Canvas(response, pagesize=A4)
-    width, height = A4
-
-    # Márgenes
-    left_margin = 20 * mm
-    right_margin = 20 * mm
-    top_margin = 20 * mm
-    usable_width = width - left_margin - right_margin
-    header_height = 18 * mm
-
-    # --- Calcular primer lunes ---
-    def get_weeks(fecha_inicio, fecha_fin):
-        if fecha_inicio.weekday() == 5:
-            primer_lunes = fecha_inicio + timedelta(days=2)
-        elif fecha_inicio.weekday() == 6:
-            primer_lunes = fecha_inicio + timedelta(days=1)
-        else:
-            primer_lunes = fecha_inicio - timedelta(days=fecha_inicio.weekday())
-
-        semanas = []
-        cursor = primer_lunes
-        while cursor <= fecha_fin:
-            semana = []
-            for d in range(5):
-                dia_fecha = cursor + timedelta(days=d)
-                if fecha_inicio <= dia_fecha <= fecha_fin:
-                    fecha_str = dia_fecha.strftime("%d/%m/%Y")
-                    semana.append({"dia": WEEKDAY_NAMES[d], "fecha": fecha_str})
-                else:
-                    semana.append({"dia": WEEKDAY_NAMES[d], "fecha": ""})
-            semanas.append(semana)
-            cursor += timedelta(weeks=1)
-        return semanas
-
-    # --- Generar una hoja por alumno ---
-    for i, beca in enumerate(becas):
-        estudiante = beca.numero_control
-        nombre = f"{estudiante.nombre} {estudiante.apellido}"
-        nc = estudiante.numero_control
-
-        # Cambiar color cada 15 alumnos
-        color_index = (i // 15) % len(color_names)
-        header_color = COLOR_MAP[color_names[color_index]]
-
-        # Dibujar encabezado
-        pdf.setFillColorRGB(*header_color)
-        pdf.rect(left_margin, height - top_margin - header_height, usable_width, header_height, stroke=0, fill=1)
-        pdf.setFillColor(colors.white)
-        pdf.setFont("Helvetica-Bold", 14)
-        pdf.drawCentredString(left_margin + usable_width / 2, height - top_margin - header_height / 2 + 4, "FORMATO DE ASISTENCIA")
-
-        # Datos alumno
-        pdf.setFillColor(colors.black)
-        pdf.setFont("Helvetica", 11)
-        y = height - top_margin - header_height - 12
-        pdf.drawString(left_margin, y, f"NC: {nc}")
-        pdf.drawString(left_margin + 220, y, f"Nombre completo: {nombre}")
-        y -= 16
-        pdf.drawString(left_margin, y, f"Período: {fecha_inicio.strftime('%d/%m/%Y')} — {fecha_fin.strftime('%d/%m/%Y')}")
-        y -= 22
-
-        # --- Tabla de asistencia ---
-        semanas = get_weeks(fecha_inicio, fecha_fin)
-        col_width = usable_width / 5.0
-        data = []
-        for semana in semanas:
-            fila_fechas = []
-            for cel in semana:
-                texto = cel["dia"]
-                if cel["fecha"]:
-                    texto = f"{texto}\n{cel['fecha']}"
-                fila_fechas.append(texto)
-            data.append(fila_fechas)
-            data.append([""] * 5)
-
-        fila_alto_fecha = 12 * mm
-        fila_alto_firma = 20 * mm
-        row_heights = [fila_alto_fecha if i % 2 == 0 else fila_alto_firma for i in range(len(data))]
-
-        style = TableStyle([
-            ("GRID", (0, 0), (-1, -1), 0.6, colors.black),
-            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-            ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
-            ("FONTSIZE", (0, 0), (-1, -1), 9),
-        ])
-
-        table = Table(data, colWidths=[col_width]*5, rowHeights=row_heights)
-        table.setStyle(style)
-        table.wrapOn(pdf, left_margin, y)
-        table.drawOn(pdf, left_margin, y - sum(row_heights))
-
-        # Salto de página para el siguiente alumno
-        pdf.showPage()
-
-    pdf.save()
+
+def generar_zip_asistencias(request):
+    """
+    GET /api/pdf/asistencia_zip/?fecha_inicio=2025-11-01&fecha_fin=2025-11-30&tipo_beca=Alimenticia&carrera=Sistemas&color=green
+
+    ZIP con un PDF de asistencia por beca aprobada (filtros opcionales por tipo
+    de beca y carrera), generado y enviado conforme se renderiza cada PDF.
+    """
+    try:
+        fecha_inicio, fecha_fin = fechas_reporte(request.GET)
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+
+    alumnos = alumnos_o_none(becas_aprobadas(tipo_beca=request.GET.get("tipo_beca"), carrera=request.GET.get("carrera")))
+    if alumnos is None:
+        return HttpResponseBadRequest("No hay becas aprobadas con esos filtros")
+
+    header_color = COLOR_MAP.get(request.GET.get("color", "red").lower(), COLOR_DEFAULT)
+    response = StreamingHttpResponse(
+        zip_asistencias(alumnos, fecha_inicio, fecha_fin, header_color),
+        content_type="application/zip",
+    )
+    response["Content-Disposition"] = 'attachment; filename="asistencias.zip"'
     return response
 
 
+class AsistenciaGeneralTrabajoAPIView(APIView):
+    """
+    POST /api/pdf/asistencia_general/trabajos/ {"fecha_inicio": ..., "fecha_fin": ...}
+
+    Encola el PDF general como trabajo en segundo plano. El avance se consulta en
+    /api/trabajos/<id>/ y el archivo en /api/trabajos/<id>/descarga/.
+    """
+    def post(self, request):
+        try:
+            fecha_inicio, fecha_fin = fechas_reporte(request.data)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        trabajo = encolar("asistencia_general", {
+            "fecha_inicio": fecha_inicio.isoformat(),
+            "fecha_fin": fecha_fin.isoformat(),
+        })
+        serializer = TrabajoSerializer(trabajo, context={'request': request})
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+
+class ImportacionAPIView(APIView):
+    """
+    POST /api/importar/<tipo>/  (multipart, campo `archivo`, .csv o .xlsx)
+
+    tipo: estudiantes | becas. ?tamano_lote=N cambia el tamaño de los inserts y
+    ?actualizar=0 rechaza números de control existentes en lugar de actualizarlos.
+    Responde con el reporte por fila; las filas inválidas no detienen el resto.
+    """
+    parser_classes = [MultiPartParser]
+
+    def post(self, request, tipo):
+        if tipo not in IMPORTACIONES:
+            return Response({"error": f"Tipo no soportado: {tipo}"}, status=status.HTTP_404_NOT_FOUND)
+        archivo = request.FILES.get("archivo")
+        if archivo is None:
+            return Response({"error": "Falta el archivo"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            tamano_lote = int(request.query_params.get("tamano_lote", 0)) or None
+        except ValueError:
+            return Response({"error": "tamano_lote debe ser un entero"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            reporte = importar(tipo, archivo, archivo.name, tamano_lote=tamano_lote,
+                               actualizar=request.query_params.get("actualizar", "1") not in ("0", "false"))
+        except ArchivoInvalido as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(reporte)
+
+
+class CambiosAPIView(APIView):
+    """
+    GET /api/changes/?since=<cursor>&limit=N
+
+    Altas, cambios y bajas de estudiantes, becas y asistencias desde `since`
+    (ver api.cambios): `upserts` con la fila actual y `deletes` con las llaves,
+    por modelo, más el `cursor` para la siguiente llamada y `has_more`. Sin
+    ?since= solo responde el cursor actual (para empezar tras una carga completa).
+    """
+
+    def get(self, request):
+        since = request.query_params.get("since")
+        if since in (None, ""):
+            return Response({"cursor": cursor_actual()})
+        try:
+            since = int(since)
+            limite = int(request.query_params.get("limit", settings.CAMBIOS_LIMITE))
+        except ValueError:
+            return Response({"error": "since y limit deben ser enteros"}, status=status.HTTP_400_BAD_REQUEST)
+        if limite < 1:
+            return Response({"error": "limit debe ser mayor que 0"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(cambios_desde(since, min(limite, settings.CAMBIOS_LIMITE)))
+
+
 from rest_framework.pagination import PageNumberPagination
+from api.pagination import KeysetPageNumberPagination
+
+class EstudiantePagination(KeysetPageNumberPagination):
+    page_size = 10  # máximo 10 registros por página (?page=N o ?cursor= para keyset)
 
-class EstudiantePagination(PageNumberPagination):
-    page_size = 10  # máximo 10 registros por página
+def _consulta_asistencias(campos=None, expandir=None):
+    asistencias = AsistenciaBeca.objects.all()
+    cols = columnas(AsistenciaBeca, campos, ['asistencia_id', 'beca_id'])
+    return asistencias.only(*cols) if cols else asistencias
 
-class EstudianteViewSet(viewsets.ModelViewSet):
-    queryset = Estudiante.objects.all()
+
+def _consulta_becas(campos=None, expandir=None, anidada=False):
+    """
+    Becas con solo lo que pide la selección (ver api.campos). Anidadas bajo un
+    estudiante, `estudiante` sale del padre del prefetch y no se hace JOIN.
+    """
+    becas = Beca.objects.all()
+    cols = columnas(Beca, campos, ['beca_id', 'numero_control'])
+    if not anidada and incluye('estudiante', campos, expandir, es_relacion=True):
+        becas = becas.select_related('numero_control')
+        if cols:
+            cols += ['numero_control__nombre', 'numero_control__apellido']
+    if cols:
+        becas = becas.only(*cols)
+    if incluye('asistencias', campos, expandir, es_relacion=True):
+        becas = becas.prefetch_related(
+            Prefetch('asistencias', queryset=_consulta_asistencias(*sub_seleccion('asistencias', campos, expandir))))
+    return becas
+
+
+def _consulta_estudiantes(campos=None, expandir=None):
+    # becas y sus asistencias en dos consultas fijas, sin importar el tamaño de página.
+    # La beca.numero_control anidada se resuelve con el estudiante padre del prefetch.
+    estudiantes = Estudiante.objects.all()
+    cols = columnas(Estudiante, campos, ['numero_control'])
+    if cols:
+        estudiantes = estudiantes.only(*cols)
+    if incluye('becas', campos, expandir, es_relacion=True):
+        estudiantes = estudiantes.prefetch_related(
+            Prefetch('becas', queryset=_consulta_becas(*sub_seleccion('becas', campos, expandir), anidada=True)))
+    return estudiantes
+
+
+class SeleccionCamposMixin:
+    """
+    En lecturas arma el queryset con `consulta(campos, expandir)` según ?fields= /
+    ?expand=, así las relaciones no pedidas no se prefetchean y las columnas no
+    pedidas se difieren. Las escrituras usan el queryset completo.
+    """
+    consulta = None
+
+    def get_queryset(self):
+        if self.request.method != 'GET':
+            return super().get_queryset()
+        return type(self).consulta(*parametros_campos(self.request.query_params))
+
+
+class ExportacionMixin:
+    """
+    GET <lista>/exportar/?formato=csv|jsonl|xlsx con los mismos ?search= /
+    ?ordering= de la lista, sin paginar. Las filas se leen con values_list de
+    `columnas_exportacion` ((encabezado, lookup)) y se envían por partes.
+    """
+    columnas_exportacion = ()
+
+    @action(detail=False, methods=['get'])
+    def exportar(self, request):
+        formato = request.query_params.get('formato', 'csv')
+        if formato not in FORMATOS:
+            return Response({"error": f"Formato no soportado: {formato}"}, status=status.HTTP_400_BAD_REQUEST)
+        queryset = self.filter_queryset(self.queryset.model.objects.all())
+        if not queryset.ordered:
+            queryset = queryset.order_by('pk')
+        return respuesta_exportacion(formato, queryset, self.columnas_exportacion, self.basename)
+
+
+class LoteMixin:
+    """
+    GET <lista>/batch/?ids=a,b,c o POST <lista>/batch/ con {"ids": [...]}: los
+    registros pedidos en una sola consulta (mismos prefetch y ?fields= /
+    ?expand= que la lista), en el orden de `ids`, y en `missing` los que no
+    existen. Máximo API_LOTE_MAXIMO ids por petición.
+    """
+
+    @action(detail=False, methods=['get', 'post'])
+    def batch(self, request):
+        if request.method == 'POST':
+            ids = request.data.get('ids', []) if hasattr(request.data, 'get') else []
+        else:
+            ids = request.query_params.get('ids', '')
+        if isinstance(ids, str):
+            ids = ids.split(',')
+        if not isinstance(ids, list):
+            return Response({"error": "ids debe ser una lista"}, status=status.HTTP_400_BAD_REQUEST)
+        ids = list(dict.fromkeys(str(i).strip() for i in ids if str(i).strip()))
+        if not ids:
+            return Response({"error": "Falta el parámetro ids"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > settings.API_LOTE_MAXIMO:
+            return Response({"error": f"Máximo {settings.API_LOTE_MAXIMO} ids por petición"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        llave = self.queryset.model._meta.pk
+        validos = {}
+        for i in ids:
+            try:
+                validos[i] = llave.to_python(i)
+            except DjangoValidationError:
+                pass  # no puede existir: va a missing
+
+        por_id = self._lote(llave, list(validos.values())) if validos else {}
+        encontrados = [por_id[str(validos[i])] for i in ids if i in validos and str(validos[i]) in por_id]
+        faltantes = [i for i in ids if i not in validos or str(validos[i]) not in por_id]
+        return Response({"results": encontrados, "missing": faltantes})
+
+    def _lote(self, llave, valores):
+        """{str(pk): representación} de los registros con pk en `valores`."""
+        # Explícito: el serializer solo lee ?fields= / ?expand= de los GET
+        campos, expandir = parametros_campos(self.request.query_params)
+        seleccion = {'campos': campos, 'expandir': expandir}
+        plan = self._plan(**seleccion) if isinstance(self, LecturaRapidaMixin) else None
+        if plan is not None:
+            columnas_plan = list(dict.fromkeys([*plan.columnas(), llave.attname]))
+            filas = list(self.queryset.model._default_manager.filter(pk__in=valores).values(*columnas_plan))
+            return {str(fila[llave.attname]): dato for fila, dato in zip(filas, plan.armar(filas))}
+
+        instancias = type(self).consulta(campos, expandir).filter(pk__in=valores)
+        datos = self.get_serializer(instancias, many=True, **seleccion).data
+        return {str(obj.pk): dato for obj, dato in zip(instancias, datos)}
+
+
+class EstudianteViewSet(CacheRespuestaMixin, LecturaRapidaMixin, SeleccionCamposMixin, ExportacionMixin, LoteMixin,
+                        viewsets.ModelViewSet):
+    queryset = _consulta_estudiantes()
+    consulta = _consulta_estudiantes
     serializer_class = EstudianteSerializer
-    filter_backends = [SearchFilter, OrderingFilter]
+    filter_backends = [OrderingFilter, BusquedaFilter]
     search_fields = ['numero_control', 'nombre', 'apellido', 'email']
     ordering_fields = ['numero_control', 'apellido', 'nombre', 'fecha_registro']
-    ordering = ['apellido', 'nombre']
+    ordering = ['apellido', 'nombre', 'numero_control']
+    keyset_ordering = ['apellido', 'nombre', 'numero_control']
     pagination_class = EstudiantePagination  # <-- aquí asignas la paginación
+    cache_modelos = (Estudiante, Beca, AsistenciaBeca)  # la respuesta anida becas y asistencias
+    columnas_exportacion = [
+        ('numero_control', 'numero_control'), ('nombre', 'nombre'), ('apellido', 'apellido'),
+        ('email', 'email'), ('carrera', 'carrera'), ('semestre', 'semestre'),
+        ('telefono', 'telefono'), ('fecha_registro', 'fecha_registro'),
+    ]
     
 class BecaPagination(PageNumberPagination):
     page_size = 10
     
-class BecaViewSet(viewsets.ModelViewSet):
-    queryset = Beca.objects.all()
+class BecaViewSet(CacheRespuestaMixin, LecturaRapidaMixin, SeleccionCamposMixin, ExportacionMixin, LoteMixin,
+                  viewsets.ModelViewSet):
+    queryset = _consulta_becas()
+    consulta = _consulta_becas
     serializer_class = BecaSerializer
-    filter_backends = [SearchFilter, OrderingFilter]
+    filter_backends = [TraslapeFechasFilter, OrderingFilter, BusquedaFilter]
+    columna_intervalo = 'beca_id'  # ?activa_en= / ?periodo_desde= / ?periodo_hasta= (api.intervalos)
     search_fields = ['tipo_beca', 'estatus', 'numero_control__numero_control', 
                      'numero_control__nombre', 'numero_control__apellido']
     ordering_fields = ['tipo_beca', 'estatus']
+    ordering = ['beca_id']
+    keyset_ordering = ['beca_id']
+    conteo_modelos = (Beca, Estudiante, AsistenciaBeca)  # la búsqueda y los períodos filtran por otras tablas
+    cache_modelos = (Beca, Estudiante, AsistenciaBeca)
+    columnas_exportacion = [
+        ('beca_id', 'beca_id'), ('numero_control', 'numero_control_id'),
+        ('nombre', 'numero_control__nombre'), ('apellido', 'numero_control__apellido'),
+        ('tipo_beca', 'tipo_beca'), ('fecha_solicitud', 'fecha_solicitud'),
+        ('fecha_aprobacion', 'fecha_aprobacion'), ('fecha_entrega', 'fecha_entrega'),
+        ('fecha_fin', 'fecha_fin'), ('estatus', 'estatus'),
+        ('observaciones', 'observaciones'), ('notas_internas', 'notas_internas'),
+    ]
     pagination_class = EstudiantePagination
 
-class AsistenciaBecaViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        """
+        GET /api/becas/stats/: conteos por estatus y tipo, aprobaciones por mes y
+        estudiantes con asistencia activa hoy. Los conteos salen de la tabla
+        EstadisticaBeca, que se actualiza en cada alta / cambio / baja de beca.
+        """
+        return Response(resumen_becas())
+
+class AsistenciaBecaViewSet(CacheRespuestaMixin, LecturaRapidaMixin, SeleccionCamposMixin, ExportacionMixin, viewsets.ModelViewSet):
     queryset = AsistenciaBeca.objects.all()
+    consulta = _consulta_asistencias
     serializer_class = AsistenciaBecaSerializer
-    filter_backends = [SearchFilter]
+    filter_backends = [TraslapeFechasFilter, SearchFilter]
+    columna_intervalo = 'asistencia_id'
     search_fields = ['beca_id__beca_id', 'asistencia_id']
+    columnas_exportacion = [
+        ('asistencia_id', 'asistencia_id'), ('beca_id', 'beca_id_id'),
+        ('numero_control', 'beca_id__numero_control_id'),
+        ('fecha_inicio', 'fecha_inicio'), ('fecha_fin', 'fecha_fin'),
+    ]
 
     
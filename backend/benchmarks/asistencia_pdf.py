@@ -0,0 +1,93 @@
+"""
+Benchmark del formato de asistencia general.
+
+Compara el costo por alumno de dibujar la hoja completa (tabla nueva por
+alumno, como se hacía antes) contra la plantilla precompilada.
+
+    python -m benchmarks.asistencia_pdf --alumnos 1000 --inicio 2025-08-25 --fin 2025-12-12
+"""
+import argparse
+import io
+import time
+from datetime import datetime
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Table
+
+from api.pdf_utils import (
+    FILA_ALTO_FECHA, FILA_ALTO_FIRMA, HEADER_HEIGHT, HEIGHT, LEFT_MARGIN, TABLE_STYLE, TOP_MARGIN,
+    USABLE_WIDTH, color_general, get_weeks, PlantillaAsistencia,
+)
+
+
+def render_sin_plantilla(alumnos, fecha_inicio, fecha_fin):
+    """Réplica del ciclo original: semanas, tabla y encabezado por cada alumno."""
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4)
+    for i, (nc, nombre) in enumerate(alumnos):
+        pdf.setFillColorRGB(*color_general(i))
+        pdf.rect(LEFT_MARGIN, HEIGHT - TOP_MARGIN - HEADER_HEIGHT, USABLE_WIDTH, HEADER_HEIGHT, stroke=0, fill=1)
+        pdf.setFillColor(colors.white)
+        pdf.setFont("Helvetica-Bold", 14)
+        pdf.drawCentredString(LEFT_MARGIN + USABLE_WIDTH / 2, HEIGHT - TOP_MARGIN - HEADER_HEIGHT / 2 + 4, "FORMATO DE ASISTENCIA")
+        pdf.setFillColor(colors.black)
+        pdf.setFont("Helvetica", 11)
+        y = HEIGHT - TOP_MARGIN - HEADER_HEIGHT - 12
+        pdf.drawString(LEFT_MARGIN, y, f"NC: {nc}")
+        pdf.drawString(LEFT_MARGIN + 220, y, f"Nombre completo: {nombre}")
+        y -= 16
+        pdf.drawString(LEFT_MARGIN, y, f"Período: {fecha_inicio.strftime('%d/%m/%Y')} — {fecha_fin.strftime('%d/%m/%Y')}")
+        y -= 22
+
+        data = []
+        for semana in get_weeks(fecha_inicio, fecha_fin):
+            data.append([f"{c['dia']}\n{c['fecha']}" if c["fecha"] else c["dia"] for c in semana])
+            data.append([""] * 5)
+        row_heights = [FILA_ALTO_FECHA if r % 2 == 0 else FILA_ALTO_FIRMA for r in range(len(data))]
+        table = Table(data, colWidths=[USABLE_WIDTH / 5.0] * 5, rowHeights=row_heights)
+        table.setStyle(TABLE_STYLE)
+        table.wrapOn(pdf, LEFT_MARGIN, y)
+        table.drawOn(pdf, LEFT_MARGIN, y - sum(row_heights))
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def render_con_plantilla(alumnos, fecha_inicio, fecha_fin):
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4)
+    plantilla = PlantillaAsistencia(fecha_inicio, fecha_fin)
+    for i, (nc, nombre) in enumerate(alumnos):
+        plantilla.dibujar(pdf, nc, nombre, color_general(i))
+    pdf.save()
+    return buffer.getvalue()
+
+
+def medir(nombre, funcion, alumnos, fecha_inicio, fecha_fin):
+    inicio = time.perf_counter()
+    contenido = funcion(alumnos, fecha_inicio, fecha_fin)
+    total = time.perf_counter() - inicio
+    print(f"{nombre:<16} total {total:8.3f} s   "
+          f"{total / len(alumnos) * 1000:7.3f} ms/alumno   "
+          f"{len(contenido) / len(alumnos) / 1024:7.2f} KiB/alumno")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alumnos", type=int, default=1000)
+    parser.add_argument("--inicio", default="2025-08-25")
+    parser.add_argument("--fin", default="2025-12-12")
+    args = parser.parse_args()
+
+    fecha_inicio = datetime.strptime(args.inicio, "%Y-%m-%d").date()
+    fecha_fin = datetime.strptime(args.fin, "%Y-%m-%d").date()
+    alumnos = [(f"{22290000 + i}", f"Alumno {i} Apellido") for i in range(args.alumnos)]
+
+    medir("sin plantilla", render_sin_plantilla, alumnos, fecha_inicio, fecha_fin)
+    medir("con plantilla", render_con_plantilla, alumnos, fecha_inicio, fecha_fin)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark de la lectura de becas para reportes masivos.
+
+Crea una base de datos de prueba (la de test de Django, no la real), siembra
+N estudiantes con beca aprobada y textos largos en observaciones /
+notas_internas, y compara la consulta original (exists() + select_related
+con modelos completos) contra alumnos_de_becas (values_list + iterator).
+
+    DATABASE_URL= python -m benchmarks.reporte_becas --becas 20000
+"""
+import argparse
+import os
+import time
+import tracemalloc
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+django.setup()
+
+from django.db import connection, reset_queries  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from api.models import Beca, Estudiante  # noqa: E402
+from api.reportes import alumnos_o_none, becas_aprobadas  # noqa: E402
+
+TEXTO_LARGO = "Observación de seguimiento del comité. " * 50
+
+
+def sembrar(total):
+    estudiantes = [
+        Estudiante(numero_control=f"{30000000 + i}", nombre=f"Nombre{i}", apellido=f"Apellido{i}",
+                   email=f"b{i}@test.mx", carrera="Sistemas")
+        for i in range(total)
+    ]
+    Estudiante.objects.bulk_create(estudiantes, batch_size=1000)
+    Beca.objects.bulk_create([
+        Beca(numero_control=e, tipo_beca="Alimenticia", estatus="aprobada",
+             observaciones=TEXTO_LARGO, notas_internas=TEXTO_LARGO)
+        for e in estudiantes
+    ], batch_size=1000)
+
+
+def ruta_original():
+    becas = Beca.objects.filter(estatus="aprobada").select_related("numero_control")
+    if not becas.exists():
+        return 0
+    n = 0
+    for beca in becas:
+        estudiante = beca.numero_control
+        _ = (estudiante.numero_control, f"{estudiante.nombre} {estudiante.apellido}")
+        n += 1
+    return n
+
+
+def ruta_ligera():
+    alumnos = alumnos_o_none(becas_aprobadas())
+    return sum(1 for _ in alumnos) if alumnos is not None else 0
+
+
+def medir(nombre, funcion):
+    reset_queries()
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    with CaptureQueriesContext(connection) as consultas:
+        filas = funcion()
+    total = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{nombre:<10} {filas} filas   {total:7.3f} s   pico {pico / 1024 / 1024:8.2f} MiB   "
+          f"{len(consultas)} consultas")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--becas", type=int, default=20000)
+    args = parser.parse_args()
+
+    nombre_original = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        sembrar(args.becas)
+        medir("original", ruta_original)
+        medir("ligera", ruta_ligera)
+    finally:
+        connection.creation.destroy_test_db(nombre_original, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
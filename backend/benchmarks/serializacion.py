@@ -0,0 +1,102 @@
+"""
+Benchmark de list de estudiantes: ModelSerializer + JSONRenderer contra el
+camino de api.lectura (.values() + mapas por nivel) + ORJSONRenderer.
+
+Crea una base de datos de prueba (la de test de Django, no la real), siembra
+estudiantes con dos becas y dos asistencias por beca, y mide páginas de
+10 / 100 / 1000 filas. También verifica que ambos caminos den los mismos bytes.
+
+    DATABASE_URL= python -m benchmarks.serializacion --repeticiones 20
+"""
+import argparse
+import os
+import time
+from datetime import date
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test import override_settings  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from api.models import AsistenciaBeca, Beca, Estudiante  # noqa: E402
+from api.renderers import ORJSONRenderer  # noqa: E402
+from api.views import EstudianteViewSet  # noqa: E402
+
+TAMANOS = (10, 100, 1000)
+
+
+def sembrar(total):
+    estudiantes = [
+        Estudiante(numero_control=f"{40000000 + i}", nombre=f"José{i}", apellido=f"Núñez{i}",
+                   email=f"s{i}@test.mx", carrera="Sistemas", semestre=i % 9 + 1)
+        for i in range(total)
+    ]
+    Estudiante.objects.bulk_create(estudiantes, batch_size=1000)
+    becas = Beca.objects.bulk_create([
+        Beca(numero_control=e, tipo_beca="Alimenticia", estatus="aprobada", fecha_solicitud=date(2025, 8, 1))
+        for e in estudiantes for _ in range(2)
+    ], batch_size=1000)
+    if becas[0].pk is None:
+        becas = list(Beca.objects.all())
+    AsistenciaBeca.objects.bulk_create([
+        AsistenciaBeca(beca_id=b, fecha_inicio=date(2025, 11, 1), fecha_fin=date(2025, 11, 30))
+        for b in becas for _ in range(2)
+    ], batch_size=1000)
+
+
+class _Pagina(EstudianteViewSet.pagination_class):
+    max_page_size = max(TAMANOS)
+    page_size_query_param = "page_size"
+
+
+def pedir(tamano, rapido):
+    vista = EstudianteViewSet.as_view(
+        {"get": "list"},
+        pagination_class=_Pagina,
+        renderer_classes=[ORJSONRenderer if rapido else JSONRenderer],
+    )
+    request = APIRequestFactory().get("/api/estudiantes/", {"page_size": tamano})
+    with override_settings(API_LECTURA_RAPIDA=rapido, API_CACHE_RESPUESTAS=False):
+        response = vista(request)
+        response.render()
+    return response.content
+
+
+def medir(tamano, rapido, repeticiones):
+    pedir(tamano, rapido)  # calentamiento
+    with CaptureQueriesContext(connection) as consultas:
+        pedir(tamano, rapido)
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        pedir(tamano, rapido)
+    return (time.perf_counter() - inicio) / repeticiones * 1000, len(consultas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    nombre_original = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        sembrar(max(TAMANOS))
+        print(f"{'filas':>6} {'DRF (ms)':>10} {'rápido (ms)':>12} {'x':>6} {'consultas':>10}  bytes iguales")
+        for tamano in TAMANOS:
+            iguales = pedir(tamano, False) == pedir(tamano, True)
+            lento, consultas_lento = medir(tamano, False, args.repeticiones)
+            rapido, consultas_rapido = medir(tamano, True, args.repeticiones)
+            print(f"{tamano:>6} {lento:>10.2f} {rapido:>12.2f} {lento / rapido:>6.1f} "
+                  f"{consultas_lento:>4} / {consultas_rapido:<4}  {iguales}")
+    finally:
+        connection.creation.destroy_test_db(nombre_original, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
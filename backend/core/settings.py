@@ -30,6 +30,8 @@ INSTALLED_APPS = [
     'api',
     'oficios',
     'backups',
+    'trabajos',
+    'finanzas',
 ]
 
 # --- Middleware (CorsMiddleware arriba de CommonMiddleware) ---
@@ -76,6 +78,9 @@ if DATABASE_URL:
             conn_health_checks=True,
             ssl_require=True)
     }
+    # Con el pooler de Supabase en modo transacción los cursores del lado del
+    # servidor (iterator() en reportes) no sobreviven entre consultas
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = os.getenv("DISABLE_SERVER_SIDE_CURSORS", "False") == "True"
 else:
     DATABASES = {
         'default': {
@@ -85,6 +90,23 @@ else:
     }
 
 
+# --- Cache ---
+# locmem es por proceso: con varios workers de gunicorn usar "file" (o "db", tras
+# `manage.py createcachetable`) para que la invalidación se vea en todos.
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "locmem")
+if CACHE_BACKEND == "file":
+    CACHES = {'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv("CACHE_LOCATION", str(BASE_DIR / '.cache')),
+    }}
+elif CACHE_BACKEND == "db":
+    CACHES = {'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'django_cache',
+    }}
+else:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
 # --- Password validators, internationalization, static, etc.
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',},
@@ -117,9 +139,80 @@ CORS_ALLOW_ALL_ORIGINS = True
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Procesos para renderizar el PDF de asistencia general (1 = en el mismo worker)
+PDF_RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", "1"))
+
+# Cache de PDFs de asistencia individuales: LRU en memoria + directorio en MEDIA_ROOT
+PDF_CACHE_DIR = MEDIA_ROOT / 'cache' / 'asistencia'
+PDF_CACHE_MAX_ENTRADAS = int(os.getenv("PDF_CACHE_MAX_ENTRADAS", "128"))
+PDF_CACHE_MAX_BYTES = int(os.getenv("PDF_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Conteos de paginación: segundos en cache (además de invalidarse al guardar) y
+# filas a partir de las cuales una tabla sin filtros usa la estimación del planner.
+# El cache de conteos se invalida por versión de modelo como el de respuestas, así
+# que por omisión solo se usa con un cache compartido (ver api.checks)
+CONTEO_CACHE = os.getenv("CONTEO_CACHE", "False" if CACHE_BACKEND == "locmem" else "True") == "True"
+CONTEO_CACHE_SEGUNDOS = int(os.getenv("CONTEO_CACHE_SEGUNDOS", "300"))
+CONTEO_ESTIMADO_MINIMO = int(os.getenv("CONTEO_ESTIMADO_MINIMO", "100000"))
+
+# Cache de respuestas GET de la API (api.respuestas), invalidado por versión de modelo.
+# Por omisión solo con un cache compartido: con locmem cada worker tendría sus
+# propias versiones y los demás servirían listas viejas (ver api.checks)
+API_CACHE_RESPUESTAS = os.getenv(
+    "API_CACHE_RESPUESTAS", "False" if CACHE_BACKEND == "locmem" else "True") == "True"
+API_CACHE_ALIAS = os.getenv("API_CACHE_ALIAS", "default")
+API_CACHE_SEGUNDOS = int(os.getenv("API_CACHE_SEGUNDOS", "600"))
+
+# list / retrieve de la API desde .values() en lugar de ModelSerializer (api.lectura)
+API_LECTURA_RAPIDA = os.getenv("API_LECTURA_RAPIDA", "True") == "True"
+
+# Máximo de ids por petición en <lista>/batch/ (api.views.LoteMixin)
+API_LOTE_MAXIMO = int(os.getenv("API_LOTE_MAXIMO", "100"))
+
+# /api/changes/ (api.cambios): entradas de la bitácora por respuesta y antigüedad
+# (días) a partir de la cual compactar_cambios deja solo la última entrada por registro
+CAMBIOS_LIMITE = int(os.getenv("CAMBIOS_LIMITE", "1000"))
+CAMBIOS_COMPACTAR_DIAS = int(os.getenv("CAMBIOS_COMPACTAR_DIAS", "7"))
+# Segundos hacia atrás que /api/changes/ vuelve a leer bajo el cursor, para las
+# entradas de transacciones que confirmaron después de otras con id mayor
+CAMBIOS_VENTANA_SEGUNDOS = int(os.getenv("CAMBIOS_VENTANA_SEGUNDOS", "60"))
+
+# Totales por mes de finanzas en cache (finanzas.resumen). Los cambios por la API
+# se suman al cache al confirmarse; lo escrito directo en Supabase entra al vencer
+# FINANZAS_RESUMEN_SEGUNDOS. Por omisión solo con un cache compartido: con locmem
+# cada worker tendría sus propios totales y los demás mostrarían saldos viejos
+# (ver finanzas.checks); sin cache se agrega en la base en cada consulta
+FINANZAS_RESUMEN_CACHE = os.getenv(
+    "FINANZAS_RESUMEN_CACHE", "False" if CACHE_BACKEND == "locmem" else "True") == "True"
+FINANZAS_RESUMEN_SEGUNDOS = int(os.getenv("FINANZAS_RESUMEN_SEGUNDOS", "900"))
+
+# ?search= con el índice de búsqueda (api.busqueda); False vuelve a icontains
+BUSQUEDA_INDEXADA = os.getenv("BUSQUEDA_INDEXADA", "True") == "True"
+
+# Filas por lote (validación + bulk_create) en la importación de CSV / XLSX
+IMPORTACION_TAMANO_LOTE = int(os.getenv("IMPORTACION_TAMANO_LOTE", "500"))
+
+# Becas por UPDATE en actualizar_estatus_becas (api.transiciones)
+TRANSICIONES_TAMANO_LOTE = int(os.getenv("TRANSICIONES_TAMANO_LOTE", "1000"))
+
+# Cola de trabajos: True = hilos dentro del proceso web; False = `manage.py procesar_trabajos`
+TRABAJOS_EN_PROCESO = os.getenv("TRABAJOS_EN_PROCESO", "True") == "True"
+TRABAJOS_HILOS = int(os.getenv("TRABAJOS_HILOS", "2"))
+# Un trabajo en proceso sin reportar avance en estos minutos se da por perdido (worker reiniciado) y se reencola
+TRABAJOS_ATASCADO_MINUTOS = float(os.getenv("TRABAJOS_ATASCADO_MINUTOS", "30"))
+
+# PDF de oficios: False = se genera en la petición después de confirmar el alta;
+# True = va a la cola de trabajos y el oficio queda con estado_pdf 'pendiente'
+OFICIOS_PDF_ASINCRONO = os.getenv("OFICIOS_PDF_ASINCRONO", "False") == "True"
+
 # configuracion de Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
-    ]
+    ],
+    # Mismo JSON que JSONRenderer, codificado con orjson (api.renderers)
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 }
@@ -24,6 +24,8 @@ urlpatterns = [
     path('', include('api.urls')),
     path('api/oficios/', include('oficios.urls')),
     path('', include('backups.urls')),
+    path('api/trabajos/', include('trabajos.urls')),
+    path('api/', include('finanzas.urls')),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+
+@register()
+def cache_resumen_compartido(app_configs, **kwargs):
+    """El resumen en cache necesita un backend que vean todos los workers."""
+    if not settings.FINANZAS_RESUMEN_CACHE:
+        return []
+    if settings.CACHES.get('default', {}).get('BACKEND', '').endswith('LocMemCache'):
+        return [Warning(
+            "FINANZAS_RESUMEN_CACHE está activo con un cache locmem (por proceso).",
+            hint="Con varios workers solo el que atendió la escritura suma el cambio y los demás "
+                 "muestran totales viejos hasta FINANZAS_RESUMEN_SEGUNDOS; use CACHE_BACKEND=file o db, "
+                 "o FINANZAS_RESUMEN_CACHE=False.",
+            id='finanzas.W001',
+        )]
+    return []
@@ -0,0 +1,40 @@
+from django.db import migrations, models
+
+
+def crear_tabla_si_falta(apps, schema_editor):
+    """
+    La tabla `finanzas` ya existe en Supabase; solo se crea donde no está
+    (SQLite local, base de pruebas) para que el modelo no administrado funcione.
+    """
+    Finanza = apps.get_model('finanzas', 'Finanza')
+    tablas = schema_editor.connection.introspection.table_names()
+    if Finanza._meta.db_table not in tablas:
+        schema_editor.create_model(Finanza)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Finanza',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('concepto', models.CharField(max_length=255)),
+                ('tipo', models.CharField(choices=[('Ingreso', 'Ingreso'), ('Egreso', 'Egreso')], max_length=20)),
+                ('monto', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('categoria', models.CharField(blank=True, max_length=100, null=True)),
+                ('fecha', models.DateField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'finanzas',
+                'ordering': ['-fecha', '-id'],
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(crear_tabla_si_falta, migrations.RunPython.noop),
+    ]
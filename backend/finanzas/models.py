@@ -0,0 +1,24 @@
+from django.db import models
+
+
+class Finanza(models.Model):
+    INGRESO = 'Ingreso'
+    EGRESO = 'Egreso'
+    TIPO_CHOICES = [
+        (INGRESO, 'Ingreso'),
+        (EGRESO, 'Egreso'),
+    ]
+
+    concepto = models.CharField(max_length=255)
+    tipo = models.CharField(max_length=20, choices=TIPO_CHOICES)
+    monto = models.DecimalField(max_digits=12, decimal_places=2)
+    categoria = models.CharField(max_length=100, blank=True, null=True)
+    fecha = models.DateField(blank=True, null=True)
+
+    class Meta:
+        db_table = 'finanzas'  # tabla existente en Supabase
+        managed = False        # Django no la crea ni modifica
+        ordering = ['-fecha', '-id']
+
+    def __str__(self):
+        return f"{self.tipo}: {self.concepto} ({self.monto})"
@@ -0,0 +1,148 @@
+import time
+from collections import defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import DecimalField, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncMonth
+
+from .models import Finanza
+
+# Totales por mes en el cache compartido: {'YYYY-MM': (ingresos, egresos)}.
+# Solo con FINANZAS_RESUMEN_CACHE; si no, cada consulta agrega en la base.
+# Los registros sin fecha van en la clave SIN_FECHA (cuentan en los totales
+# pero no en ningún período). Las altas / cambios / bajas hechas por la API
+# se suman como deltas (finanzas.signals); lo escrito directo en Supabase
+# entra al vencer FINANZAS_RESUMEN_SEGUNDOS, cuando se recalcula con la base.
+CLAVE = 'finanzas:resumen:meses'
+CLAVE_CANDADO = 'finanzas:resumen:candado'
+SIN_FECHA = ''
+CERO = Decimal('0.00')
+
+
+def mes(fecha):
+    # str() cubre date y 'YYYY-MM-DD' asignado sin validar
+    return str(fecha)[:7] if fecha else SIN_FECHA
+
+
+def estado(finanza):
+    return finanza.tipo, finanza.monto, finanza.fecha
+
+
+def _suma(tipo):
+    return Coalesce(Sum('monto', filter=Q(tipo=tipo)), Value(CERO),
+                    output_field=DecimalField(max_digits=14, decimal_places=2))
+
+
+def calcular_meses():
+    """Totales por mes con una sola agregación en la base."""
+    filas = (Finanza.objects.annotate(mes=TruncMonth('fecha')).values('mes')
+             .annotate(ingresos=_suma(Finanza.INGRESO), egresos=_suma(Finanza.EGRESO)).order_by())
+    return {
+        (f"{fila['mes']:%Y-%m}" if fila['mes'] else SIN_FECHA): (Decimal(fila['ingresos']), Decimal(fila['egresos']))
+        for fila in filas
+    }
+
+
+def meses():
+    if not settings.FINANZAS_RESUMEN_CACHE:
+        return calcular_meses()
+    return cache.get_or_set(CLAVE, calcular_meses, settings.FINANZAS_RESUMEN_SEGUNDOS)
+
+
+def _deltas(anterior, nuevo):
+    deltas = defaultdict(lambda: [CERO, CERO])
+    for signo, datos in ((-1, anterior), (1, nuevo)):
+        if datos is None:
+            continue
+        tipo, monto, fecha = datos
+        if tipo not in (Finanza.INGRESO, Finanza.EGRESO) or not monto:
+            continue
+        deltas[mes(fecha)][0 if tipo == Finanza.INGRESO else 1] += signo * Decimal(monto)
+    return deltas
+
+
+def aplicar(anterior, nuevo):
+    """
+    Suma al cache el cambio de un registro: `anterior` / `nuevo` son estado()
+    o None (alta / baja). Si el resumen no está en cache no hay nada que
+    actualizar (se calcula completo en la siguiente lectura). Si otro proceso
+    tiene el candado se borra la entrada en vez de arriesgar un delta perdido.
+    """
+    deltas = _deltas(anterior, nuevo)
+    if not deltas or not settings.FINANZAS_RESUMEN_CACHE:
+        return
+    for _ in range(20):
+        if cache.add(CLAVE_CANDADO, 1, 5):
+            break
+        time.sleep(0.01)
+    else:
+        cache.delete(CLAVE)
+        return
+    try:
+        actual = cache.get(CLAVE)
+        if actual is None:
+            return
+        for clave, (ingresos, egresos) in deltas.items():
+            previo = actual.get(clave, (CERO, CERO))
+            actual[clave] = (previo[0] + ingresos, previo[1] + egresos)
+        cache.set(CLAVE, actual, settings.FINANZAS_RESUMEN_SEGUNDOS)
+    finally:
+        cache.delete(CLAVE_CANDADO)
+
+
+def _texto(valor):
+    return f"{valor:.2f}"
+
+
+def resumen(periodo='mes', desde=None, hasta=None):
+    """
+    Totales e ingresos / egresos por período ('mes' -> 'YYYY-MM', 'anio' ->
+    'YYYY') con el saldo acumulado al cierre de cada uno. `desde` / `hasta`
+    acotan los períodos (mismo formato); el saldo arrastra lo anterior a `desde`.
+    """
+    largo = 4 if periodo == 'anio' else 7
+    por_periodo = defaultdict(lambda: [CERO, CERO])
+    sin_fecha = (CERO, CERO)
+    for clave, (ingresos, egresos) in meses().items():
+        if clave == SIN_FECHA:
+            sin_fecha = (ingresos, egresos)
+            continue
+        fila = por_periodo[clave[:largo]]
+        fila[0] += ingresos
+        fila[1] += egresos
+
+    saldo = CERO
+    saldo_inicial = CERO
+    total_ingresos = total_egresos = CERO
+    periodos = []
+    for clave in sorted(por_periodo):
+        ingresos, egresos = por_periodo[clave]
+        if hasta and clave > hasta[:largo]:
+            break
+        saldo += ingresos - egresos
+        if desde and clave < desde[:largo]:
+            saldo_inicial = saldo
+            continue
+        total_ingresos += ingresos
+        total_egresos += egresos
+        periodos.append({
+            'periodo': clave,
+            'ingresos': _texto(ingresos),
+            'egresos': _texto(egresos),
+            'balance': _texto(ingresos - egresos),
+            'saldo': _texto(saldo),
+        })
+
+    if not desde and not hasta:
+        total_ingresos += sin_fecha[0]
+        total_egresos += sin_fecha[1]
+    return {
+        'periodo': periodo,
+        'total_ingresos': _texto(total_ingresos),
+        'total_egresos': _texto(total_egresos),
+        'balance': _texto(total_ingresos - total_egresos),
+        'saldo_inicial': _texto(saldo_inicial),
+        'periodos': periodos,
+    }
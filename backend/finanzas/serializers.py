@@ -0,0 +1,8 @@
+from rest_framework import serializers
+from .models import Finanza
+
+
+class FinanzaSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Finanza
+        fields = ['id', 'concepto', 'tipo', 'monto', 'categoria', 'fecha']
@@ -0,0 +1,28 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import resumen
+from .models import Finanza
+
+
+# --- Resumen por mes en cache (finanzas.resumen) ---
+@receiver(pre_save, sender=Finanza)
+def recordar_estado_finanza(sender, instance, **kwargs):
+    anterior = None
+    if not instance._state.adding and instance.pk is not None:
+        anterior = Finanza.objects.filter(pk=instance.pk).values_list('tipo', 'monto', 'fecha').first()
+    instance._estado_anterior = anterior
+
+
+@receiver(post_save, sender=Finanza)
+def sumar_finanza_guardada(sender, instance, **kwargs):
+    anterior, nuevo = getattr(instance, '_estado_anterior', None), resumen.estado(instance)
+    # El cache no es transaccional: el delta se aplica solo si se confirma
+    transaction.on_commit(lambda: resumen.aplicar(anterior, nuevo))
+
+
+@receiver(post_delete, sender=Finanza)
+def restar_finanza_borrada(sender, instance, **kwargs):
+    anterior = resumen.estado(instance)
+    transaction.on_commit(lambda: resumen.aplicar(anterior, None))
@@ -0,0 +1,94 @@
+from datetime import date
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from .models import Finanza
+
+
+class FinanzasAPITests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        Finanza.objects.bulk_create([
+            Finanza(concepto="Cuotas", tipo="Ingreso", monto=Decimal("1000.00"), categoria="Cuotas", fecha=date(2025, 1, 10)),
+            Finanza(concepto="Papelería", tipo="Egreso", monto=Decimal("250.50"), categoria="Material", fecha=date(2025, 1, 20)),
+            Finanza(concepto="Rifa", tipo="Ingreso", monto=Decimal("400.00"), categoria="Eventos", fecha=date(2025, 2, 5)),
+            Finanza(concepto="Evento", tipo="Egreso", monto=Decimal("600.00"), categoria="Eventos", fecha=date(2026, 3, 1)),
+        ])
+
+    def test_listado_paginado_con_filtros(self):
+        response = self.client.get("/api/finanzas/", {"page_size": 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 4)
+        self.assertEqual([r["concepto"] for r in response.data["results"]], ["Evento", "Rifa"])
+
+        response = self.client.get("/api/finanzas/", {"tipo": "Ingreso", "fecha_desde": "2025-01-01", "fecha_hasta": "2025-01-31"})
+        self.assertEqual([r["concepto"] for r in response.data["results"]], ["Cuotas"])
+
+        response = self.client.get("/api/finanzas/", {"search": "egreso"})
+        self.assertEqual([r["concepto"] for r in response.data["results"]], ["Evento", "Papelería"])
+
+        response = self.client.get("/api/finanzas/", {"fecha_desde": "enero"})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get("/api/finanzas/", {"fecha_desde": "2025-02-30"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_resumen_por_mes_con_saldo_acumulado(self):
+        response = self.client.get("/api/finanzas/resumen/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["total_ingresos"], "1400.00")
+        self.assertEqual(response.data["total_egresos"], "850.50")
+        self.assertEqual(response.data["balance"], "549.50")
+        self.assertEqual(
+            [(p["periodo"], p["balance"], p["saldo"]) for p in response.data["periodos"]],
+            [("2025-01", "749.50", "749.50"), ("2025-02", "400.00", "1149.50"), ("2026-03", "-600.00", "549.50")],
+        )
+
+        response = self.client.get("/api/finanzas/resumen/", {"periodo": "anio", "desde": "2026"})
+        self.assertEqual(response.data["saldo_inicial"], "1149.50")
+        self.assertEqual([(p["periodo"], p["saldo"]) for p in response.data["periodos"]], [("2026", "549.50")])
+
+        self.assertEqual(self.client.get("/api/finanzas/resumen/", {"periodo": "semana"}).status_code, 400)
+
+    @override_settings(FINANZAS_RESUMEN_CACHE=True)
+    def test_resumen_en_cache_se_actualiza_con_cada_cambio(self):
+        self.client.get("/api/finanzas/resumen/")
+        with self.assertNumQueries(0):
+            self.client.get("/api/finanzas/resumen/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            nuevo = self.client.post("/api/finanzas/", {
+                "concepto": "Donativo", "tipo": "Ingreso", "monto": "100.00", "fecha": "2025-02-15",
+            }, format="json").data
+        with self.captureOnCommitCallbacks(execute=True):
+            # Cambia de mes y de monto
+            self.client.patch(f"/api/finanzas/{nuevo['id']}/", {"monto": "50.00", "fecha": "2026-03-02"}, format="json")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f"/api/finanzas/{Finanza.objects.get(concepto='Papelería').pk}/")
+
+        with self.assertNumQueries(0):
+            datos = self.client.get("/api/finanzas/resumen/").data
+        cache.clear()
+        self.assertEqual(datos, self.client.get("/api/finanzas/resumen/").data)
+        self.assertEqual(datos["total_egresos"], "600.00")
+        self.assertEqual([(p["periodo"], p["saldo"]) for p in datos["periodos"]],
+                         [("2025-01", "1000.00"), ("2025-02", "1400.00"), ("2026-03", "850.00")])
+
+    @override_settings(FINANZAS_RESUMEN_CACHE=False)
+    def test_resumen_sin_cache_agrega_en_cada_consulta(self):
+        self.client.get("/api/finanzas/resumen/")
+        Finanza.objects.filter(concepto="Evento").delete()
+        with self.assertNumQueries(1):
+            datos = self.client.get("/api/finanzas/resumen/").data
+        self.assertEqual(datos["total_egresos"], "250.50")
+
+    def test_advertencia_con_cache_por_proceso(self):
+        from finanzas.checks import cache_resumen_compartido
+        locmem = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+        with override_settings(CACHES=locmem, FINANZAS_RESUMEN_CACHE=True):
+            self.assertEqual([a.id for a in cache_resumen_compartido(None)], ["finanzas.W001"])
+        with override_settings(CACHES=locmem, FINANZAS_RESUMEN_CACHE=False):
+            self.assertEqual(cache_resumen_compartido(None), [])
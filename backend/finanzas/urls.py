@@ -0,0 +1,8 @@
+from rest_framework import routers
+from .views import FinanzaViewSet
+
+# SimpleRouter: la raíz navegable de /api/ ya la da api.urls
+router = routers.SimpleRouter()
+router.register(r'finanzas', FinanzaViewSet, basename='finanza')
+
+urlpatterns = router.urls
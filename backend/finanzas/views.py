@@ -0,0 +1,84 @@
+import re
+
+from django.utils.dateparse import parse_date
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+from .models import Finanza
+from .resumen import resumen
+from .serializers import FinanzaSerializer
+
+PERIODOS = ('mes', 'anio')
+_PERIODO = re.compile(r'^\d{4}(-\d{2})?$')
+
+
+class FinanzaPagination(PageNumberPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
+def _fecha(request, nombre):
+    valor = request.query_params.get(nombre)
+    if not valor:
+        return None
+    try:
+        fecha = parse_date(valor)
+    except ValueError:
+        # Bien formada pero inexistente (2025-02-30)
+        fecha = None
+    if fecha is None:
+        raise ValidationError({nombre: 'Formato esperado YYYY-MM-DD.'})
+    return fecha
+
+
+class FinanzaViewSet(viewsets.ModelViewSet):
+    """
+    Registros de `finanzas`, paginados. Filtros: ?fecha_desde= / ?fecha_hasta=
+    (YYYY-MM-DD, inclusivos), ?tipo=Ingreso|Egreso, ?categoria= y ?search=
+    sobre concepto / categoría.
+    """
+    queryset = Finanza.objects.all()
+    serializer_class = FinanzaSerializer
+    pagination_class = FinanzaPagination
+    filter_backends = [OrderingFilter, SearchFilter]
+    # Mismos campos que buscaba la página de finanzas en el navegador
+    search_fields = ['concepto', 'categoria', 'tipo']
+    ordering_fields = ['fecha', 'monto', 'concepto']
+    ordering = ['-fecha', '-id']
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        desde, hasta = _fecha(self.request, 'fecha_desde'), _fecha(self.request, 'fecha_hasta')
+        if desde:
+            queryset = queryset.filter(fecha__gte=desde)
+        if hasta:
+            queryset = queryset.filter(fecha__lte=hasta)
+        for campo in ('tipo', 'categoria'):
+            valor = self.request.query_params.get(campo)
+            if valor:
+                queryset = queryset.filter(**{campo: valor})
+        return queryset
+
+    @action(detail=False, methods=['get'])
+    def resumen(self, request):
+        """
+        GET /api/finanzas/resumen/?periodo=mes|anio&desde=&hasta=: totales y, por
+        período, ingresos, egresos y saldo acumulado. Sale de los totales por mes
+        (finanzas.resumen): en cache con FINANZAS_RESUMEN_CACHE, que cada alta /
+        cambio / baja actualiza, o agregados en la base en cada consulta.
+        """
+        periodo = request.query_params.get('periodo', 'mes')
+        if periodo not in PERIODOS:
+            raise ValidationError({'periodo': f"Valores válidos: {', '.join(PERIODOS)}."})
+        rango = {}
+        for nombre in ('desde', 'hasta'):
+            valor = request.query_params.get(nombre)
+            if valor and not _PERIODO.match(valor):
+                raise ValidationError({nombre: 'Formato esperado YYYY o YYYY-MM.'})
+            rango[nombre] = valor or None
+        return Response(resumen(periodo, **rango))
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class OficiosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'oficios'
+
+    def ready(self):
+        # Registra el handler de la cola de trabajos para los PDFs de oficios y
+        # deja los logos del membrete decodificados para todo el proceso
+        from oficios import trabajos  # noqa: F401
+        from oficios.pdf_utils import cargar_logos
+        cargar_logos()
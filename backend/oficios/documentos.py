@@ -0,0 +1,20 @@
+from .models import Oficio
+from .pdf_utils import generar_pdf_oficio
+
+
+def generar_documento(oficio_id):
+    """
+    Genera y guarda el PDF de un oficio ya confirmado en la base. Corre fuera
+    de la transacción del alta, así el candado de ContadorOficios no espera al
+    render. Deja estado_pdf en 'listo' o 'error'.
+    """
+    oficio = Oficio.objects.get(pk=oficio_id)
+    try:
+        nombre = generar_pdf_oficio(oficio)
+    except Exception:
+        Oficio.objects.filter(pk=oficio_id).update(estado_pdf=Oficio.PDF_ERROR)
+        raise
+    Oficio.objects.filter(pk=oficio_id).update(documento_pdf=nombre, estado_pdf=Oficio.PDF_LISTO)
+    oficio.documento_pdf.name = nombre
+    oficio.estado_pdf = Oficio.PDF_LISTO
+    return oficio
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+def marcar_existentes(apps, schema_editor):
+    # Los oficios anteriores ya tienen su PDF (se generaba dentro del alta)
+    Oficio = apps.get_model('oficios', 'Oficio')
+    Oficio.objects.exclude(documento_pdf='').exclude(documento_pdf__isnull=True).update(estado_pdf='listo')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('oficios', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='oficio',
+            name='estado_pdf',
+            field=models.CharField(choices=[('pendiente', 'Pendiente'), ('listo', 'Listo'), ('error', 'Error')], default='pendiente', max_length=10, verbose_name='Estado del PDF'),
+        ),
+        migrations.RunPython(marcar_existentes, migrations.RunPython.noop),
+    ]
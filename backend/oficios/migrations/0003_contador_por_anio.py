@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('oficios', '0002_oficio_estado_pdf'),
+    ]
+
+    operations = [
+        # Los contadores existentes son los de los oficios numerados "/2025"
+        migrations.AddField(
+            model_name='contadoroficios',
+            name='anio',
+            field=models.IntegerField(default=2025, verbose_name='Año'),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name='contadoroficios',
+            name='prefijo',
+            field=models.CharField(max_length=10, verbose_name='Prefijo (S, I, J, etc.)'),
+        ),
+        migrations.AddConstraint(
+            model_name='contadoroficios',
+            constraint=models.UniqueConstraint(fields=('prefijo', 'anio'), name='contador_oficios_prefijo_anio'),
+        ),
+    ]
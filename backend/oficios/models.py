@@ -34,6 +34,22 @@ class Oficio(models.Model):
         verbose_name="Documento PDF"
     ) 
 
+    # El PDF se genera después de confirmar el alta (fuera del candado del contador)
+    PDF_PENDIENTE = 'pendiente'
+    PDF_LISTO = 'listo'
+    PDF_ERROR = 'error'
+    ESTADO_PDF_CHOICES = [
+        (PDF_PENDIENTE, 'Pendiente'),
+        (PDF_LISTO, 'Listo'),
+        (PDF_ERROR, 'Error'),
+    ]
+    estado_pdf = models.CharField(
+        max_length=10,
+        choices=ESTADO_PDF_CHOICES,
+        default=PDF_PENDIENTE,
+        verbose_name="Estado del PDF"
+    )
+
     class Meta:
         verbose_name = "Oficio"
         verbose_name_plural = "Oficios"
@@ -48,15 +64,19 @@ class ContadorOficios(models.Model):
     # Prefijo que identifica el tipo (ej: 'S', 'I', 'J')
     prefijo = models.CharField(
         max_length=10, 
-        unique=True,
         verbose_name="Prefijo (S, I, J, etc.)"
     )
+    # La numeración empieza de nuevo cada año; la fila se crea con el primer oficio
+    anio = models.IntegerField(verbose_name="Año")
     # El número actual que va, ej: 4
     contador = models.IntegerField(default=0)
 
     class Meta:
         verbose_name = "Contador de Oficio"
         verbose_name_plural = "Contadores de Oficios"
+        constraints = [
+            models.UniqueConstraint(fields=['prefijo', 'anio'], name='contador_oficios_prefijo_anio'),
+        ]
 
     def __str__(self):
-        return f"Contador {self.prefijo}: {self.contador}"
+        return f"Contador {self.prefijo}/{self.anio}: {self.contador}"
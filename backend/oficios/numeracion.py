@@ -0,0 +1,66 @@
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ContadorOficios
+
+
+class NumeracionUpsert:
+    """
+    Un solo INSERT ... ON CONFLICT DO UPDATE ... RETURNING: crea la fila del
+    (prefijo, año) si falta y devuelve el número ya incrementado. La fila queda
+    bloqueada solo hasta el commit del alta (PostgreSQL, SQLite >= 3.35).
+    """
+
+    def siguiente(self, prefijo, anio):
+        tabla = connection.ops.quote_name(ContadorOficios._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {tabla} (prefijo, anio, contador) VALUES (%s, %s, 1) "
+                f"ON CONFLICT (prefijo, anio) DO UPDATE SET contador = {tabla}.contador + 1 "
+                f"RETURNING contador",
+                [prefijo, anio],
+            )
+            return cursor.fetchone()[0]
+
+
+class NumeracionGenerica:
+    """UPDATE contador = contador + 1 y lectura dentro de la misma transacción."""
+
+    def siguiente(self, prefijo, anio):
+        contadores = ContadorOficios.objects.filter(prefijo=prefijo, anio=anio)
+        if not contadores.update(contador=F('contador') + 1):
+            try:
+                with transaction.atomic():
+                    ContadorOficios.objects.create(prefijo=prefijo, anio=anio, contador=1)
+                return 1
+            except IntegrityError:
+                # Otra petición creó la fila al mismo tiempo
+                contadores.update(contador=F('contador') + 1)
+        return contadores.values_list('contador', flat=True).get()
+
+
+def _backend():
+    if connection.vendor == 'postgresql':
+        return NumeracionUpsert()
+    if connection.vendor == 'sqlite' and connection.Database.sqlite_version_info >= (3, 35):
+        return NumeracionUpsert()
+    return NumeracionGenerica()
+
+
+def anio_actual():
+    return timezone.localdate().year
+
+
+def asignar_numero(prefijo, anio=None):
+    """
+    Siguiente número de oficio de `prefijo` en `anio` (por omisión el actual).
+    Debe llamarse dentro de la transacción que guarda el oficio: si el alta se
+    revierte, el incremento también, así la numeración no deja huecos (por eso
+    no se usan secuencias nativas, que no regresan los valores ya tomados).
+    """
+    return _backend().siguiente(prefijo, anio or anio_actual())
+
+
+def numero_oficio(prefijo, numero, anio):
+    return f"OFICIO N0. C.E.S.A./{prefijo}{numero:03d}/{anio}"
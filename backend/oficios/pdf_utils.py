@@ -1,5 +1,7 @@
 import io
+import logging
 import os
+import threading
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch, cm
@@ -15,6 +17,62 @@ from django.conf import settings
 
 IMAGENES_DIR = settings.BASE_DIR / 'assets'
 
+logger = logging.getLogger(__name__)
+
+# LOGOS del membrete: (etiqueta, archivo, x, ancho, alto). La posición X se mide
+# desde el borde izquierdo; todos se centran verticalmente respecto al de CESA
+CESA_HEIGHT = 1.36 * cm
+LOGOS = [
+    ("TecNM", 'logo_TecNM.png', 2.54 * cm, 2.57 * cm, 1.27 * cm),
+    ("ITCG", 'logo_ITCG.jpeg', 10.22 * cm, 1.15 * cm, 1.15 * cm),
+    ("CESA", 'logo_CESA.png', 16.78 * cm, 2.27 * cm, CESA_HEIGHT),
+]
+FORMA_LOGOS = 'membrete_logos'
+
+# Cache por proceso: archivo -> bytes del logo (ver cargar_logos)
+_logos = {}
+_candado_logos = threading.Lock()
+
+
+def _leer_logo(archivo):
+    contenido = (IMAGENES_DIR / archivo).read_bytes()
+    # Valida la imagen al cargarla y no al dibujar el primer documento
+    ImageReader(io.BytesIO(contenido)).getSize()
+    return contenido
+
+
+def cargar_logos():
+    """
+    Lee los logos del disco una sola vez por proceso (OficiosConfig.ready). Un
+    logo que no se pudo cargar se registra en el log y se reintenta en el
+    siguiente documento.
+    """
+    with _candado_logos:
+        for _, archivo, *_ in LOGOS:
+            if archivo not in _logos:
+                try:
+                    _logos[archivo] = _leer_logo(archivo)
+                except Exception:
+                    logger.exception("No se pudo cargar el logo %s", archivo)
+        return dict(_logos)
+
+
+def dibujar_logos(canvas, base_y):
+    logos = cargar_logos()
+    for etiqueta, archivo, x, ancho, alto in LOGOS:
+        try:
+            # Si no se pudo cargar, leerlo aquí muestra el error en el documento
+            contenido = logos.get(archivo) or _leer_logo(archivo)
+            # Un ImageReader por documento sobre los bytes en memoria
+            logo = ImageReader(io.BytesIO(contenido))
+            # El borde inferior del logo estará en base_y
+            canvas.drawImage(logo, x, base_y + (CESA_HEIGHT - alto)/2,
+                             width=ancho, height=alto, mask='auto')
+        except Exception as e:
+            canvas.setFont(FONT_NAME_BOLD, 8)
+            canvas.drawString(x, base_y, f"{etiqueta} Logo Error: {e}")
+
+
 def header_footer_callback(canvas, doc):
     canvas.saveState()
 
@@ -24,24 +82,6 @@ def header_footer_callback(canvas, doc):
     LEFT_MARGIN = doc.leftMargin
     RIGHT_MARGIN = doc.rightMargin
 
-    # LOGO TecNM
-    TECNM_WIDTH = 2.57 * cm
-    TECNM_HEIGHT = 1.27 * cm
-    TECNM_X = 2.54 * cm
-    TECNM_Y = 1.27 * cm  # La posición Y es la distancia desde el BORDE INFERIOR
-
-    # LOGO ITCG
-    ITCG_WIDTH = 1.15 * cm
-    ITCG_HEIGHT = 1.15 * cm
-    ITCG_X = 10.22 * cm
-    ITCG_Y = 1.27 * cm
-
-    # LOGO CESA
-    CESA_WIDTH = 2.27 * cm
-    CESA_HEIGHT = 1.36 * cm
-    CESA_X = 16.78 * cm
-    CESA_Y = 1.27 * cm
-
     # Altura de la página (tamaño 'letter' es ~27.94 cm o 11 inches)
     PAGE_HEIGHT = doc.pagesize[1]
 
@@ -51,40 +91,13 @@ def header_footer_callback(canvas, doc):
     # o mejor, definiendo una línea de base para todos.
     BASE_Y = PAGE_HEIGHT - DISTANCIA_DESDE_BORDE_SUPERIOR - CESA_HEIGHT - 0.2 * cm
 
-    # ---------------- DIBUJAR LOGO 1: TecNM (Izq) ----------------
-    try:
-        tecnm_path = str(IMAGENES_DIR / 'logo_TecNM.png')
-        logo_tecnm = ImageReader(tecnm_path)
-        
-        # El borde inferior del logo estará en BASE_Y
-        canvas.drawImage(logo_tecnm, TECNM_X, BASE_Y + (CESA_HEIGHT - TECNM_HEIGHT)/2, 
-                         width=TECNM_WIDTH, height=TECNM_HEIGHT, mask='auto')
-    except Exception as e:
-        canvas.setFont(FONT_NAME_BOLD, 8)
-        canvas.drawString(TECNM_X, BASE_Y, f"TecNM Logo Error: {e}")
-
-    # ---------------- DIBUJAR LOGO 2: ITCG (Centro) ----------------
-    try:
-        itcg_path = str(IMAGENES_DIR / 'logo_ITCG.jpeg')
-        logo_itcg = ImageReader(itcg_path)
-        
-        # El borde inferior del logo estará en BASE_Y
-        canvas.drawImage(logo_itcg, ITCG_X, BASE_Y + (CESA_HEIGHT - ITCG_HEIGHT)/2, 
-                         width=ITCG_WIDTH, height=ITCG_HEIGHT, mask='auto')
-    except Exception as e:
-        canvas.setFont(FONT_NAME_BOLD, 8)
-        canvas.drawString(ITCG_X, BASE_Y, f"ITCG Logo Error: {e}")
-    # ---------------- DIBUJAR LOGO 3: CESA (Derecha) ----------------
-    try:
-        cesa_path = str(IMAGENES_DIR / 'logo_CESA.png')
-        logo_cesa = ImageReader(cesa_path)
-        
-        # El borde inferior del logo estará en BASE_Y
-        canvas.drawImage(logo_cesa, CESA_X, BASE_Y + (CESA_HEIGHT - CESA_HEIGHT)/2, 
-                         width=CESA_WIDTH, height=CESA_HEIGHT, mask='auto')
-    except Exception as e:
-        canvas.setFont(FONT_NAME_BOLD, 8)
-        canvas.drawString(CESA_X, BASE_Y, f"CESA Logo Error: {e}")
+    # ---------------- LOGOS: TecNM (Izq), ITCG (Centro), CESA (Derecha) ----------------
+    # Se dibujan una vez por documento en un Form XObject; cada página solo lo referencia
+    if not canvas.hasForm(FORMA_LOGOS):
+        canvas.beginForm(FORMA_LOGOS)
+        dibujar_logos(canvas, BASE_Y)
+        canvas.endForm()
+    canvas.doForm(FORMA_LOGOS)
     
     # --------------------------------------------------------
     #             SECCIÓN DE PIE DE PÁGINA (Footer)
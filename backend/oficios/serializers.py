@@ -15,9 +15,10 @@ class OficioSerializer(serializers.ModelSerializer):
             'cuerpo_texto',
             'fecha_creacion',
             'documento_pdf',
-            'documento_pdf_url'
+            'documento_pdf_url',
+            'estado_pdf'
             ]
-        read_only_fields = ['documento_pdf_url']
+        read_only_fields = ['documento_pdf_url', 'estado_pdf']
 
     def get_documento_pdf_url(self, obj):
         # 1. Obtener el request del contexto (pasado desde la vista)
@@ -1,3 +1,208 @@
-from django.test import TestCase
+import threading
+from datetime import date
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.db import OperationalError, connection, connections, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from reportlab.pdfgen.canvas import Canvas
+from rest_framework.test import APIClient
+
+from trabajos.models import Trabajo
+from trabajos.registro import ejecutar, tomar
+
+from . import pdf_utils
+from .models import ContadorOficios, Oficio
+from .numeracion import NumeracionGenerica, NumeracionUpsert, anio_actual, asignar_numero
+
+DATOS = {
+    "tipo_oficio": "S",
+    "asunto": "Préstamo de auditorio",
+    "destinatario": "Dirección",
+    "cuerpo_texto": "Solicitamos el auditorio.",
+}
+
+
+def pdf_falso(oficio):
+    return f"oficios/pdf/oficio_{oficio.pk}.pdf"
+
+
+@mock.patch("oficios.documentos.generar_pdf_oficio", side_effect=pdf_falso)
+class OficioCreacionTests(TestCase):
+    def setUp(self):
+        self.anio = anio_actual()
+        ContadorOficios.objects.create(prefijo="S", anio=self.anio, contador=4)
+        self.client = APIClient()
+
+    def test_crea_con_numero_y_pdf_listo(self, _):
+        respuesta = self.client.post("/api/oficios/generar/", DATOS, format="json")
+        self.assertEqual(respuesta.status_code, 201)
+        self.assertEqual(respuesta.data["numero_oficio"], f"OFICIO N0. C.E.S.A./S005/{self.anio}")
+        self.assertEqual(respuesta.data["estado_pdf"], Oficio.PDF_LISTO)
+        oficio = Oficio.objects.get(pk=respuesta.data["id"])
+        self.assertEqual(oficio.estado_pdf, Oficio.PDF_LISTO)
+        self.assertEqual(oficio.documento_pdf.name, f"oficios/pdf/oficio_{oficio.pk}.pdf")
+
+    def test_error_de_render_deja_el_oficio_con_estado_error(self, generar):
+        generar.side_effect = RuntimeError("sin fuentes")
+        respuesta = self.client.post("/api/oficios/generar/", DATOS, format="json")
+        self.assertEqual(respuesta.status_code, 500)
+        oficio = Oficio.objects.get(pk=respuesta.data["id"])
+        self.assertEqual(oficio.estado_pdf, Oficio.PDF_ERROR)
+        self.assertEqual(ContadorOficios.objects.get(prefijo="S", anio=self.anio).contador, 5)
+
+    def test_prefijo_nuevo_crea_su_contador(self, _):
+        respuesta = self.client.post("/api/oficios/generar/", {**DATOS, "tipo_oficio": "J"}, format="json")
+        self.assertEqual(respuesta.status_code, 201)
+        self.assertEqual(respuesta.data["numero_oficio"], f"OFICIO N0. C.E.S.A./J001/{self.anio}")
+        self.assertEqual(ContadorOficios.objects.get(prefijo="J", anio=self.anio).contador, 1)
+
+    def test_numeracion_reinicia_cada_anio(self, _):
+        with mock.patch("oficios.views.anio_actual", return_value=self.anio + 1):
+            respuesta = self.client.post("/api/oficios/generar/", DATOS, format="json")
+        self.assertEqual(respuesta.data["numero_oficio"], f"OFICIO N0. C.E.S.A./S001/{self.anio + 1}")
+        self.assertEqual(ContadorOficios.objects.get(prefijo="S", anio=self.anio).contador, 4)
+
+    @override_settings(OFICIOS_PDF_ASINCRONO=True, TRABAJOS_EN_PROCESO=False)
+    def test_asincrono_responde_pendiente_y_el_trabajo_genera_el_pdf(self, _):
+        respuesta = self.client.post("/api/oficios/generar/", DATOS, format="json")
+        self.assertEqual(respuesta.status_code, 202)
+        self.assertEqual(respuesta.data["estado_pdf"], Oficio.PDF_PENDIENTE)
+        detalle = self.client.get(f"/api/oficios/{respuesta.data['id']}/")
+        self.assertEqual(detalle.data["estado_pdf"], Oficio.PDF_PENDIENTE)
+        self.assertIsNone(detalle.data["documento_pdf_url"])
+
+        trabajo = Trabajo.objects.get(tipo="oficio_pdf")
+        ejecutar(tomar(trabajo.pk))
+        detalle = self.client.get(f"/api/oficios/{respuesta.data['id']}/")
+        self.assertEqual(detalle.data["estado_pdf"], Oficio.PDF_LISTO)
+        self.assertTrue(detalle.data["documento_pdf_url"].endswith(".pdf"))
+
+
+class NumeracionTests(TestCase):
+    def test_backends_crean_e_incrementan(self):
+        for backend, prefijo in ((NumeracionUpsert(), "S"), (NumeracionGenerica(), "I")):
+            with self.subTest(backend=type(backend).__name__):
+                self.assertEqual([backend.siguiente(prefijo, 2026) for _ in range(3)], [1, 2, 3])
+                self.assertEqual(backend.siguiente(prefijo, 2027), 1)
+
+    def test_alta_revertida_no_deja_hueco(self):
+        asignar_numero("S", 2026)
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            asignar_numero("S", 2026)
+            raise RuntimeError("falló el alta")
+        self.assertEqual(asignar_numero("S", 2026), 2)
+
+
+class MembreteTests(TestCase):
+    def test_logos_se_leen_una_vez_y_van_en_un_form_por_documento(self):
+        pdf_utils.cargar_logos()
+        oficio = Oficio(numero_oficio_completo="OFICIO N0. C.E.S.A./S001/2026", tipo_oficio="S",
+                        asunto="Varias páginas", destinatario="Dirección", cuerpo_texto="Línea.\n" * 150)
+        oficio.fecha_creacion = date(2026, 1, 5)
+        with mock.patch.object(Path, "read_bytes") as lector, \
+                mock.patch.object(Canvas, "beginForm", autospec=True, side_effect=Canvas.beginForm) as forma, \
+                mock.patch.object(Canvas, "doForm", autospec=True, side_effect=Canvas.doForm) as uso, \
+                mock.patch.object(Canvas, "drawImage", autospec=True, side_effect=Canvas.drawImage) as imagen, \
+                mock.patch.object(type(oficio.documento_pdf), "save"):
+            pdf_utils.generar_pdf_oficio(oficio)
+            pdf_utils.generar_pdf_oficio(oficio)
+        lector.assert_not_called()
+        self.assertEqual(forma.call_count, 2)
+        self.assertEqual(imagen.call_count, 2 * len(pdf_utils.LOGOS))
+        self.assertGreater(uso.call_count, 2)
+
+    def test_logo_que_no_carga_queda_en_el_log(self):
+        with mock.patch.object(pdf_utils, "_logos", {}), \
+                mock.patch.object(Path, "read_bytes", side_effect=OSError("sin permiso")), \
+                self.assertLogs("oficios.pdf_utils", "ERROR") as registro:
+            self.assertEqual(pdf_utils.cargar_logos(), {})
+        self.assertEqual(len(registro.records), len(pdf_utils.LOGOS))
+
+
+class OficioConcurrenciaTests(TransactionTestCase):
+    def test_render_fuera_de_la_transaccion_del_alta(self):
+        """
+        Mientras se renderiza el PDF del primer oficio, otro hilo (con su propia
+        conexión) crea uno del mismo tipo. El render corre con el alta ya
+        confirmada: si siguiera dentro de la transacción que numera, la fila del
+        contador seguiría bloqueada (en SQLite la segunda alta falla con
+        "table is locked"; en PostgreSQL esperaría al render).
+        """
+        respuestas = {}
+
+        def crear(nombre):
+            try:
+                respuestas[nombre] = APIClient().post("/api/oficios/generar/", DATOS, format="json")
+            finally:
+                connections.close_all()
+
+        def render(oficio):
+            if "/S001/" in oficio.numero_oficio_completo:
+                respuestas["en_transaccion"] = connection.in_atomic_block
+                segundo = threading.Thread(target=crear, args=("segundo",))
+                segundo.start()
+                segundo.join()
+            return pdf_falso(oficio)
+
+        with mock.patch("oficios.documentos.generar_pdf_oficio", side_effect=render):
+            crear("primero")
+
+        self.assertFalse(respuestas["en_transaccion"])
+        self.assertEqual(respuestas["primero"].status_code, 201)
+        self.assertEqual(respuestas["segundo"].status_code, 201)
+        anio = anio_actual()
+        self.assertEqual(respuestas["primero"].data["numero_oficio"], f"OFICIO N0. C.E.S.A./S001/{anio}")
+        self.assertEqual(respuestas["segundo"].data["numero_oficio"], f"OFICIO N0. C.E.S.A./S002/{anio}")
+        self.assertEqual(Oficio.objects.filter(estado_pdf=Oficio.PDF_LISTO).count(), 2)
+
+
+class NumeracionConcurrenteTests(TransactionTestCase):
+    def asignar_en_hilos(self, backend, hilos_totales=8, por_hilo=24):
+        """
+        Cada hilo (con su propia conexión) asigna `por_hilo` números de "S" y
+        de "J" en 2026, ambos prefijos sin fila previa. SQLite en memoria no
+        espera entre conexiones (falla con "table is locked"): se reintenta.
+        """
+        numeros = {"S": [], "J": []}
+        errores = []
+        inicio = threading.Barrier(hilos_totales)
+
+        def asignar():
+            try:
+                inicio.wait()
+                for i in range(por_hilo):
+                    prefijo = "S" if i % 2 else "J"
+                    while True:
+                        try:
+                            with transaction.atomic():
+                                numero = backend.siguiente(prefijo, 2026)
+                            break
+                        except OperationalError as e:
+                            if "locked" not in str(e):
+                                raise
+                    numeros[prefijo].append(numero)
+            except Exception as e:
+                errores.append(e)
+            finally:
+                connections.close_all()
+
+        hilos = [threading.Thread(target=asignar) for _ in range(hilos_totales)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        self.assertEqual(errores, [])
+        return numeros, hilos_totales * por_hilo
+
+    def verificar(self, numeros, total):
+        por_prefijo = total // 2
+        self.assertEqual(sorted(numeros["S"]), list(range(1, por_prefijo + 1)))
+        self.assertEqual(sorted(numeros["J"]), list(range(1, por_prefijo + 1)))
+        self.assertEqual(ContadorOficios.objects.get(prefijo="S", anio=2026).contador, por_prefijo)
+
+    def test_upsert_sin_repetidos_ni_huecos(self):
+        self.verificar(*self.asignar_en_hilos(NumeracionUpsert()))
+
+    def test_generica_sin_repetidos_ni_huecos(self):
+        self.verificar(*self.asignar_en_hilos(NumeracionGenerica()))
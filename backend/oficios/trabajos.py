@@ -0,0 +1,9 @@
+from trabajos.registro import registrar
+
+from .documentos import generar_documento
+
+
+@registrar("oficio_pdf")
+def oficio_pdf(trabajo):
+    """PDF de un oficio recién creado (con OFICIOS_PDF_ASINCRONO)."""
+    generar_documento(trabajo.parametros["oficio_id"])
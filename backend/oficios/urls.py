@@ -1,8 +1,10 @@
 from django.urls import path
-from .views import OficioCreateAPIView, OficioListAPIView
+from .views import OficioCreateAPIView, OficioDetalleAPIView, OficioListAPIView
 
 urlpatterns = [
     path('generar/', OficioCreateAPIView.as_view(), name='generar-oficio'),
     
     path('lista/', OficioListAPIView.as_view(), name='oficios-lista'),
+
+    path('<int:pk>/', OficioDetalleAPIView.as_view(), name='oficio-detalle'),
 ]
\ No newline at end of file
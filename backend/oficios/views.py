@@ -1,12 +1,15 @@
-from django.shortcuts import render
+from django.conf import settings
+from django.shortcuts import get_object_or_404, render
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from django.db import transaction
-from .models import Oficio, ContadorOficios
+from .models import Oficio
+from .numeracion import anio_actual, asignar_numero, numero_oficio
 from .serializers import OficioSerializer
-from .pdf_utils import generar_pdf_oficio
+from .documentos import generar_documento
+from trabajos.registro import encolar
 
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
@@ -32,31 +35,49 @@ class OficioCreateAPIView(APIView):
         tipo_recibido = serializer.validated_data.get('tipo_oficio').strip().upper()
 
         try:
+            # La fila del contador queda bloqueada solo por la numeración y el alta;
+            # el PDF va después del commit
+            anio = anio_actual()
             with transaction.atomic():
-                # Numeración secuencial
-                contador_obj = ContadorOficios.objects.select_for_update().get(prefijo=tipo_recibido)
-
-                contador_obj.contador += 1
-                contador_obj.save()
-
-                nuevo_numero = f"{contador_obj.contador:03d}"
-                numero_oficio_completo = f"OFICIO N0. C.E.S.A./{tipo_recibido}{nuevo_numero}/2025"
+                # Numeración secuencial por prefijo y año
+                numero_oficio_completo = numero_oficio(tipo_recibido, asignar_numero(tipo_recibido, anio), anio)
 
                 # Crear el obj oficio en la BD
                 oficio = serializer.save(numero_oficio_completo=numero_oficio_completo)
-
-                # Generar .pdf
-                pdf_file_path = generar_pdf_oficio(oficio)
-                oficio.documento_pdf.name = pdf_file_path
-                oficio.save()
-
-                # Responder con éxito y URL de descarga
-                return Response({
-                    "mensaje": "Oficio generado y guardado con éxito.",
-                    "numero_oficio": numero_oficio_completo,
-                    "url_descarga": oficio.documento_pdf.url
-                }, status=status.HTTP_201_CREATED)
-        except ContadorOficios.DoesNotExist:
-            return Response({"error": f"Contador para prefijo '{tipo_recibido}' no encontrado. Inicialícelo."}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        if settings.OFICIOS_PDF_ASINCRONO:
+            # El cliente consulta /api/oficios/<id>/ hasta que estado_pdf sea 'listo'
+            encolar("oficio_pdf", {"oficio_id": oficio.pk})
+            return Response({
+                "mensaje": "Oficio guardado; el PDF se está generando.",
+                "id": oficio.pk,
+                "numero_oficio": numero_oficio_completo,
+                "estado_pdf": oficio.estado_pdf,
+                "url_descarga": None
+            }, status=status.HTTP_202_ACCEPTED)
+
+        try:
+            # Generar .pdf
+            oficio = generar_documento(oficio.pk)
+        except Exception as e:
+            # El oficio ya quedó registrado con su número (estado_pdf = 'error')
+            return Response({"error": str(e), "id": oficio.pk, "numero_oficio": numero_oficio_completo}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        # Responder con éxito y URL de descarga
+        return Response({
+            "mensaje": "Oficio generado y guardado con éxito.",
+            "id": oficio.pk,
+            "numero_oficio": numero_oficio_completo,
+            "estado_pdf": oficio.estado_pdf,
+            "url_descarga": oficio.documento_pdf.url
+        }, status=status.HTTP_201_CREATED)
+
+
+class OficioDetalleAPIView(APIView):
+    """Un oficio; sirve para consultar estado_pdf mientras se genera el PDF."""
+    def get(self, request, pk):
+        oficio = get_object_or_404(Oficio, pk=pk)
+        serializer = OficioSerializer(oficio, context={'request': request})
+        return Response(serializer.data, status=status.HTTP_200_OK)
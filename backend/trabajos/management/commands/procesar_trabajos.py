@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from trabajos.registro import ejecutar, reencolar_atascados, tomar_siguiente
+
+
+class Command(BaseCommand):
+    help = "Procesa la cola de trabajos (PDFs masivos, etc.). Usar con TRABAJOS_EN_PROCESO=False."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--una-vez', action='store_true', help="Vacía la cola y termina en lugar de esperar más trabajos.")
+        parser.add_argument('--intervalo', type=float, default=2.0, help="Segundos entre consultas cuando la cola está vacía.")
+        parser.add_argument('--atascados-minutos', type=float, default=None,
+                            help="Minutos sin avance tras los que un trabajo en proceso se reencola (default TRABAJOS_ATASCADO_MINUTOS).")
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            reencolados = reencolar_atascados(options['atascados_minutos'])
+            if reencolados:
+                self.stdout.write(f"Reencolados {reencolados} trabajos atascados")
+            trabajo = tomar_siguiente()
+            if trabajo is None:
+                if options['una_vez']:
+                    return
+                time.sleep(options['intervalo'])
+                continue
+
+            self.stdout.write(f"Procesando {trabajo}")
+            trabajo = ejecutar(trabajo)
+            self.stdout.write(f"  -> {trabajo.estado} ({trabajo.progreso}/{trabajo.total})")
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+def latido_desde_inicio(apps, schema_editor):
+    # Los trabajos en proceso al migrar cuentan desde que se tomaron
+    Trabajo = apps.get_model('trabajos', 'Trabajo')
+    Trabajo.objects.filter(fecha_inicio__isnull=False).update(actualizado=models.F('fecha_inicio'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trabajos', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trabajo',
+            name='actualizado',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(latido_desde_inicio, migrations.RunPython.noop),
+    ]
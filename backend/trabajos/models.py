@@ -0,0 +1,40 @@
+from django.db import models
+
+# --- Tabla: Trabajo (cola de tareas pesadas, p. ej. PDFs masivos) ---
+class Trabajo(models.Model):
+    PENDIENTE = 'pendiente'
+    EN_PROCESO = 'en_proceso'
+    TERMINADO = 'terminado'
+    ERROR = 'error'
+    ESTADO_CHOICES = [
+        (PENDIENTE, 'Pendiente'),
+        (EN_PROCESO, 'En proceso'),
+        (TERMINADO, 'Terminado'),
+        (ERROR, 'Error'),
+    ]
+
+    # Nombre del handler registrado con trabajos.registro.registrar
+    tipo = models.CharField(max_length=50)
+    parametros = models.JSONField(default=dict, blank=True)
+    estado = models.CharField(max_length=20, choices=ESTADO_CHOICES, default=PENDIENTE, db_index=True)
+
+    # Avance: elementos procesados / total (p. ej. alumnos renderizados)
+    progreso = models.IntegerField(default=0)
+    total = models.IntegerField(default=0)
+
+    archivo = models.FileField(upload_to='trabajos/', null=True, blank=True)
+    error = models.TextField(blank=True, default='')
+
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_inicio = models.DateTimeField(null=True, blank=True)
+    fecha_fin = models.DateTimeField(null=True, blank=True)
+    # Latido del worker: se renueva al tomarlo y en cada reportar_progreso
+    actualizado = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Trabajo"
+        verbose_name_plural = "Trabajos"
+        ordering = ['fecha_creacion', 'id']
+
+    def __str__(self):
+        return f"{self.tipo} #{self.pk} ({self.estado})"
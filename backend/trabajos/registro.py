@@ -0,0 +1,139 @@
+import logging
+import threading
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+from django.utils import timezone
+
+from .models import Trabajo
+
+logger = logging.getLogger(__name__)
+
+# tipo -> función(trabajo). El handler reporta su avance con reportar_progreso y
+# puede dejar el resultado en trabajo.archivo (save=False; ejecutar lo guarda).
+HANDLERS = {}
+
+
+def registrar(tipo):
+    """Decorador que registra el handler de un tipo de trabajo."""
+    def decorador(funcion):
+        HANDLERS[tipo] = funcion
+        return funcion
+    return decorador
+
+
+def encolar(tipo, parametros):
+    """Crea el trabajo pendiente y, si TRABAJOS_EN_PROCESO, lo manda al pool de hilos."""
+    if tipo not in HANDLERS:
+        raise ValueError(f"Tipo de trabajo desconocido: {tipo}")
+    if settings.TRABAJOS_EN_PROCESO:
+        _recuperar_en_pool()
+    trabajo = Trabajo.objects.create(tipo=tipo, parametros=parametros)
+    if settings.TRABAJOS_EN_PROCESO:
+        _pool().submit(_procesar_en_hilo, trabajo.pk)
+    return trabajo
+
+
+def reencolar_atascados(minutos=None):
+    """
+    Regresa a pendiente los trabajos en proceso sin latido (`actualizado`) en
+    los últimos `minutos` (TRABAJOS_ATASCADO_MINUTOS): el worker que los tomó se
+    reinició o murió sin terminarlos. Un trabajo largo que sigue reportando
+    avance no se toca. Devuelve cuántos se reencolaron.
+    """
+    if minutos is None:
+        minutos = settings.TRABAJOS_ATASCADO_MINUTOS
+    limite = timezone.now() - timedelta(minutes=minutos)
+    reencolados = Trabajo.objects.filter(estado=Trabajo.EN_PROCESO, actualizado__lt=limite).update(
+        estado=Trabajo.PENDIENTE, fecha_inicio=None, actualizado=None, progreso=0)
+    if reencolados:
+        logger.warning("Se reencolaron %s trabajos atascados en proceso", reencolados)
+    return reencolados
+
+
+def reportar_progreso(trabajo, progreso, total=None):
+    """Guarda el avance y renueva el latido que usa reencolar_atascados."""
+    trabajo.progreso = progreso
+    trabajo.actualizado = timezone.now()
+    campos = {'progreso': progreso, 'actualizado': trabajo.actualizado}
+    if total is not None:
+        trabajo.total = total
+        campos['total'] = total
+    Trabajo.objects.filter(pk=trabajo.pk).update(**campos)
+
+
+def tomar(trabajo_id):
+    """
+    Marca el trabajo como en proceso si sigue pendiente. El UPDATE condicional
+    garantiza que solo un worker (hilo o proceso) lo toma.
+    """
+    ahora = timezone.now()
+    tomado = Trabajo.objects.filter(pk=trabajo_id, estado=Trabajo.PENDIENTE).update(
+        estado=Trabajo.EN_PROCESO, fecha_inicio=ahora, actualizado=ahora)
+    return Trabajo.objects.get(pk=trabajo_id) if tomado else None
+
+
+def tomar_siguiente():
+    """Toma el trabajo pendiente más antiguo, o None si la cola está vacía."""
+    for trabajo_id in Trabajo.objects.filter(estado=Trabajo.PENDIENTE).values_list('pk', flat=True)[:10]:
+        trabajo = tomar(trabajo_id)
+        if trabajo is not None:
+            return trabajo
+    return None
+
+
+def ejecutar(trabajo):
+    """Corre el handler de un trabajo ya tomado y guarda el resultado o el error."""
+    try:
+        HANDLERS[trabajo.tipo](trabajo)
+        trabajo.estado = Trabajo.TERMINADO
+        trabajo.error = ''
+    except Exception as e:
+        logger.exception("Falló el trabajo %s", trabajo.pk)
+        trabajo.estado = Trabajo.ERROR
+        trabajo.error = str(e)
+    trabajo.fecha_fin = timezone.now()
+    trabajo.save(update_fields=['archivo', 'estado', 'error', 'fecha_fin'])
+    return trabajo
+
+
+def _procesar_en_hilo(trabajo_id):
+    close_old_connections()
+    try:
+        trabajo = tomar(trabajo_id)
+        if trabajo is not None:
+            ejecutar(trabajo)
+    finally:
+        # Las conexiones son por hilo; se cierran para no dejarlas abiertas en el pool
+        connections.close_all()
+
+
+_pool_lock = threading.Lock()
+_pool_hilos = None
+_recuperado = False
+
+
+def _recuperar_en_pool():
+    """
+    Con TRABAJOS_EN_PROCESO los trabajos viven en el pool de este proceso; si el
+    servidor se reinicia se pierden. La primera vez que se encola en el proceso
+    se reencolan los atascados y se mandan al pool los pendientes que quedaron.
+    """
+    global _recuperado
+    with _pool_lock:
+        if _recuperado:
+            return
+        _recuperado = True
+    reencolar_atascados()
+    for trabajo_id in Trabajo.objects.filter(estado=Trabajo.PENDIENTE).values_list('pk', flat=True):
+        _pool().submit(_procesar_en_hilo, trabajo_id)
+
+
+def _pool():
+    global _pool_hilos
+    with _pool_lock:
+        if _pool_hilos is None:
+            _pool_hilos = ThreadPoolExecutor(max_workers=settings.TRABAJOS_HILOS, thread_name_prefix='trabajos')
+        return _pool_hilos
@@ -0,0 +1,29 @@
+from rest_framework import serializers
+from .models import Trabajo
+
+class TrabajoSerializer(serializers.ModelSerializer):
+    url_descarga = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Trabajo
+        fields = [
+            'id',
+            'tipo',
+            'parametros',
+            'estado',
+            'progreso',
+            'total',
+            'error',
+            'fecha_creacion',
+            'fecha_inicio',
+            'fecha_fin',
+            'actualizado',
+            'url_descarga',
+            ]
+        read_only_fields = fields
+
+    def get_url_descarga(self, obj):
+        request = self.context.get('request')
+        if obj.estado != Trabajo.TERMINADO or not obj.archivo:
+            return None
+        return request.build_absolute_uri(f"/api/trabajos/{obj.pk}/descarga/")
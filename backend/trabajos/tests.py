@@ -0,0 +1,125 @@
+import io
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api.models import Beca, Estudiante
+from trabajos import registro
+from trabajos.models import Trabajo
+
+
+class _Handlers:
+    """Registra handlers de prueba y restaura HANDLERS al terminar."""
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.dict(registro.HANDLERS)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.ejecutados = []
+
+        @registro.registrar("prueba")
+        def prueba(trabajo):
+            self.ejecutados.append(trabajo.pk)
+            registro.reportar_progreso(trabajo, 1, 1)
+
+        @registro.registrar("falla")
+        def falla(trabajo):
+            raise RuntimeError("sin datos")
+
+
+@override_settings(TRABAJOS_EN_PROCESO=False, TRABAJOS_ATASCADO_MINUTOS=30)
+class ColaTests(_Handlers, TestCase):
+    def test_tipo_desconocido(self):
+        with self.assertRaises(ValueError):
+            registro.encolar("no_existe", {})
+
+    def test_tomar_solo_una_vez(self):
+        trabajo = registro.encolar("prueba", {})
+        self.assertIsNotNone(registro.tomar(trabajo.pk))
+        self.assertIsNone(registro.tomar(trabajo.pk))
+        self.assertIsNone(registro.tomar_siguiente())
+
+    def test_ejecutar_guarda_error(self):
+        trabajo = registro.ejecutar(registro.tomar(registro.encolar("falla", {}).pk))
+        trabajo.refresh_from_db()
+        self.assertEqual((trabajo.estado, trabajo.error), (Trabajo.ERROR, "sin datos"))
+        self.assertIsNotNone(trabajo.fecha_fin)
+
+    def test_reencolar_atascados_sin_latido(self):
+        hace_una_hora = timezone.now() - timedelta(hours=1)
+        viejo = registro.tomar(registro.encolar("prueba", {}).pk)
+        largo = registro.tomar(registro.encolar("prueba", {}).pk)
+        Trabajo.objects.filter(pk__in=[viejo.pk, largo.pk]).update(fecha_inicio=hace_una_hora, actualizado=hace_una_hora)
+        # El trabajo largo sigue reportando avance: no se reencola aunque empezó hace una hora
+        registro.reportar_progreso(largo, 10, 100)
+
+        self.assertEqual(registro.reencolar_atascados(), 1)
+        viejo.refresh_from_db()
+        largo.refresh_from_db()
+        self.assertEqual((viejo.estado, viejo.fecha_inicio, viejo.actualizado), (Trabajo.PENDIENTE, None, None))
+        self.assertEqual(largo.estado, Trabajo.EN_PROCESO)
+
+    def test_comando_procesa_atascados(self):
+        atascado = registro.tomar(registro.encolar("prueba", {}).pk)
+        Trabajo.objects.filter(pk=atascado.pk).update(actualizado=timezone.now() - timedelta(hours=2))
+        salida = io.StringIO()
+
+        call_command("procesar_trabajos", una_vez=True, stdout=salida)
+
+        atascado.refresh_from_db()
+        self.assertEqual(atascado.estado, Trabajo.TERMINADO)
+        self.assertEqual(self.ejecutados, [atascado.pk])
+        self.assertIn("Reencolados 1", salida.getvalue())
+
+    @override_settings(TRABAJOS_EN_PROCESO=True)
+    def test_en_proceso_recupera_pendientes_al_reiniciar(self):
+        # Trabajos que quedaron de un proceso anterior: uno pendiente y uno atascado
+        pendiente = Trabajo.objects.create(tipo="prueba", parametros={})
+        hace_una_hora = timezone.now() - timedelta(hours=1)
+        atascado = Trabajo.objects.create(tipo="prueba", parametros={}, estado=Trabajo.EN_PROCESO,
+                                          fecha_inicio=hace_una_hora, actualizado=hace_una_hora)
+        pool = mock.Mock()
+        with mock.patch.object(registro, "_recuperado", False), \
+                mock.patch.object(registro, "_pool", return_value=pool):
+            nuevo = registro.encolar("prueba", {})
+            registro.encolar("prueba", {})
+
+        enviados = [llamada.args[1] for llamada in pool.submit.call_args_list]
+        # La recuperación corre una sola vez por proceso
+        self.assertEqual(sorted(enviados[:2]), [pendiente.pk, atascado.pk])
+        self.assertEqual(enviados[2], nuevo.pk)
+        self.assertEqual(len(enviados), 4)
+
+
+class TrabajoAsistenciaTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(60):
+            estudiante = Estudiante.objects.create(
+                numero_control=f"2229{i:04d}", nombre=f"Alumno{i}", apellido="Prueba", email=f"a{i}@test.mx",
+                carrera="Sistemas" if i % 2 else "Industrial")
+            Beca.objects.create(numero_control=estudiante, estatus="aprobada" if i % 4 else "pendiente")
+
+    def test_trabajo_en_segundo_plano(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        periodo = {"fecha_inicio": "2025-08-25", "fecha_fin": "2025-12-12"}
+        with self.settings(TRABAJOS_EN_PROCESO=False, MEDIA_ROOT=media.name):
+            respuesta = self.client.post("/api/pdf/asistencia_general/trabajos/", periodo,
+                                         content_type="application/json")
+            self.assertEqual(respuesta.status_code, 202)
+            url_estado = f"/api/trabajos/{respuesta.json()['id']}/"
+            self.assertEqual(self.client.get(url_estado).json()["estado"], "pendiente")
+            self.assertEqual(self.client.get(url_estado + "descarga/").status_code, 409)
+
+            call_command("procesar_trabajos", una_vez=True, stdout=io.StringIO())
+
+            estado = self.client.get(url_estado).json()
+            self.assertEqual((estado["estado"], estado["progreso"], estado["total"]), ("terminado", 45, 45))
+            descarga = self.client.get(url_estado + "descarga/")
+            completo = self.client.get("/api/pdf/asistencia_general/", periodo)
+            self.assertEqual(b"".join(descarga.streaming_content), completo.content)
@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import TrabajoDetalleAPIView, TrabajoDescargaAPIView
+
+urlpatterns = [
+    path('<int:pk>/', TrabajoDetalleAPIView.as_view(), name='trabajo-detalle'),
+    path('<int:pk>/descarga/', TrabajoDescargaAPIView.as_view(), name='trabajo-descarga'),
+]
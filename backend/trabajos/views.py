@@ -0,0 +1,24 @@
+from django.http import FileResponse
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .models import Trabajo
+from .serializers import TrabajoSerializer
+
+class TrabajoDetalleAPIView(APIView):
+    """Estado y avance (progreso / total) de un trabajo."""
+    def get(self, request, pk):
+        trabajo = get_object_or_404(Trabajo, pk=pk)
+        serializer = TrabajoSerializer(trabajo, context={'request': request})
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+class TrabajoDescargaAPIView(APIView):
+    """Descarga el archivo generado por un trabajo terminado."""
+    def get(self, request, pk):
+        trabajo = get_object_or_404(Trabajo, pk=pk)
+        if trabajo.estado != Trabajo.TERMINADO or not trabajo.archivo:
+            return Response({"error": "El trabajo aún no tiene archivo disponible.", "estado": trabajo.estado},
+                            status=status.HTTP_409_CONFLICT)
+        return FileResponse(trabajo.archivo.open('rb'), filename=trabajo.archivo.name.rsplit('/', 1)[-1])
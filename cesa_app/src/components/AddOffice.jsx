@@ -11,6 +11,23 @@ export default function AddOffice() {
   const [loading, setLoading] = useState(false);
   const [editIndex, setEditIndex] = useState(null);
 
+  const esperarPdf = async (id, intentos = 30) => {
+    for (let i = 0; i < intentos; i++) {
+      await new Promise((resolve) => setTimeout(resolve, 1000));
+      const response = await fetch(`http://127.0.0.1:8000/api/oficios/${id}/`);
+      if (!response.ok) return;
+      const oficio = await response.json();
+      if (oficio.estado_pdf === "listo") {
+        window.open(oficio.documento_pdf_url, "_blank");
+        return;
+      }
+      if (oficio.estado_pdf === "error") {
+        alert("El oficio se guardó, pero no se pudo generar su PDF.");
+        return;
+      }
+    }
+  };
+
   const generarOficio = async () => {
     if (!tipo || !asunto || !destinatario || !cuerpoTexto) {
       alert(
@@ -66,6 +83,9 @@ export default function AddOffice() {
 
         if (result.url_descarga) {
           window.open(result.url_descarga, "_blank");
+        } else if (result.estado_pdf === "pendiente") {
+          // El PDF se genera en segundo plano: se consulta hasta que esté listo
+          esperarPdf(result.id);
         }
 
         setTipo("");
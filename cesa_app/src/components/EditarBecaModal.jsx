@@ -202,6 +202,7 @@ export default function EditarBecaModal({ onClose, onSave, becaData }) {
                 <option value="aprobada">Aprobada</option>
                 <option value="rechazada">Rechazada</option>
                 <option value="entregada">Entregada</option>
+                <option value="finalizada">Finalizada</option>
               </select>
             </div>
 
@@ -1,4 +1,5 @@
-import React, { useState, useMemo } from "react";
+import React, { useState, useEffect, useMemo } from "react";
+import { getFinanzas, getResumenFinanzas } from "../services/api_finanzas.js";
 import {
   LineChart,
   Line,
@@ -18,77 +19,70 @@ const formatFecha = (dateString) => {
   return date.toLocaleDateString('es-MX', { year: 'numeric', month: '2-digit', day: '2-digit' });
 };
 
-export default function FinanzasDetalle({ tipo, registros, onClose }) {
+// Máximo de registros por petición que acepta /api/finanzas/
+const MAXIMO_REGISTROS = 200;
+
+export default function FinanzasDetalle({ tipo, onClose }) {
   const [filtroCategoria, setFiltroCategoria] = useState("");
   const [filtroFechaInicio, setFiltroFechaInicio] = useState("");
   const [filtroFechaFin, setFiltroFechaFin] = useState("");
 
-  // 1. Optimización: Calcular categorías solo cuando cambian los registros
-  const categorias = useMemo(() => {
-    // Usamos el tipo actual para las categorías (Ingreso o Egreso)
-    const registrosPorTipo = registros.filter((r) => r.tipo === tipo);
-    return [...new Set(registrosPorTipo.map((r) => r.categoria))].sort();
-  }, [registros, tipo]);
-
-  // 2. Optimización: Aplicar todos los filtros y tipos
-  const registrosFiltradosPorTipo = useMemo(() => {
-    // Si tipo es Balance, incluimos todos para el cálculo inicial
-    const registrosBase = tipo === "Balance" 
-        ? registros 
-        : registros.filter((r) => r.tipo === tipo);
-
-    return registrosBase.filter((r) => {
-        // Filtro de Categoría (solo aplica si no es Balance)
-        if (tipo !== "Balance" && filtroCategoria && r.categoria !== filtroCategoria) {
-            return false;
-        }
-        
-        // Filtro de Fecha de Inicio
-        if (filtroFechaInicio && new Date(r.fecha) < new Date(filtroFechaInicio)) {
-            return false;
-        }
-
-        // Filtro de Fecha de Fin
-        if (filtroFechaFin && new Date(r.fecha) > new Date(filtroFechaFin)) {
-            return false;
+  const [registros, setRegistros] = useState([]);
+  const [totalRegistros, setTotalRegistros] = useState(0);
+  const [categorias, setCategorias] = useState([]);
+  const [periodos, setPeriodos] = useState([]);
+
+  // 1. Ingresos / Egresos: la API filtra por tipo, categoría y fechas
+  useEffect(() => {
+    if (tipo === "Balance") return;
+    const params = new URLSearchParams({ tipo, page_size: MAXIMO_REGISTROS });
+    if (filtroCategoria) params.set("categoria", filtroCategoria);
+    if (filtroFechaInicio) params.set("fecha_desde", filtroFechaInicio);
+    if (filtroFechaFin) params.set("fecha_hasta", filtroFechaFin);
+
+    let vigente = true;
+    getFinanzas(params.toString())
+      .then((datos) => {
+        if (!vigente) return;
+        setRegistros(datos.results);
+        setTotalRegistros(datos.count);
+        // Las categorías del selector salen de lo consultado sin filtro de categoría
+        if (!filtroCategoria) {
+          setCategorias((previas) =>
+            [...new Set([...previas, ...datos.results.map((r) => r.categoria).filter(Boolean)])].sort()
+          );
         }
-        return true;
-    });
-  }, [registros, tipo, filtroCategoria, filtroFechaInicio, filtroFechaFin]);
-
-
-  // 3. Optimización: Calcular los datos del balance acumulado
-  const datosBalance = useMemo(() => {
-    // Aseguramos que solo se recalculen cuando los registros filtrados cambien
-    return registrosFiltradosPorTipo
-        .sort((a, b) => new Date(a.fecha) - new Date(b.fecha))
-        .reduce((acc, curr) => {
-            // Usamos el formato DD/MM/YYYY en el gráfico
-            const fechaFormateada = formatFecha(curr.fecha); 
-            const monto = curr.tipo === "Ingreso" ? +curr.monto : -curr.monto;
-            
-            // Si la fecha actual es la misma que la anterior, sumamos al último saldo
-            const ultimoRegistro = acc.length > 0 ? acc[acc.length - 1] : { saldo: 0, fecha: null };
-            
-            let nuevoSaldo;
-
-            if (ultimoRegistro.fecha === fechaFormateada) {
-                // Acumular movimientos del mismo día
-                nuevoSaldo = ultimoRegistro.saldo + monto;
-                acc[acc.length - 1].saldo = nuevoSaldo; // Reemplazar el último
-            } else {
-                // Nuevo día
-                const saldoAnterior = ultimoRegistro.saldo;
-                nuevoSaldo = saldoAnterior + monto;
-                acc.push({ fecha: fechaFormateada, saldo: nuevoSaldo });
-            }
-            return acc;
-        }, [])
-  }, [registrosFiltradosPorTipo]);
-
+      })
+      .catch((error) => console.error("❌ Error al obtener registros:", error.message || error));
+    return () => {
+      vigente = false;
+    };
+  }, [tipo, filtroCategoria, filtroFechaInicio, filtroFechaFin]);
+
+  // 2. Balance: saldo acumulado por mes calculado en el backend (/api/finanzas/resumen/)
+  useEffect(() => {
+    if (tipo !== "Balance") return;
+    const params = { periodo: "mes" };
+    if (filtroFechaInicio) params.desde = filtroFechaInicio.slice(0, 7);
+    if (filtroFechaFin) params.hasta = filtroFechaFin.slice(0, 7);
+
+    let vigente = true;
+    getResumenFinanzas(params)
+      .then((datos) => vigente && setPeriodos(datos.periodos))
+      .catch((error) => console.error("❌ Error al obtener el balance:", error.message || error));
+    return () => {
+      vigente = false;
+    };
+  }, [tipo, filtroFechaInicio, filtroFechaFin]);
+
+  // 3. Datos del balance acumulado para el gráfico
+  const datosBalance = useMemo(
+    () => periodos.map((p) => ({ fecha: p.periodo, saldo: Number(p.saldo) })),
+    [periodos]
+  );
 
   // Definimos la lista final de registros para la tabla (si no es Balance)
-  const registrosParaTabla = tipo !== "Balance" ? registrosFiltradosPorTipo : [];
+  const registrosParaTabla = tipo !== "Balance" ? registros : [];
 
   return (
     <div className="fixed inset-0 bg-black/40 flex items-center justify-center z-50">
@@ -188,6 +182,11 @@ export default function FinanzasDetalle({ tipo, registros, onClose }) {
                 No se encontraron registros en el rango de fechas/categoría.
               </p>
             )}
+            {totalRegistros > registrosParaTabla.length && (
+              <p className="text-center text-gray-500 py-2 text-sm">
+                Mostrando los {registrosParaTabla.length} más recientes de {totalRegistros}; acota las fechas para ver el resto.
+              </p>
+            )}
           </div>
         )}
 
@@ -197,12 +196,12 @@ export default function FinanzasDetalle({ tipo, registros, onClose }) {
             <ResponsiveContainer width="100%" height={300}>
               <LineChart data={datosBalance}>
                 <CartesianGrid strokeDasharray="3 3" stroke="#e0e0e0" />
-                {/* Usamos TickFormatter para un formato de fecha legible */}
-                <XAxis dataKey="fecha" tickFormatter={(f) => f.substring(0, 5)} /> 
+                {/* Un punto por mes (YYYY-MM) */}
+                <XAxis dataKey="fecha" /> 
                 <YAxis tickFormatter={(value) => `$${value.toFixed(0).replace(/\B(?=(\d{3})+(?!\d))/g, ",")}`} />
                 <Tooltip 
                     formatter={(value) => [`$${value.toFixed(2)}`, 'Saldo Acumulado']} 
-                    labelFormatter={(label) => `Fecha: ${label}`}
+                    labelFormatter={(label) => `Mes: ${label}`}
                 />
                 <Legend />
                 <Line
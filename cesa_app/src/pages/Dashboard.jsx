@@ -1,6 +1,6 @@
-import React, { useState, useEffect, useMemo, useCallback } from "react";
+import React, { useState, useEffect, useCallback } from "react";
 import { useNavigate } from "react-router-dom";
-import { supabase } from "../supabaseClient.js"; // Asegúrate que esta ruta es correcta
+import { getResumenFinanzas } from "../services/api_finanzas.js";
 import SummaryCard from "../components/SummaryCard.jsx";
 import FinancialSection from "../components/FinancialSection.jsx";
 
@@ -15,47 +15,29 @@ const Dashboard = () => {
     const navigate = useNavigate();
 
     // 💾 State
-    const [finanzas, setFinanzas] = useState([]);
+    const [resumen, setResumen] = useState(null);
     const [loading, setLoading] = useState(true);
 
-    // --- Funciones de Datos (Supabase) ---
-    const obtenerRegistros = useCallback(async () => {
+    // --- Funciones de Datos (API) ---
+    // 💰 Los totales los calcula el backend (/api/finanzas/resumen/): no se descarga la tabla
+    const obtenerResumen = useCallback(async () => {
         setLoading(true);
         try {
-            const { data, error } = await supabase
-                .from("finanzas")
-                .select("*")
-                .order("fecha", { ascending: false });
-
-            if (error) throw error;
-            setFinanzas(data);
+            setResumen(await getResumenFinanzas());
         } catch (error) {
-            console.error("❌ Error al obtener registros en Dashboard:", error.message || error);
+            console.error("❌ Error al obtener resumen en Dashboard:", error.message || error);
         } finally {
             setLoading(false);
         }
     }, []);
 
     useEffect(() => {
-        obtenerRegistros();
-    }, [obtenerRegistros]);
-
-    // 💰 Cálculos de resumen
-    const { totalIngresos, totalEgresos, balance } = useMemo(() => {
-        const ingresos = finanzas
-            .filter((r) => r.tipo === "Ingreso")
-            .reduce((acc, cur) => acc + Number(cur.monto || 0), 0);
-
-        const egresos = finanzas
-            .filter((r) => r.tipo === "Egreso")
-            .reduce((acc, cur) => acc + Number(cur.monto || 0), 0);
-
-        return {
-            totalIngresos: ingresos,
-            totalEgresos: egresos,
-            balance: ingresos - egresos,
-        };
-    }, [finanzas]);
+        obtenerResumen();
+    }, [obtenerResumen]);
+
+    const totalIngresos = Number(resumen?.total_ingresos || 0);
+    const totalEgresos = Number(resumen?.total_egresos || 0);
+    const balance = Number(resumen?.balance || 0);
 
     // --- Funciones de Navegación Personalizadas ---
 
@@ -87,7 +69,7 @@ const Dashboard = () => {
                 </button>
             </div>
 
-            {loading && finanzas.length === 0 ? (
+            {loading && !resumen ? (
                 <LoadingSpinner />
             ) : (
                 <>
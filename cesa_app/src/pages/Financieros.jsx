@@ -1,11 +1,20 @@
-import React, { useState, useEffect, useMemo, useCallback } from "react";
+import React, { useState, useEffect, useCallback } from "react";
 // 1. Importar useLocation para leer el estado de la navegación
 import { useLocation } from "react-router-dom"; 
-import { supabase } from "../supabaseClient.js";
+import {
+  getResumenFinanzas,
+  getFinanzas,
+  createFinanza,
+  updateFinanza,
+  deleteFinanza,
+} from "../services/api_finanzas.js";
 import FinanzasModal from "../components/FinanzasModal";
 import FinanzasDetalle from "../components/FinanzasDetalle";
 import SummaryCard from "../components/SummaryCard";
 
+// Registros por página del listado (/api/finanzas/ pagina en el backend)
+const TAMANO_PAGINA = 20;
+
 // Componente de Spinner para la carga
 const LoadingSpinner = () => (
   <div className="flex justify-center items-center py-10">
@@ -21,10 +30,14 @@ export default function Financieros() {
 
   // 💾 State
   const [finanzas, setFinanzas] = useState([]);
+  const [totalRegistros, setTotalRegistros] = useState(0);
+  const [pagina, setPagina] = useState(1);
+  const [resumen, setResumen] = useState(null);
   const [loading, setLoading] = useState(true);
   
-  // Estado de Búsqueda para el filtro instantáneo
+  // Estado de Búsqueda: lo escrito y lo que se manda a la API (con retraso)
   const [searchInput, setSearchInput] = useState(""); 
+  const [busqueda, setBusqueda] = useState("");
   
   const [showModal, setShowModal] = useState(false);
   const [modoEdicion, setModoEdicion] = useState(false);
@@ -32,24 +45,28 @@ export default function Financieros() {
   // 2. Inicializar el estado de detalleTipo con el valor que viene de la navegación
   const [detalleTipo, setDetalleTipo] = useState(detalleTipoInicial); 
 
-  // --- Funciones de Datos (Supabase) ---
+  // --- Funciones de Datos (API de Django) ---
 
   const obtenerRegistros = useCallback(async () => {
     setLoading(true);
     try {
-      const { data, error } = await supabase
-        .from("finanzas")
-        .select("*")
-        .order("fecha", { ascending: false });
+      // 💰 Los totales vienen del backend; el listado se pide por páginas
+      const params = new URLSearchParams({ page: pagina, page_size: TAMANO_PAGINA });
+      if (busqueda) params.set("search", busqueda);
+      const [datos, totales] = await Promise.all([
+        getFinanzas(params.toString()),
+        getResumenFinanzas(),
+      ]);
 
-      if (error) throw error; 
-      setFinanzas(data);
+      setFinanzas(datos.results);
+      setTotalRegistros(datos.count);
+      setResumen(totales);
     } catch (error) {
       console.error("❌ Error al obtener registros:", error.message || error);
     } finally {
       setLoading(false);
     }
-  }, []); 
+  }, [pagina, busqueda]); 
 
   const handleSave = useCallback(
     async (registro) => {
@@ -59,16 +76,11 @@ export default function Financieros() {
           const dataToUpdate = { ...registro };
           delete dataToUpdate.id; 
           
-          const { error } = await supabase
-            .from("finanzas")
-            .update(dataToUpdate)
-            .eq("id", registroActual.id); 
-
-          if (error) throw error;
+          // Por la API de Django, para que el resumen en cache se actualice
+          await updateFinanza(registroActual.id, dataToUpdate);
         } else {
           // ➕ Insertar
-          const { error } = await supabase.from("finanzas").insert([registro]);
-          if (error) throw error;
+          await createFinanza(registro);
         }
         await obtenerRegistros();
       } catch (error) {
@@ -87,15 +99,19 @@ export default function Financieros() {
     async (id) => {
       if (!window.confirm("¿Estás seguro que deseas eliminar este registro? Esta acción es irreversible.")) return;
       try {
-        const { error } = await supabase.from("finanzas").delete().eq("id", id);
-        if (error) throw error;
-        await obtenerRegistros();
+        await deleteFinanza(id);
+        // Si era el último de la página se regresa a la anterior
+        if (finanzas.length === 1 && pagina > 1) {
+          setPagina(pagina - 1);
+        } else {
+          await obtenerRegistros();
+        }
       } catch (error) {
         console.error("❌ Error al eliminar registro:", error.message || error);
         alert(`Error al eliminar el registro: ${error.message || error}`);
       }
     },
-    [obtenerRegistros]
+    [obtenerRegistros, finanzas.length, pagina]
   );
 
   // --- Funciones de Interfaz ---
@@ -136,35 +152,21 @@ export default function Financieros() {
   }, [detalleTipoInicial, location.pathname]);
 
 
-  // 🔍 Filtro Instantáneo: Filtra cada vez que 'searchInput' cambia
-  const registrosFiltrados = useMemo(() => {
-    if (!searchInput) return finanzas;
-    const lowerCaseSearch = searchInput.toLowerCase();
-
-    return finanzas.filter(
-      (r) =>
-        r.concepto?.toLowerCase().includes(lowerCaseSearch) ||
-        r.categoria?.toLowerCase().includes(lowerCaseSearch) ||
-        r.tipo?.toLowerCase().includes(lowerCaseSearch)
-    );
-  }, [finanzas, searchInput]);
-
-  // 💰 Cálculos de resumen
-  const { totalIngresos, totalEgresos, balance } = useMemo(() => {
-    const ingresos = finanzas
-      .filter((r) => r.tipo === "Ingreso")
-      .reduce((acc, cur) => acc + Number(cur.monto || 0), 0);
+  // 🔍 Búsqueda en la API (concepto, categoría o tipo) 300 ms después de dejar de escribir
+  useEffect(() => {
+    const espera = setTimeout(() => {
+      setBusqueda(searchInput.trim());
+      setPagina(1);
+    }, 300);
+    return () => clearTimeout(espera);
+  }, [searchInput]);
 
-    const egresos = finanzas
-      .filter((r) => r.tipo === "Egreso")
-      .reduce((acc, cur) => acc + Number(cur.monto || 0), 0);
+  const totalPaginas = Math.max(1, Math.ceil(totalRegistros / TAMANO_PAGINA));
 
-    return {
-      totalIngresos: ingresos,
-      totalEgresos: egresos,
-      balance: ingresos - egresos,
-    };
-  }, [finanzas]);
+  // 💰 Resumen calculado en el backend (/api/finanzas/resumen/)
+  const totalIngresos = Number(resumen?.total_ingresos || 0);
+  const totalEgresos = Number(resumen?.total_egresos || 0);
+  const balance = Number(resumen?.balance || 0);
 
   // --- Renderizado ---
 
@@ -241,8 +243,8 @@ export default function Financieros() {
                     <LoadingSpinner />
                   </td>
                 </tr>
-              ) : registrosFiltrados.length > 0 ? (
-                registrosFiltrados.map((f) => (
+              ) : finanzas.length > 0 ? (
+                finanzas.map((f) => (
                   <tr key={f.id} className="hover:bg-gray-50 transition duration-100 ease-in-out">
                     <td className="px-6 py-4 text-sm font-medium text-gray-900">{f.concepto}</td>
                     <td
@@ -288,15 +290,32 @@ export default function Financieros() {
             </tbody>
           </table>
 
-          <div className="px-6 py-4 bg-gray-50 text-sm text-gray-600 border-t border-gray-200">
-            Mostrando {registrosFiltrados.length} de {finanzas.length} registros totales.
+          <div className="px-6 py-4 bg-gray-50 text-sm text-gray-600 border-t border-gray-200 flex justify-between items-center">
+            <span>
+              Mostrando {finanzas.length} de {totalRegistros} registros (página {pagina} de {totalPaginas}).
+            </span>
+            <div className="flex gap-2">
+              <button
+                onClick={() => setPagina(pagina - 1)}
+                disabled={pagina <= 1 || loading}
+                className="px-3 py-1 rounded-lg border border-gray-300 disabled:opacity-50"
+              >
+                Anterior
+              </button>
+              <button
+                onClick={() => setPagina(pagina + 1)}
+                disabled={pagina >= totalPaginas || loading}
+                className="px-3 py-1 rounded-lg border border-gray-300 disabled:opacity-50"
+              >
+                Siguiente
+              </button>
+            </div>
           </div>
         </div>
 
         {/* Modal Detalle (Balance / Ingreso / Egreso) */}
         {detalleTipo && (
           <FinanzasDetalle
-            registros={finanzas} 
             tipo={detalleTipo}
             onClose={handleCloseDetalle}
           />
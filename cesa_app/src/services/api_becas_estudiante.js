@@ -1,7 +1,7 @@
 import { supabase } from "../supabaseClient";
 const API_BASE = import.meta.env.VITE_API_URL;
 
-async function apiFetch(url, options = {}) {
+export async function apiFetch(url, options = {}) {
   const {
     data: { session },
   } = await supabase.auth.getSession();
@@ -21,6 +21,9 @@ async function apiFetch(url, options = {}) {
     throw new Error(`Error ${response.status}: ${errText}`);
   }
 
+  // DELETE responde 204 sin cuerpo
+  if (response.status === 204) return null;
+
   return response.json();
 }
 
@@ -52,6 +55,14 @@ export function deleteEstudiante(id) {
 export function getEstudiante(id) {
   return apiFetch(`/estudiantes/${id}/`);
 }
+
+// Varios estudiantes en una petición: { results: [...en el orden de ids], missing: [...] }
+export function getEstudiantesPorIds(ids) {
+  return apiFetch("/estudiantes/batch/", {
+    method: "POST",
+    body: JSON.stringify({ ids }),
+  });
+}
 // --- Becas ---
 // ✅ getBecas ahora acepta query opcional para search/ordering
 export function getBecas(query = "") {
@@ -63,6 +74,13 @@ export function getBeca(id) {
   return apiFetch(`/becas/${id}/`);
 }
 
+export function getBecasPorIds(ids) {
+  return apiFetch("/becas/batch/", {
+    method: "POST",
+    body: JSON.stringify({ ids }),
+  });
+}
+
 export function createBeca(data) {
   return apiFetch("/becas/", {
     method: "POST",
@@ -83,6 +101,13 @@ export function deleteBeca(id) {
   });
 }
 
+// --- Cambios ---
+// Sin `since` devuelve solo el cursor actual; con él, { cursor, has_more, upserts, deletes }
+export function getCambios(since) {
+  const q = since === undefined ? "" : `?since=${since}`;
+  return apiFetch(`/changes/${q}`);
+}
+
 export async function generarCalendario(data) {
   try {
     // 🔹 Esperamos la respuesta del backend
@@ -0,0 +1,33 @@
+import { apiFetch } from "./api_becas_estudiante";
+
+// --- Finanzas ---
+// Totales y saldo por período calculados en el backend (ver finanzas.resumen)
+export function getResumenFinanzas(params = {}) {
+  const q = new URLSearchParams(params).toString();
+  return apiFetch(`/finanzas/resumen/${q ? `?${q}` : ""}`);
+}
+
+export function getFinanzas(query = "") {
+  const q = query ? `?${query}` : "";
+  return apiFetch(`/finanzas/${q}`);
+}
+
+export function createFinanza(data) {
+  return apiFetch("/finanzas/", {
+    method: "POST",
+    body: JSON.stringify(data),
+  });
+}
+
+export function updateFinanza(id, data) {
+  return apiFetch(`/finanzas/${id}/`, {
+    method: "PATCH",
+    body: JSON.stringify(data),
+  });
+}
+
+export function deleteFinanza(id) {
+  return apiFetch(`/finanzas/${id}/`, {
+    method: "DELETE",
+  });
+}